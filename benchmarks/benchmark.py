@@ -0,0 +1,404 @@
+"""
+Benchmark suite for the public methods of all `Box` types.
+
+Every benchmark case is run for every compatible source type (list, tuple, dict, frozendict, persistent map, set and generator)
+and input size, and its throughput (input items per second) is recorded. Results are written as JSON, and can be compared
+against a baseline that was stored by an earlier run; the run fails if the throughput of any case dropped by more than the
+threshold.
+
+The `create` cases measure how fast small instances of every `Box` type are created (instances per second), and how many bytes
+each instance takes by itself, excluding its items; the run also fails if an instance grew compared to the baseline.
+
+Usage::
+
+    python -m benchmarks.benchmark --sizes 1000 100000 --save-baseline benchmarks/baseline.json
+    python -m benchmarks.benchmark --sizes 1000 100000 --baseline benchmarks/baseline.json --threshold 0.25 --output results.json
+"""
+from __future__ import annotations
+
+import argparse
+import collections
+import collections.abc as abc
+import datetime
+import inspect
+import json
+import pickle
+import platform
+import sys
+import time
+from typing import Any, NamedTuple
+
+from frozendict import frozendict
+
+from src.fluentbox import (
+    Box, BoxCache, MappingBox, MutableMappingBox, MutableSequenceBox, MutableSetBox, PersistentMap, PersistentMappingBox, RecordBox,
+    SequenceBox, box, pipeline, profile
+)
+from src.fluentbox.fluentbox import SizedBox
+
+# Sources of which the items are records (dicts) or plain numbers, respectively key/value pairs for mappings.
+SEQUENCE_SOURCES = ("list", "tuple", "generator")
+MAPPING_SOURCES = ("dict", "frozendict", "persistent")
+SET_SOURCES = ("set",)
+
+
+class Case(NamedTuple):
+    method: str
+    sources: tuple[str, ...]
+    kind: str
+    run: abc.Callable[[Any, int], Any]
+
+
+def _records(size: int) -> list[dict[str, Any]]:
+    return [{"id": i, "group": i % 10, "value": float(i)} for i in range(size)]
+
+
+def _make_box(source: str, kind: str, size: int) -> abc.Callable[[], Box]:
+    """Prepare the data outside of the timed section, and return a factory creating a fresh `Box` from it."""
+    if source in MAPPING_SOURCES:
+        mapping = {i: i for i in range(size)}
+        frozen = frozendict(mapping)
+        persistent = PersistentMap(mapping)
+
+        if source == "persistent":
+            return lambda: PersistentMappingBox(persistent)
+
+        return (lambda: MutableMappingBox(dict(mapping))) if source == "dict" else (lambda: MappingBox(frozen))
+
+    if source in SET_SOURCES:
+        values = set(range(size))
+
+        return lambda: MutableSetBox(set(values))
+
+    items: list = _records(size) if kind == "records" else list(range(size))
+
+    if source == "list":
+        return lambda: SequenceBox(items)
+
+    if source == "tuple":
+        as_tuple = tuple(items)
+        return lambda: SequenceBox(as_tuple)
+
+    return lambda: Box(value for value in items)
+
+
+def _consume(result: Any) -> None:
+    # Lazy results must be iterated for the work to actually happen.
+    if isinstance(result, (Box, abc.Iterator)) and not isinstance(result, abc.Sized):
+        collections.deque(result, maxlen=0)
+
+
+def _churn(bx: MutableMappingBox, view: Any, size: int) -> Any:
+    # Overwrite every entry while the live view is being maintained.
+    for key in range(size):
+        bx[key] = key + 1
+
+    return view
+
+
+def _cached_twice(bx: MappingBox, keys: tuple) -> Any:
+    # The first query computes and stores the result, the second one is a cache hit.
+    cache = BoxCache()
+    bx.cached(cache).only(keys)
+
+    return bx.cached(cache).only(keys)
+
+
+_PIPELINE = pipeline().where("group", "==", 3).pluck("value").sum()
+
+
+def _derive(bx: PersistentMappingBox, size: int, derive: abc.Callable[[PersistentMappingBox, int], Any]) -> list:
+    # Derive 100 slightly different mappings from one large base, as per-tenant configuration would.
+    return [derive(bx, key) for key in range(0, size, max(1, size // 100))]
+
+
+def _in_batches(bx: Box, run: abc.Callable[[list], Any]) -> list:
+    # Apply the same chain to many small batches, as a request handler would.
+    return [run(batch) for batch in bx.chunk(100)]
+
+
+def _profiled(bx: Box, key: str) -> Any:
+    # The same query as the `where` case, with every method call recorded.
+    with profile():
+        return bx.where(key, "==", 3)
+
+
+def _shared_round_trip(bx: SequenceBox) -> Any:
+    # Place the items in shared memory and read them back, as a worker process would.
+    with bx.to_shared_memory() as handle, box.from_shared_memory(handle) as shared:
+        return shared.sum()
+
+
+def _cases() -> list[Case]:
+    everything = SEQUENCE_SOURCES + MAPPING_SOURCES + SET_SOURCES
+    iterables = SEQUENCE_SOURCES + SET_SOURCES
+    half = lambda n: range(0, n, 2)  # noqa: E731
+    quarter = lambda n: [{"id": i, "name": str(i)} for i in range(0, n, 4)]  # noqa: E731
+
+    return [
+        # Box
+        Case("aggregate", SEQUENCE_SOURCES, "records", lambda bx, n: bx.aggregate("count", total=("value", "sum"), p95=("value", "p95"))),
+        Case("aggregate_by", SEQUENCE_SOURCES, "records", lambda bx, n: bx.aggregate_by("group", "count", "mean", key="value")),
+        Case("aggregate_by.spill", SEQUENCE_SOURCES, "records", lambda bx, n: bx.aggregate_by("id", "count", spill_threshold=max(1, n // 4))),
+        Case("all", everything, "numbers", lambda bx, n: bx.all()),
+        Case("anti_join", SEQUENCE_SOURCES, "records", lambda bx, n: bx.anti_join(quarter(n), "id")),
+        Case("batched_map", iterables, "numbers", lambda bx, n: bx.batched_map(lambda batch: batch, 100)),
+        Case("chunk", iterables, "numbers", lambda bx, n: bx.chunk(100)),
+        Case("count_by", iterables, "numbers", lambda bx, n: bx.count_by()),
+        Case("count_by", SEQUENCE_SOURCES, "records", lambda bx, n: bx.count_by("group")),
+        Case("diff", iterables, "numbers", lambda bx, n: bx.diff(half(n))),
+        Case("diff_by", SEQUENCE_SOURCES, "records", lambda bx, n: bx.diff_by([{"id": i} for i in half(n)], "id")),
+        Case("distinct", iterables, "numbers", lambda bx, n: bx.distinct()),
+        Case("each", iterables, "numbers", lambda bx, n: bx.each(lambda item: None)),
+        Case("filter", iterables, "numbers", lambda bx, n: bx.filter(lambda item: item % 2)),
+        Case("filter", MAPPING_SOURCES, "numbers", lambda bx, n: bx.filter(lambda key, value: value % 2)),
+        Case("first", everything, "numbers", lambda bx, n: bx.first()),
+        Case("first_or_fail", everything, "numbers", lambda bx, n: bx.first_or_fail()),
+        Case("first_where", SEQUENCE_SOURCES, "records", lambda bx, n: bx.first_where("id", "==", n - 1)),
+        Case("first_where_or_fail", SEQUENCE_SOURCES, "records", lambda bx, n: bx.first_where_or_fail("id", "==", n - 1)),
+        Case("flat_map", iterables, "numbers", lambda bx, n: bx.flat_map(lambda item: (item, item))),
+        Case("group_by", SEQUENCE_SOURCES, "records", lambda bx, n: bx.group_by("group").all()),
+        Case("group_by.aggregate", SEQUENCE_SOURCES, "records", lambda bx, n: bx.group_by("group").aggregate("count", "mean", key="value")),
+        Case("group_by.nested", SEQUENCE_SOURCES, "records", lambda bx, n: bx.group_by(["group", "id"], nested=True).aggregate("count")),
+        Case("group_join", SEQUENCE_SOURCES, "records", lambda bx, n: bx.group_join(quarter(n), "id")),
+        Case("intersect", iterables, "numbers", lambda bx, n: bx.intersect(half(n))),
+        Case("join", SEQUENCE_SOURCES, "records", lambda bx, n: bx.join(quarter(n), "id")),
+        Case("join.presorted", SEQUENCE_SOURCES, "records", lambda bx, n: bx.join(quarter(n), "id", presorted=True)),
+        Case("key_by", SEQUENCE_SOURCES, "records", lambda bx, n: bx.key_by("id")),
+        Case("lazy", SEQUENCE_SOURCES, "numbers", lambda bx, n: bx.lazy().map(lambda item: item + 1).filter(lambda item: item % 2).all()),
+        Case("left_join", SEQUENCE_SOURCES, "records", lambda bx, n: bx.left_join(quarter(n), "id")),
+        Case("map", iterables, "numbers", lambda bx, n: bx.map(lambda item: item + 1)),
+        Case("map_and_key_by", SEQUENCE_SOURCES, "records", lambda bx, n: bx.map_and_key_by(lambda item: (item["id"], item["value"]))),
+        Case("max", iterables, "numbers", lambda bx, n: bx.max()),
+        Case("max_by", SEQUENCE_SOURCES, "records", lambda bx, n: bx.max_by("value")),
+        Case("mean", iterables, "numbers", lambda bx, n: bx.mean()),
+        Case("merge", iterables, "numbers", lambda bx, n: bx.merge(range(n))),
+        Case("min", iterables, "numbers", lambda bx, n: bx.min()),
+        Case("min_by", SEQUENCE_SOURCES, "records", lambda bx, n: bx.min_by("value")),
+        Case("parallel", SEQUENCE_SOURCES, "numbers", lambda bx, n: bx.parallel(chunk_size=max(1, n // 4)).map(lambda item: item + 1)),
+        Case("pipeline", SEQUENCE_SOURCES, "records", lambda bx, n: _in_batches(bx, _PIPELINE)),
+        Case("pipeline.methods", SEQUENCE_SOURCES, "records", lambda bx, n: _in_batches(
+            bx, lambda batch: box(batch, copy=False).where("group", "==", 3).pluck("value").sum()
+        )),
+        Case("pipe_into", iterables, "numbers", lambda bx, n: bx.pipe_into(list)),
+        Case("pluck", SEQUENCE_SOURCES, "records", lambda bx, n: bx.pluck("value")),
+        Case("product", iterables, "numbers", lambda bx, n: bx.product()),
+        Case("profile", SEQUENCE_SOURCES, "records", lambda bx, n: _profiled(bx, "group")),
+        Case("reduce", iterables, "numbers", lambda bx, n: bx.reduce(lambda x, y: x + y)),
+        Case("semi_join", SEQUENCE_SOURCES, "records", lambda bx, n: bx.semi_join(quarter(n), "id")),
+        Case("skip", iterables, "numbers", lambda bx, n: bx.skip(n // 2)),
+        Case("sliding_window", iterables, "numbers", lambda bx, n: bx.sliding_window(3)),
+        Case("sort_by", SEQUENCE_SOURCES, "records", lambda bx, n: bx.sort_by("value", descending=True)),
+        Case("sort_by.multi", SEQUENCE_SOURCES, "records", lambda bx, n: bx.sort_by(["group", "value"], descending=[False, True])),
+        Case("sum", iterables, "numbers", lambda bx, n: bx.sum()),
+        Case("sum.compensated", iterables, "numbers", lambda bx, n: bx.sum(compensated=True)),
+        Case("take", iterables, "numbers", lambda bx, n: bx.take(n // 2)),
+        Case("take_while", iterables, "numbers", lambda bx, n: bx.take_while(lambda item: item >= 0)),
+        Case("top_k", SEQUENCE_SOURCES, "records", lambda bx, n: bx.top_k(10, "value")),
+        Case("union", iterables, "numbers", lambda bx, n: bx.union(half(n))),
+        Case("unique_by", SEQUENCE_SOURCES, "records", lambda bx, n: bx.unique_by("group")),
+        Case("variance", iterables, "numbers", lambda bx, n: bx.variance()),
+        Case("where", SEQUENCE_SOURCES, "records", lambda bx, n: bx.where("group", "==", 3)),
+        Case("zip", iterables, "numbers", lambda bx, n: bx.zip(range(n))),
+        # SizedBox
+        Case("average", ("list", "tuple", "set"), "numbers", lambda bx, n: bx.average()),
+        # SequenceBox
+        Case("__getitem__", ("list", "tuple"), "numbers", lambda bx, n: [bx[i] for i in range(n)]),
+        Case("__reduce__", ("list", "tuple"), "numbers", lambda bx, n: pickle.loads(pickle.dumps(bx))),
+        Case("drop_indexes", ("list", "tuple"), "records", lambda bx, n: bx.index_by("id").drop_indexes()),
+        Case("index_by", ("list", "tuple"), "records", lambda bx, n: bx.index_by("id").where("id", "==", n // 2)),
+        Case("reverse", ("list", "tuple"), "numbers", lambda bx, n: bx.reverse()),
+        Case("sorted_index", ("list", "tuple"), "records", lambda bx, n: bx.sorted_index("id").where("id", ">", n // 2)),
+        Case("to_shared_memory", ("list", "tuple"), "numbers", lambda bx, n: _shared_round_trip(bx)),
+        # MappingBox
+        Case("__getitem__", MAPPING_SOURCES, "numbers", lambda bx, n: [bx[i] for i in range(n)]),
+        Case("__reduce__", MAPPING_SOURCES, "numbers", lambda bx, n: pickle.loads(pickle.dumps(bx))),
+        Case("cached", MAPPING_SOURCES, "numbers", lambda bx, n: _cached_twice(bx, tuple(half(n)))),
+        Case("only", MAPPING_SOURCES, "numbers", lambda bx, n: bx.only(half(n))),
+        Case("persistent", ("dict", "frozendict"), "numbers", lambda bx, n: bx.persistent()),
+        # PersistentMappingBox
+        Case("set", ("persistent",), "numbers", lambda bx, n: _derive(bx, n, lambda base, key: base.set(key, -key))),
+        Case("update", ("persistent",), "numbers", lambda bx, n: _derive(bx, n, lambda base, key: base.update({key: -key, -key: key}))),
+        Case("without", ("persistent",), "numbers", lambda bx, n: _derive(bx, n, lambda base, key: base.without(key))),
+        # MutableMappingBox
+        Case("__setitem__", ("dict",), "numbers", lambda bx, n: [bx.__setitem__(i, i) for i in range(n)]),
+        Case("__delitem__", ("dict",), "numbers", lambda bx, n: [bx.__delitem__(i) for i in range(n)]),
+        Case("live_filter", ("dict",), "numbers", lambda bx, n: _churn(bx, bx.live_filter(lambda key, value: value % 2), n)),
+        Case("live_group_by", ("dict",), "numbers", lambda bx, n: _churn(bx, bx.live_group_by(lambda value: value % 10), n)),
+        Case("live_sum", ("dict",), "numbers", lambda bx, n: _churn(bx, bx.live_sum(), n)),
+        # MutableSetBox
+        Case("add", SET_SOURCES, "numbers", lambda bx, n: [bx.add(-i) for i in range(n)]),
+        Case("discard", SET_SOURCES, "numbers", lambda bx, n: [bx.discard(i) for i in range(n)]),
+    ]
+
+
+def _instance_factories() -> dict[str, abc.Callable[[], Any]]:
+    """
+    Factories creating a small instance of every `Box` type, as created in bulk by e.g. `group_by` and `chunk`,
+    both directly and through `box()`.
+    """
+    items, mapping, frozen, values = [1, 2, 3], {1: 1}, frozendict({1: 1}), {1, 2, 3}
+    persistent = PersistentMap(mapping)
+
+    return {
+        "Box": lambda: Box(items),
+        "SequenceBox": lambda: SequenceBox(items),
+        "MutableSequenceBox": lambda: MutableSequenceBox(items),
+        "MappingBox": lambda: MappingBox(frozen),
+        "MutableMappingBox": lambda: MutableMappingBox(mapping),
+        "PersistentMappingBox": lambda: PersistentMappingBox(persistent),
+        "MutableSetBox": lambda: MutableSetBox(values),
+        "RecordBox": lambda: RecordBox({"id": items}),
+        "box(list)": lambda: box(items, copy=False),
+        "box(tuple)": lambda: box((1, 2, 3)),
+        "box(dict)": lambda: box(mapping, copy=False),
+        "box(set)": lambda: box(values, copy=False),
+        "box(int)": lambda: box(1),
+    }
+
+
+def instance_size(instance: object) -> int:
+    """The number of bytes an instance takes by itself, excluding its items: the object plus its `__dict__`, if it has one."""
+    size = sys.getsizeof(instance)
+
+    if hasattr(instance, "__dict__"):
+        size += sys.getsizeof(instance.__dict__)
+
+    return size
+
+
+def uncovered_methods(cases: list[Case]) -> list[str]:
+    """List the public methods of the benchmarked `Box` types that have no benchmark case."""
+    covered = {case.method for case in cases}
+    methods = set()
+
+    for cls in (Box, SizedBox, SequenceBox, MappingBox, MutableMappingBox, PersistentMappingBox, MutableSetBox):
+        for name, member in vars(cls).items():
+            if inspect.isfunction(member) and (not name.startswith("_") or name in ("__getitem__", "__setitem__", "__delitem__")):
+                methods.add(name)
+
+    return sorted(methods - covered)
+
+
+def run(sizes: list[int], repeat: int, methods: set[str] | None = None) -> list[dict[str, Any]]:
+    """Run all benchmark cases, keeping the fastest of `repeat` runs of each."""
+    results = []
+
+    for case in _cases():
+        if methods and case.method not in methods:
+            continue
+
+        for source in case.sources:
+            for size in sizes:
+                factory = _make_box(source, case.kind, size)
+                best = float("inf")
+
+                for _ in range(repeat):
+                    bx = factory()
+                    start = time.perf_counter()
+                    _consume(case.run(bx, size))
+                    best = min(best, time.perf_counter() - start)
+
+                results.append({
+                    "case": f"{case.method}[{source}]",
+                    "size": size,
+                    "seconds": best,
+                    "throughput": size / best if best else float("inf"),
+                })
+
+                print(f"{case.method:>20} {source:>10} {size:>10} {best * 1e3:12.3f} ms", file=sys.stderr)
+
+    if not methods or "create" in methods:
+        results.extend(run_instances(sizes, repeat))
+
+    return results
+
+
+def run_instances(sizes: list[int], repeat: int) -> list[dict[str, Any]]:
+    """Time creating `size` instances of every `Box` type, and measure the size of an instance."""
+    results = []
+
+    for name, factory in _instance_factories().items():
+        for size in sizes:
+            best = float("inf")
+
+            for _ in range(repeat):
+                start = time.perf_counter()
+
+                for _ in range(size):
+                    factory()
+
+                best = min(best, time.perf_counter() - start)
+
+            results.append({
+                "case": f"create[{name}]",
+                "size": size,
+                "seconds": best,
+                "throughput": size / best if best else float("inf"),
+                "bytes": instance_size(factory()),
+            })
+
+            print(f"{'create':>20} {name:>10} {size:>10} {best * 1e3:12.3f} ms {results[-1]['bytes']:>6} B", file=sys.stderr)
+
+    return results
+
+
+def compare(results: list[dict[str, Any]], baseline: list[dict[str, Any]], threshold: float) -> list[str]:
+    """
+    Find the cases whose throughput dropped by more than the threshold (a fraction) relative to the baseline,
+    and the `Box` types whose instances grew.
+    """
+    reference = {(result["case"], result["size"]): result for result in baseline}
+    regressions = []
+
+    for result in results:
+        expected = reference.get((result["case"], result["size"]), {})
+
+        if expected.get("throughput") and result["throughput"] < expected["throughput"] * (1 - threshold):
+            regressions.append(f"{result['case']} (n={result['size']}): {result['throughput']:.0f} items/s, baseline {expected['throughput']:.0f} items/s")
+
+        if "bytes" in result and "bytes" in expected and result["bytes"] > expected["bytes"]:
+            regressions.append(f"{result['case']}: {result['bytes']} bytes per instance, baseline {expected['bytes']} bytes")
+
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000], help="Input sizes, e.g. 1000 ... 10000000.")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of runs per case; the fastest run is recorded.")
+    parser.add_argument("--methods", nargs="*", help="Only benchmark these methods.")
+    parser.add_argument("--output", help="File to write the results to as JSON.")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare against.")
+    parser.add_argument("--save-baseline", help="File to store the results in as the new baseline.")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Maximum allowed relative drop in throughput.")
+    arguments = parser.parse_args(argv)
+
+    if missing := uncovered_methods(_cases()):
+        print(f"Warning: no benchmark for {', '.join(missing)}", file=sys.stderr)
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": datetime.datetime.now(datetime.UTC).isoformat(),
+        "results": run(arguments.sizes, arguments.repeat, set(arguments.methods or ())),
+    }
+
+    for path in filter(None, (arguments.output, arguments.save_baseline)):
+        with open(path, "w") as file:
+            json.dump(report, file, indent=2)
+
+    if arguments.baseline:
+        with open(arguments.baseline) as file:
+            regressions = compare(report["results"], json.load(file)["results"], arguments.threshold)
+
+        for regression in regressions:
+            print(f"Regression: {regression}", file=sys.stderr)
+
+        return 1 if regressions else 0
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
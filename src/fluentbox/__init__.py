@@ -1,17 +1,59 @@
+from .aggregates import Accumulator
+from .array_box import ArrayBox
+from .async_box import AsyncBox
+from .cache import BoxCache, CachedBox
+from .file_box import FileBox
 from .fluentbox import (
     Box,
+    GroupedBox,
+    LazyBox,
+    LiveFilterBox,
+    LiveGroupBox,
+    LiveSum,
     MappingBox,
     MutableMappingBox,
+    MutableSequenceBox,
     MutableSetBox,
+    ParallelBox,
     SequenceBox,
+    SequenceViewBox,
     box
 )
+from .persistent import PersistentMap, PersistentMappingBox
+from .pipeline import Pipeline, pipeline
+from .profiling import Profile, ProfileEvent, profile
+from .record_box import RecordBox
+from .shared import SharedMemoryBox, SharedMemoryHandle
 
 __all__ = [
+    "Accumulator",
+    "ArrayBox",
+    "AsyncBox",
     "Box",
+    "BoxCache",
+    "CachedBox",
+    "FileBox",
+    "GroupedBox",
+    "LazyBox",
+    "LiveFilterBox",
+    "LiveGroupBox",
+    "LiveSum",
     "MappingBox",
     "MutableMappingBox",
+    "MutableSequenceBox",
     "MutableSetBox",
+    "ParallelBox",
+    "PersistentMap",
+    "PersistentMappingBox",
+    "Pipeline",
+    "Profile",
+    "ProfileEvent",
+    "RecordBox",
     "SequenceBox",
+    "SequenceViewBox",
+    "SharedMemoryBox",
+    "SharedMemoryHandle",
     "box",
+    "pipeline",
+    "profile",
 ]
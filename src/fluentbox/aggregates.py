@@ -0,0 +1,381 @@
+from __future__ import annotations
+
+import abc as abstract
+import collections.abc as abc
+import heapq
+import math
+import operator
+import pickle
+import random
+import re
+import tempfile
+from typing import Any
+
+_MASK = (1 << 64) - 1
+_EMPTY: Any = object()
+
+# The number of files the groups are spread over when `aggregate_groups` spills to disk, and how deep it may spill recursively.
+_SPILL_PARTITIONS = 16
+_MAX_SPILL_DEPTH = 8
+
+
+class Accumulator(abstract.ABC):
+    """
+    Streaming accumulator that computes a statistic over values that are added one by one, in bounded memory.
+    Subclasses are used by `Box.aggregate`; custom subclasses may be passed to it as well.
+    """
+
+    @abstract.abstractmethod
+    def add(self, value: Any) -> None:
+        """
+        Add a value to the accumulator.
+
+        :param value: The value to add.
+        """
+
+    @abstract.abstractmethod
+    def result(self) -> Any:
+        """
+        :return: The statistic over all values added so far.
+        """
+
+
+class Count(Accumulator):
+    def __init__(self) -> None:
+        self._count = 0
+
+    def add(self, value: Any) -> None:
+        self._count += 1
+
+    def result(self) -> int:
+        return self._count
+
+
+class Sum(Accumulator):
+    """The sum of the values, or `None` if there are none (consistent with `Box.sum`)."""
+
+    def __init__(self) -> None:
+        self._sum: Any = None
+
+    def add(self, value: Any) -> None:
+        self._sum = value if self._sum is None else self._sum + value
+
+    def result(self) -> Any:
+        return self._sum
+
+
+class Min(Accumulator):
+    def __init__(self) -> None:
+        self._min: Any = None
+
+    def add(self, value: Any) -> None:
+        if self._min is None or value < self._min:
+            self._min = value
+
+    def result(self) -> Any:
+        return self._min
+
+
+class Max(Accumulator):
+    def __init__(self) -> None:
+        self._max: Any = None
+
+    def add(self, value: Any) -> None:
+        if self._max is None or value > self._max:
+            self._max = value
+
+    def result(self) -> Any:
+        return self._max
+
+
+class Mean(Accumulator):
+    """The arithmetic mean of the values, or `None` if there are none."""
+
+    def __init__(self) -> None:
+        self._sum: Any = 0
+        self._count = 0
+
+    def add(self, value: Any) -> None:
+        self._sum += value
+        self._count += 1
+
+    def result(self) -> Any:
+        return self._sum / self._count if self._count else None
+
+
+class First(Accumulator):
+    def __init__(self) -> None:
+        self._first: Any = None
+        self._empty = True
+
+    def add(self, value: Any) -> None:
+        if self._empty:
+            self._first, self._empty = value, False
+
+    def result(self) -> Any:
+        return self._first
+
+
+class Last(Accumulator):
+    def __init__(self) -> None:
+        self._last: Any = None
+
+    def add(self, value: Any) -> None:
+        self._last = value
+
+    def result(self) -> Any:
+        return self._last
+
+
+class Reduce(Accumulator):
+    """
+    Custom reducer, combining the values from left to right like `Box.reduce`, e.g. `lambda: Reduce(operator.mul)`.
+    Without an initial value, the result is `None` if there are no values.
+    """
+
+    def __init__(self, callback: abc.Callable[[Any, Any], Any], initial_value: Any = _EMPTY):
+        """
+        :param callback: The callback combining the result so far with the next value.
+        :param initial_value: The value to start with. By default, the first value is used.
+        """
+        self._callback = callback
+        self._result = initial_value
+
+    def add(self, value: Any) -> None:
+        self._result = value if self._result is _EMPTY else self._callback(self._result, value)
+
+    def result(self) -> Any:
+        return None if self._result is _EMPTY else self._result
+
+
+class Percentile(Accumulator):
+    """
+    Approximate percentile, computed over a uniform reservoir sample of the values. The result is exact as long as no more values
+    than the sample size were added. Values are interpolated linearly between the two nearest ranks.
+    """
+
+    def __init__(self, percentile: float, sample_size: int = 10_000, seed: int = 0):
+        """
+        :param percentile: The percentile to compute, between 0 and 100.
+        :param sample_size: The maximum number of values to keep in memory.
+        :param seed: The seed of the random sampling, for reproducible results.
+        """
+        if not 0 <= percentile <= 100:
+            raise ValueError(f"Invalid percentile: {percentile}")
+
+        self._percentile = percentile
+        self._sample_size = sample_size
+        self._sample: list = []
+        self._count = 0
+        self._random = random.Random(seed)
+
+    def add(self, value: Any) -> None:
+        self._count += 1
+
+        if len(self._sample) < self._sample_size:
+            self._sample.append(value)
+
+        elif (position := self._random.randrange(self._count)) < self._sample_size:
+            self._sample[position] = value
+
+    def result(self) -> Any:
+        if not self._sample:
+            return None
+
+        ordered = sorted(self._sample)
+        rank = (len(ordered) - 1) * self._percentile / 100
+        lower, upper = math.floor(rank), math.ceil(rank)
+
+        if lower == upper:
+            return ordered[lower]
+
+        return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+class DistinctCount(Accumulator):
+    """
+    Approximate number of distinct (hashable) values, using a k-minimum-values sketch. Only the `k` smallest hashes are kept,
+    so memory is bounded; the count is exact as long as there are fewer than `k` distinct values.
+    """
+
+    def __init__(self, k: int = 4096):
+        """
+        :param k: The number of hashes to keep. The relative error of the estimate is roughly `1 / sqrt(k)`.
+        """
+        self._k = k
+        self._heap: list[int] = []  # The negated `k` smallest hashes, so that the largest of them is on top.
+        self._hashes: set[int] = set()
+
+    def add(self, value: Any) -> None:
+        hashed = self._mix(hash(value))
+
+        if hashed in self._hashes:
+            return
+
+        if len(self._heap) < self._k:
+            heapq.heappush(self._heap, -hashed)
+            self._hashes.add(hashed)
+
+        elif hashed < -self._heap[0]:
+            self._hashes.discard(-heapq.heappushpop(self._heap, -hashed))
+            self._hashes.add(hashed)
+
+    def result(self) -> int:
+        if len(self._heap) < self._k:
+            return len(self._heap)
+
+        return round((self._k - 1) / ((-self._heap[0] + 1) / (_MASK + 1)))
+
+    @staticmethod
+    def _mix(value: int) -> int:
+        # Python hashes of small integers are the integers themselves; mix the bits (splitmix64) to spread them uniformly.
+        value = (value + 0x9E3779B97F4A7C15) & _MASK
+        value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+        value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK
+
+        return value ^ (value >> 31)
+
+
+_ACCUMULATORS: dict[str, abc.Callable[[], Accumulator]] = {
+    "count": Count,
+    "sum": Sum,
+    "min": Min,
+    "max": Max,
+    "mean": Mean,
+    "first": First,
+    "last": Last,
+    "median": lambda: Percentile(50),
+    "distinct": DistinctCount,
+}
+
+_PERCENTILE = re.compile(r"p(\d+(?:\.\d+)?)")
+
+
+def accumulator_factory(name: str | type[Accumulator] | abc.Callable[[], Accumulator]) -> abc.Callable[[], Accumulator]:
+    """
+    Resolve an aggregate into a factory of accumulators. Aggregates may be given by name (`"count"`, `"sum"`, `"min"`, `"max"`,
+    `"mean"`, `"first"`, `"last"`, `"median"`, `"distinct"`, or a percentile such as `"p95"` or `"p99.9"`), or as an
+    `Accumulator` subclass or other callable creating a new accumulator.
+
+    :param name: The aggregate.
+    :return: A callable creating a new accumulator.
+    :raises ValueError: When the aggregate name is unknown.
+    """
+    if not isinstance(name, str):
+        return name
+
+    if name in _ACCUMULATORS:
+        return _ACCUMULATORS[name]
+
+    if match := _PERCENTILE.fullmatch(name):
+        percentile = float(match.group(1))
+        return lambda: Percentile(percentile)
+
+    raise ValueError(f"Unknown aggregate: '{name}'")
+
+
+class _SpillFile:
+    """A temporary file that records are appended to in pickled batches, and that is deleted once it has been read back."""
+
+    def __init__(self, directory: str | None):
+        self._file = tempfile.TemporaryFile(dir=directory)
+        self._batch: list = []
+
+    def append(self, record: Any) -> None:
+        self._batch.append(record)
+
+        if len(self._batch) >= 1024:
+            self._flush()
+
+    def read(self) -> abc.Generator:
+        self._flush()
+        self._file.seek(0)
+
+        try:
+            while True:
+                try:
+                    batch = pickle.load(self._file)
+
+                except EOFError:
+                    return
+
+                yield from batch
+
+        finally:
+            self._file.close()
+
+    def _flush(self) -> None:
+        if self._batch:
+            pickle.dump(self._batch, self._file, pickle.HIGHEST_PROTOCOL)
+            self._batch = []
+
+
+def aggregate_groups(
+        pairs: abc.Iterable[tuple[abc.Hashable, Any]],
+        getters: abc.Sequence[abc.Callable[[Any], Any] | None],
+        factories: abc.Sequence[abc.Callable[[], Accumulator]],
+        spill_threshold: int | None = None,
+        spill_dir: str | None = None,
+) -> abc.Generator[tuple[abc.Hashable, list[Any]]]:
+    """
+    Aggregate `(group, value)` pairs per group, with one accumulator per factory, fed with the value passed through the
+    corresponding getter (or the value itself for a getter of `None`).
+
+    If `spill_threshold` is given, at most that many groups are accumulated in memory at a time. The values of any further groups
+    are passed through the getters and written to temporary files, partitioned by the hash of the group, and each partition is
+    aggregated after the groups in memory (spilling again if needed). The groups in memory are yielded in order of first
+    occurrence, followed by the spilled groups, partition by partition. Spilled values must be picklable.
+
+    :param pairs: The groups and values to aggregate.
+    :param getters: The getter of every accumulator.
+    :param factories: The factory of every accumulator.
+    :param spill_threshold: The maximum number of groups to accumulate in memory.
+    :param spill_dir: The directory to write temporary files to. Defaults to the system's temporary directory.
+    :return: A generator of `(group, results)` pairs, with the results in the order of the factories.
+    :raises ValueError: When `spill_threshold` is smaller than 1.
+    """
+    if spill_threshold is not None and spill_threshold < 1:
+        raise ValueError("The spill threshold must be at least 1")
+
+    return _aggregate_groups(pairs, getters, factories, spill_threshold, spill_dir, 0)
+
+
+def _aggregate_groups(
+        pairs: abc.Iterable[tuple[abc.Hashable, Any]],
+        getters: abc.Sequence[abc.Callable[[Any], Any] | None],
+        factories: abc.Sequence[abc.Callable[[], Accumulator]],
+        spill_threshold: int | None,
+        spill_dir: str | None,
+        depth: int,
+) -> abc.Generator[tuple[abc.Hashable, list[Any]]]:
+    group_accumulators: dict[abc.Hashable, list[Accumulator]] = {}
+    partitions: list[_SpillFile] = []
+
+    if depth >= _MAX_SPILL_DEPTH:
+        # The groups cannot be told apart by their hashes; spilling them again would not reduce their number.
+        spill_threshold = None
+
+    for group, value in pairs:
+        if (accumulators := group_accumulators.get(group)) is None:
+            if spill_threshold is not None and len(group_accumulators) >= spill_threshold:
+                if not partitions:
+                    partitions = [_SpillFile(spill_dir) for _ in range(_SPILL_PARTITIONS)]
+
+                # Only the values the accumulators need are written; the depth varies the partitioning of recursive spills.
+                values = tuple(value if getter is None else getter(value) for getter in getters)
+                partitions[hash((depth, group)) % _SPILL_PARTITIONS].append((group, values))
+                continue
+
+            accumulators = group_accumulators[group] = [factory() for factory in factories]
+
+        for getter, accumulator in zip(getters, accumulators):
+            accumulator.add(value if getter is None else getter(value))
+
+    for group, accumulators in group_accumulators.items():
+        yield group, [accumulator.result() for accumulator in accumulators]
+
+    group_accumulators.clear()
+    spilled_getters = [operator.itemgetter(position) for position in range(len(getters))]
+
+    for partition in partitions:
+        yield from _aggregate_groups(partition.read(), spilled_getters, factories, spill_threshold, spill_dir, depth + 1)
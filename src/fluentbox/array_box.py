@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import array
+import collections.abc as abc
+import math
+import numbers
+from typing import Any, cast
+
+from .fluentbox import Box, SequenceBox, WhereCondition, box
+
+try:
+    import numpy as np
+
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore[assignment]
+
+
+class ArrayBox[T: numbers.Number](SequenceBox[T]):
+    """
+    A `SequenceBox` backed by a one-dimensional NumPy array. Aggregates, comparisons, boolean masks, ufuncs and (if opted in)
+    arithmetic callbacks run as vectorized NumPy operations instead of item-by-item Python calls. Requires NumPy to be installed
+    (`fluentbox[numpy]`).
+    """
+
+    __slots__ = ()
+
+    _items: np.ndarray  # type: ignore[assignment]
+
+    def __init__(self, items: abc.Iterable[T] | np.ndarray, copy: bool = False):
+        """
+        Instantiate a new `ArrayBox`. Unless `copy` is set, NumPy arrays are wrapped as-is, and objects supporting the buffer protocol
+        (such as `array.array`) share their memory with the resulting array. Other iterables are converted into an array.
+
+        :param items: The numbers to collect.
+        :param copy: Whether to always copy the items into a new array.
+        :raises ImportError: When NumPy is not installed.
+        """
+        if np is None:
+            raise ImportError("ArrayBox requires NumPy; install fluentbox[numpy]")
+
+        if not isinstance(items, (abc.Sequence, np.ndarray, array.array)):
+            items = list(items)
+
+        self._items = np.array(items) if copy else np.asarray(items)
+
+    def __bool__(self) -> bool:
+        return len(self._items) > 0
+
+    @staticmethod
+    def accepts(items: Any, homogeneous: bool = False) -> bool:
+        """
+        Whether the given items should be wrapped in an `ArrayBox` by `box()`. This is the case for NumPy arrays and `array.array`
+        instances, and, if `homogeneous` is set, for sequences whose items are all `int` or all `float`.
+
+        :param items: The items to check.
+        :param homogeneous: Whether to also accept homogeneous numeric sequences.
+        :return: Whether the items can be wrapped in an `ArrayBox`.
+        """
+        if np is None:
+            return False
+
+        if isinstance(items, (np.ndarray, array.array)):
+            return True
+
+        if homogeneous and isinstance(items, abc.Sequence) and items:
+            item_types = set(map(type, items))
+            return item_types == {int} or item_types == {float}
+
+        return False
+
+    def all(self) -> np.ndarray:  # type: ignore[override]
+        return self._items
+
+    def average(self) -> Any:
+        if not self:
+            raise ZeroDivisionError
+
+        return self._items.mean().item()
+
+    def chunk(self, chunk_size: int) -> SequenceBox[np.ndarray]:  # type: ignore[override]
+        # Slicing NumPy arrays creates views, so no items are copied.
+        return SequenceBox([self._items[i: i + chunk_size] for i in range(0, len(self), chunk_size)])
+
+    def filter(self, callback: abc.Callable[[T], bool] | abc.Sequence[bool] | np.ndarray | None = None, vectorize: bool = False) -> ArrayBox[T]:
+        """
+        Create a new `ArrayBox` containing the items that pass the test. The test may be given as a boolean mask of the same length.
+        If the callback is a NumPy ufunc, or `vectorize` is set, it is first called once with the entire array; if that yields a
+        boolean mask, the mask is applied. Otherwise, the callback is applied to each item separately.
+
+        :param callback: The test callback or a boolean mask. If omitted, the items are tested for being truthy.
+        :param vectorize: Whether to try calling the callback on the entire array. Only set this for callbacks that are free of side
+            effects and consist of operations that broadcast over arrays, such as arithmetic and comparisons.
+        :return: A new `ArrayBox` containing the values that pass the test.
+        """
+        if callback is None:
+            return ArrayBox(self._items[self._items.astype(bool)])
+
+        if not callable(callback):
+            return ArrayBox(self._items[self._mask(callback)])
+
+        if (mask := self._vectorized(callback, vectorize)) is not None and mask.dtype == np.bool_:
+            return ArrayBox(self._items[mask])
+
+        return ArrayBox(self._items[np.fromiter(map(callback, self._iterable()), dtype=bool, count=len(self))])
+
+    def first_where(self, key: abc.Hashable | list[WhereCondition] = None, operation: str | None = None, value: Any = None, /, or_fail: bool = False) -> T | None:
+        """
+        Get the first item that satisfies the condition. As for `where`, a key of `None` compares the items themselves, as a single
+        vectorized operation; other keys are handled as in `Box.first_where`.
+        """
+        if key is not None:
+            return super().first_where(key, operation, value, or_fail=or_fail)
+
+        if len(positions := np.flatnonzero(self._where_mask(operation, value))):
+            return cast(T, self._items[positions[0]].item())
+
+        if or_fail:
+            raise IndexError
+
+        return None
+
+    def map[TMapped](self, callback: abc.Callable[[T], TMapped], vectorize: bool = False) -> SequenceBox[TMapped]:
+        """
+        Apply the callback to the items. If the callback is a NumPy ufunc, or `vectorize` is set, it is first called once with the entire
+        array. If that does not yield an array of the same length, the callback is applied to each item separately, and a regular
+        `SequenceBox` is returned.
+
+        :param callback: The callback to apply.
+        :param vectorize: Whether to try calling the callback on the entire array. Only set this for callbacks that are free of side
+            effects and consist of operations that broadcast over arrays, such as arithmetic.
+        :return: A new `ArrayBox` if the callback could be vectorized, or a `SequenceBox` otherwise.
+        """
+        if (result := self._vectorized(callback, vectorize)) is not None:
+            return cast(SequenceBox[TMapped], ArrayBox(result))
+
+        return SequenceBox([callback(value) for value in self._iterable()])
+
+    def max(self) -> Any:
+        return self._items.max().item() if self else None
+
+    def mean(self, compensated: bool = False) -> Any:
+        if not self:
+            return None
+
+        return math.fsum(self._items.tolist()) / len(self) if compensated else self._items.mean().item()
+
+    def min(self) -> Any:
+        return self._items.min().item() if self else None
+
+    def product(self) -> Any:
+        return self._items.prod().item() if self else None
+
+    def reverse(self) -> ArrayBox[T]:
+        return ArrayBox(self._items[::-1])
+
+    def sort_by(self, key: Any = None, descending: bool | list[bool] = False) -> SequenceBox[T]:
+        """
+        Sort the items. Without a key, the array is sorted by NumPy; otherwise, see `Box.sort_by`.
+        """
+        if key is None and isinstance(descending, bool):
+            result = np.sort(self._items, kind="stable")
+            return ArrayBox(result[::-1] if descending else result)
+
+        return cast(SequenceBox[T], super().sort_by(key, descending))
+
+    def sum(self, compensated: bool = False) -> Any:
+        if not self:
+            # Consistent with `Box.sum`, an empty `Box` has no sum.
+            return None
+
+        # NumPy uses pairwise summation, which is already more precise than adding up the items one by one.
+        return math.fsum(self._items.tolist()) if compensated else self._items.sum().item()
+
+    def variance(self, population: bool = False) -> float | None:
+        if len(self) < (1 if population else 2):
+            return None
+
+        return self._items.var(ddof=0 if population else 1).item()
+
+    def where(self, key: abc.Hashable | list[WhereCondition] = None, operation: str | None = None, value: Any = None) -> Box[T]:
+        """
+        Create a new `ArrayBox` containing the items that satisfy the comparison, which is evaluated as a single vectorized operation.
+        Since the items are numbers, they are compared themselves by passing `None` as the key: e.g. `where(None, ">", 3)`.
+        Other keys are looked up as in `Box.where`.
+
+        :param key: `None` to compare the items themselves.
+        :param operation: The operation to use when evaluating. If omitted, the items are tested for being truthy.
+        :param value: The value to compare the items against. For `between`, this is an inclusive `(low, high)` pair.
+        :return: A new `ArrayBox` containing the items that satisfy the comparison.
+        :raises ValueError: When an invalid operator is given.
+        """
+        if key is not None:
+            return super().where(key, operation, value)
+
+        return ArrayBox(self._items[self._where_mask(operation, value)])
+
+    def _iterable(self) -> list[T]:
+        # Iterating an array yields NumPy scalars one by one; converting it into a list of Python numbers at once is faster.
+        return cast(list[T], self._items.tolist())
+
+    def _mask(self, mask: abc.Sequence[bool] | np.ndarray) -> np.ndarray:
+        mask = np.asarray(mask, dtype=bool)
+
+        if mask.shape != self._items.shape:
+            raise ValueError(f"Mask of shape {mask.shape} does not match items of shape {self._items.shape}")
+
+        return mask
+
+    def _new(self, items: abc.Iterable[Any]) -> SequenceBox[Any]:  # type: ignore[override]
+        values = list(items)
+        result = np.asarray(values)
+
+        # Results that are not flat numbers (e.g. from `zip`) do not belong in an `ArrayBox`.
+        if result.ndim != 1 or result.dtype == np.object_:
+            return SequenceBox(values)
+
+        return ArrayBox(result)
+
+    def _vectorized(self, callback: abc.Callable, vectorize: bool) -> np.ndarray | None:
+        # Arbitrary callbacks may have side effects or only work on single numbers, so they are only given the array when opted in.
+        if not vectorize and not isinstance(callback, np.ufunc):
+            return None
+
+        try:
+            result = callback(self._items)
+
+        except (TypeError, ValueError):
+            return None
+
+        if isinstance(result, np.ndarray) and result.shape == self._items.shape:
+            return result
+
+        return None
+
+    def _where_mask(self, operation: str | None, value: Any) -> np.ndarray:
+        if operation is None:
+            return self._items.astype(bool)
+
+        if operation in ("in", "not in"):
+            return np.isin(self._items, list(value), invert=operation == "not in")
+
+        if operation == "between":
+            return cast(np.ndarray, (self._items >= value[0]) & (self._items <= value[1]))
+
+        if operation in self._OPERATOR_MAPPING:
+            # The comparison operators broadcast over NumPy arrays, yielding a boolean mask.
+            return cast(np.ndarray, self._OPERATOR_MAPPING[operation](self._items, value))
+
+        raise ValueError(f"Invalid operator: '{operation}'")
+
+
+if np is not None:
+    box.register(np.ndarray, lambda items, copy: ArrayBox(items, copy=copy))  # type: ignore[attr-defined]
+    box.register(array.array, lambda items, copy: ArrayBox(items, copy=copy))  # type: ignore[attr-defined]
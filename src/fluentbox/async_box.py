@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import asyncio
+import collections
+import collections.abc as abc
+import inspect
+from typing import Any, cast
+
+from .fluentbox import Box, MutableMappingBox, SequenceBox, WhereCondition, box
+
+
+async def _call[T](callback: abc.Callable[[Any], T | abc.Awaitable[T]], value: Any) -> T:
+    """Call the callback, awaiting the result if the callback is a coroutine function or otherwise returns an awaitable."""
+    result = callback(value)
+
+    if inspect.isawaitable(result):
+        return await result
+
+    return result
+
+
+class AsyncBox[T](abc.AsyncIterable[T]):
+    """
+    A `Box` over an asynchronous iterable, such as an async generator, database cursor or HTTP stream.
+    Chained methods return new `AsyncBox` instances that stream the items without buffering them; terminal methods are coroutines.
+    All callbacks may either be regular functions or coroutine functions.
+    """
+
+    __slots__ = ("_items",)
+
+    _items: abc.AsyncIterable[T]
+
+    def __init__(self, items: abc.AsyncIterable[T] | abc.Iterable[T]):
+        """
+        Instantiate a new `AsyncBox`. Does not evaluate or exhaust the given iterable.
+
+        :param items: The (asynchronous) iterable to collect. Synchronous iterables are wrapped.
+        """
+        if isinstance(items, abc.AsyncIterable):
+            self._items = items
+
+        else:
+            async def generator() -> abc.AsyncGenerator[T]:
+                for value in items:
+                    yield value
+
+            self._items = generator()
+
+    async def __aiter__(self) -> abc.AsyncGenerator[T]:
+        """Loop over the items this `AsyncBox` contains. Yields items one by one."""
+        async for value in self._items:
+            yield value
+
+    async def all(self) -> list[T]:
+        """
+        Exhaust the underlying iterable and collect the items into a list.
+
+        :return: A list containing all items.
+        """
+        return [value async for value in self]
+
+    def chunk(self, chunk_size: int) -> AsyncBox[list[T]]:
+        """
+        Split the items in chunks (each chunk being a list). Each chunk will have the given size, except for (possibly) the last chunk.
+        Only one chunk is kept in memory at a time.
+
+        :param chunk_size: The chunk size.
+        :return: A new `AsyncBox` instance containing the chunked items.
+        """
+        async def generator() -> abc.AsyncGenerator[list[T]]:
+            chunk = []
+
+            async for value in self:
+                chunk.append(value)
+
+                if len(chunk) == chunk_size:
+                    yield chunk
+                    chunk = []
+
+            if chunk:
+                yield chunk
+
+        return AsyncBox(generator())
+
+    async def collect(self) -> SequenceBox[T]:
+        """
+        Exhaust the underlying iterable and collect the items into a (synchronous) `SequenceBox`.
+
+        :return: A new `SequenceBox` instance containing all items.
+        """
+        return SequenceBox(await self.all())
+
+    async def each(self, callback: abc.Callable[[T], Any]) -> None:
+        """
+        Apply the callback to each item, awaiting it if necessary. This exhausts the underlying iterable.
+
+        :param callback: The callback to perform on each item.
+        """
+        async for value in self:
+            await _call(callback, value)
+
+    def filter(self, callback: abc.Callable[[T], bool | abc.Awaitable[bool]] | None = None) -> AsyncBox[T]:
+        """
+        Create a new `AsyncBox` instance containing the items that pass the test provided by the callback.
+        If no callback is provided, each item will be cast to a `bool` as a test instead.
+
+        :param callback: The test callback.
+        :return: A new `AsyncBox` containing the values that pass the test.
+        """
+        if callback is None:
+            callback = bool
+
+        async def generator() -> abc.AsyncGenerator[T]:
+            async for value in self:
+                if await _call(callback, value):
+                    yield value
+
+        return AsyncBox(generator())
+
+    async def first(self, or_fail: bool = False) -> T | None:
+        """
+        Get the first item. If the `AsyncBox` is empty, then `None` is returned instead, unless `or_fail` is set to `True`,
+        in which case an `IndexError` is thrown.
+
+        :param or_fail: Whether to throw an `IndexError` if no item exists.
+        :return: The first element.
+        :raises IndexError: If no element exists and `or_fail` is `True`.
+        """
+        async for value in self:
+            return value
+
+        if or_fail:
+            raise IndexError
+
+        return None
+
+    async def group_by[TKey: abc.Hashable](self, key: str | abc.Callable[[T], TKey | abc.Awaitable[TKey]]) -> MutableMappingBox[TKey, list[T]]:
+        """
+        Group the items by the given attribute or key, or by the result of the given callback.
+
+        :param key: The attribute or key to group by, or a callback that computes the group of an item.
+        :return: A new `MutableMappingBox` mapping every group to the list of its items.
+        :raises KeyError: When an item does not have the attribute or key.
+        """
+        callback = Box._compile_pluck(key, raise_on_error=True) if isinstance(key, str) else key
+        result: dict[TKey, list[T]] = {}
+
+        async for value in self:
+            result_key = await _call(callback, value)
+
+            if result_key in result:
+                result[result_key].append(value)
+
+            else:
+                result[result_key] = [value]
+
+        return box(result)
+
+    def map[TMapped](self, callback: abc.Callable[[T], TMapped | abc.Awaitable[TMapped]], concurrency: int | None = None) -> AsyncBox[TMapped]:
+        """
+        Create a new `AsyncBox` instance containing the results of applying the callback to each item.
+        If a concurrency is given, up to that many callbacks are awaited at the same time; the results are still yielded in order.
+
+        :param callback: The callback to apply to each item.
+        :param concurrency: The maximum number of callbacks that may run concurrently. By default, callbacks are awaited one by one.
+        :return: A new `AsyncBox` containing the mapped values.
+        """
+        if concurrency is not None and concurrency < 1:
+            raise ValueError("The concurrency must be at least 1")
+
+        async def generator() -> abc.AsyncGenerator[TMapped]:
+            async for value in self:
+                yield await _call(callback, value)
+
+        async def concurrent_generator(limit: int) -> abc.AsyncGenerator[TMapped]:
+            pending: collections.deque[asyncio.Future[TMapped]] = collections.deque()
+
+            try:
+                async for value in self:
+                    pending.append(asyncio.ensure_future(_call(callback, value)))
+
+                    if len(pending) >= limit:
+                        yield await pending.popleft()
+
+                while pending:
+                    yield await pending.popleft()
+
+            finally:
+                # If the consumer stops early, callbacks that are still running are of no use anymore.
+                for future in pending:
+                    future.cancel()
+
+        return AsyncBox(generator() if concurrency is None else concurrent_generator(concurrency))
+
+    async def reduce[TInitial, T2](self, callback: abc.Callable[[T | TInitial, T], T2 | abc.Awaitable[T2]], initial_value: TInitial = None) -> T2:  # type: ignore[assignment]
+        """
+        Reduce the items to a single value. If no initial value is given, the first item is used as initial value.
+
+        :param callback: The callback combining the intermediate result with the next item.
+        :param initial_value: The initial value.
+        :return: The reduced value.
+        """
+        result: Any = initial_value
+        is_first_iteration = True
+
+        async for value in self:
+            if is_first_iteration and result is None:
+                result = value
+                is_first_iteration = False
+
+            else:
+                result = callback(result, value)
+
+                if inspect.isawaitable(result):
+                    result = await result
+
+        return cast(T2, result)
+
+    def where(self, key: abc.Hashable | list[WhereCondition], operation: str | None = None, value: Any = None) -> AsyncBox[T]:
+        """
+        Create a new `AsyncBox` instance containing the items that satisfy the condition. See `Box.where`.
+
+        :param key: The attribute or key of the item to evaluate, or a list of `(key, operation, value)` conditions that must all hold.
+        :param operation: The operation to use when evaluating.
+        :param value: The value to evaluate the item's attribute or key against.
+        :return: A new `AsyncBox` containing the items that satisfy the condition.
+        """
+        return self.filter(Box._compile_where(key, operation, value))
+
+
+box.register(abc.AsyncIterable, lambda items, copy: AsyncBox(items))  # type: ignore[attr-defined]
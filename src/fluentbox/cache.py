@@ -0,0 +1,310 @@
+from __future__ import annotations
+
+import collections
+import collections.abc as abc
+import time
+from typing import Any, NamedTuple
+
+from frozendict import frozendict
+
+from .fluentbox import _MISSING, Box, MappingBox, MutableMappingBox, _LiveView
+from .persistent import PersistentMap
+
+# Methods that are passed through to the `Box` without caching: they mutate it, have side effects, or return it as-is.
+_UNCACHED = frozenset({
+    "all", "cached", "clear", "each", "lazy", "live_filter", "live_group_by", "live_sum", "parallel", "pop", "popitem",
+    "setdefault", "update",
+})
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class _Identity:
+    """Cache key component that compares by identity. It holds a reference to the object, so its id cannot be reused."""
+
+    __slots__ = ("obj",)
+
+    def __init__(self, obj: object):
+        self.obj = obj
+
+    def __hash__(self) -> int:
+        return id(self.obj)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _Identity) and other.obj is self.obj
+
+
+class _CacheInvalidator(_LiveView):
+    """
+    Drops the cached results of a `MutableMappingBox` from a `BoxCache` as soon as the box changes. `CachedBox` proxies created
+    before the change use it to detect that the result they wrap is outdated.
+    """
+
+    __slots__ = ("_cache", "_source_key", "valid", "__weakref__")
+
+    def __init__(self, cache: BoxCache, source_key: _Identity):
+        self._cache = cache
+        self._source_key = source_key
+        self.valid = True
+
+    def _update(self, key: Any, old: Any, new: Any) -> None:
+        if self.valid:
+            self.valid = False
+            self._cache._invalidate(self._source_key)
+
+
+class BoxCache:
+    """
+    A bounded cache of the results of `Box` operations, used by `MappingBox.cached`. When it is full, the least recently used
+    result is evicted. Optionally, results expire after a time to live. A `BoxCache` is not thread-safe.
+    """
+
+    def __init__(self, maxsize: int = 128, ttl: float | None = None):
+        """
+        :param maxsize: The maximum number of results to keep.
+        :param ttl: The number of seconds after which a result expires. By default, results do not expire.
+        """
+        if maxsize < 1:
+            raise ValueError("The maximum size must be at least 1")
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: collections.OrderedDict[tuple, tuple[Any, float | None]] = collections.OrderedDict()
+        # The keys of the results of every source, and the invalidators watching mutable sources.
+        self._source_entries: dict[Any, set[tuple]] = {}
+        self._invalidators: dict[_Identity, _CacheInvalidator] = {}
+        self._hits = 0
+        self._misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def cache_info(self) -> CacheInfo:
+        """
+        :return: The number of hits and misses, and the maximum and current number of results.
+        """
+        return CacheInfo(self._hits, self._misses, self.maxsize, len(self._entries))
+
+    def clear(self) -> None:
+        """Remove all results, and reset the statistics."""
+        self._entries.clear()
+        self._source_entries.clear()
+        self._invalidators.clear()
+        self._hits = self._misses = 0
+
+    def invalidate(self, source: MappingBox) -> None:
+        """
+        Remove all results computed from the given `MappingBox`. This is done automatically for `MutableMappingBox` instances
+        when they are changed through the box.
+
+        :param source: The `MappingBox` whose results to remove.
+        """
+        self._invalidate(_source_key(source))
+
+    def _get(self, key: tuple) -> Any:
+        entry = self._entries.get(key)
+
+        if entry is None or (entry[1] is not None and entry[1] <= time.monotonic()):
+            if entry is not None:
+                self._remove(key)
+
+            self._misses += 1
+            return _MISSING
+
+        self._entries.move_to_end(key)
+        self._hits += 1
+
+        return entry[0]
+
+    def _put(self, key: tuple, value: Any) -> None:
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+
+        self._entries[key] = (value, expires)
+        self._source_entries.setdefault(key[0], set()).add(key)
+
+        while len(self._entries) > self.maxsize:
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: tuple) -> None:
+        del self._entries[key]
+        source_key = key[0]
+        keys = self._source_entries[source_key]
+        keys.discard(key)
+
+        if not keys:
+            # Once a source has no results left, the cache no longer needs to watch it (or keep it alive).
+            del self._source_entries[source_key]
+            self._invalidators.pop(source_key, None)
+
+    def _invalidate(self, source_key: Any) -> None:
+        for key in list(self._source_entries.get(source_key, ())):
+            self._remove(key)
+
+        if (invalidator := self._invalidators.pop(source_key, None)) is not None:
+            invalidator.valid = False
+
+    def _watch(self, source: MutableMappingBox, source_key: _Identity) -> _CacheInvalidator:
+        if (invalidator := self._invalidators.get(source_key)) is None:
+            invalidator = self._invalidators[source_key] = source._observe(_CacheInvalidator(self, source_key))
+
+        return invalidator
+
+
+_DEFAULT_CACHE = BoxCache()
+
+
+class CachedBox:
+    """
+    A proxy for a `Box` that caches the result of every method call in a `BoxCache`, keyed by the source `MappingBox`, the chain
+    of calls leading up to this proxy, and the call itself. Results that are `Box` instances are wrapped in a `CachedBox` again,
+    so that entire pipelines are cached step by step; other results are returned as-is. Use `unwrap` to obtain the `Box` itself.
+
+    Cached results are shared between identical queries, so they must not be mutated. A `Box` over a generator is materialized
+    into a list before it is cached, and other iterators are not cached. Calls with unhashable arguments are not cached; neither
+    are calls with different (e.g. newly created lambda) callbacks, which never hit the cache.
+    """
+
+    __slots__ = ("_cache", "_key", "_box", "_source", "_token")
+
+    def __init__(self, source: MappingBox, cache: BoxCache | None = None):
+        """
+        :param source: The `MappingBox` to cache the results of. It must be backed by a `frozendict` or `PersistentMap`, or be a
+            `MutableMappingBox`.
+        :param cache: The cache to use. By default, a cache shared by all `CachedBox` instances is used.
+        :raises TypeError: When the `MappingBox` is neither backed by a `frozendict` or `PersistentMap` nor mutable, so that changes
+            cannot be detected.
+        """
+        source_key = _source_key(source)
+
+        self._cache = cache if cache is not None else _DEFAULT_CACHE
+        self._source = source
+        self._key: tuple = (source_key, ())
+        self._box: Box = source
+        # For a mutable source, the invalidator that marks the wrapped result as outdated once the source changes.
+        self._token = self._cache._watch(source, source_key) if isinstance(source, MutableMappingBox) else None
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self._current(), name)
+
+        if name.startswith("_") or name in _UNCACHED or not callable(attribute):
+            return attribute
+
+        def method(*args: Any, **kwargs: Any) -> Any:
+            return self._call(name, args, kwargs)
+
+        return method
+
+    def __bool__(self) -> bool:
+        return bool(self._current())
+
+    def __contains__(self, obj: Any) -> bool:
+        return obj in self._current()
+
+    def __getitem__(self, key: Any) -> Any:
+        return self._current()[key]  # type: ignore[index]
+
+    def __iter__(self) -> abc.Iterator:
+        return iter(self._current())
+
+    def __len__(self) -> int:
+        return len(self._current())  # type: ignore[arg-type]
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._current()!r})"
+
+    def unwrap(self) -> Box:
+        """
+        :return: The `Box` this proxy wraps.
+        """
+        return self._current()
+
+    def _call(self, name: str, args: tuple, kwargs: dict[str, Any]) -> Any:
+        source_key, chain = self._key
+        chain = chain + ((name, args, tuple(sorted(kwargs.items()))),)
+        key = (source_key, chain)
+
+        box = self._current()
+
+        try:
+            hash(key)
+
+        except TypeError:
+            return self._wrap(getattr(box, name)(*args, **kwargs), key)
+
+        if (result := self._cache._get(key)) is _MISSING:
+            result = getattr(box, name)(*args, **kwargs)
+
+            if isinstance(result, Box) and isinstance(result.all(), abc.Iterator):
+                # A `Box` over a generator (e.g. from `chunk`) can only be iterated once, so it is materialized before it is shared.
+                result = Box(list(result))
+
+            elif isinstance(result, abc.Iterator):
+                # Other results that can only be iterated once cannot be shared at all.
+                return result
+
+            self._cache._put(key, result)
+
+        return self._wrap(result, key)
+
+    def _current(self) -> Box:
+        if self._token is None or self._token.valid:
+            return self._box
+
+        # The source changed since the wrapped result was computed; replay the chain of calls on the source, through the cache.
+        proxy = CachedBox(self._source, self._cache)
+
+        for name, args, kwargs in self._key[1]:
+            proxy = proxy._call(name, args, dict(kwargs))
+
+        self._box, self._token = proxy._box, proxy._token
+
+        return self._box
+
+    def _wrap(self, result: Any, key: tuple) -> Any:
+        if not isinstance(result, Box):
+            return result
+
+        proxy = object.__new__(CachedBox)
+        proxy._cache, proxy._source, proxy._key, proxy._box, proxy._token = self._cache, self._source, key, result, self._token
+
+        return proxy
+
+
+def _source_key(source: MappingBox) -> Any:
+    if isinstance(source, MutableMappingBox):
+        return _Identity(source)
+
+    items = source.all()
+
+    if not isinstance(items, (frozendict, PersistentMap)):
+        raise TypeError(f"Cannot cache a MappingBox over {type(items)}, since its changes cannot be detected")
+
+    try:
+        # Equal `frozendict` and `PersistentMap` instances share their cached results, as long as their keys and values have the same types.
+        key = _typed(items)
+        hash(key)
+        return key
+
+    except TypeError:
+        # A mapping with unhashable values is still immutable, so its identity is a valid key.
+        return _Identity(items)
+
+
+def _typed(obj: Any) -> Any:
+    # Equal objects of different types, such as `1`, `1.0` and `True`, or a `frozendict` and a `PersistentMap`, can give different
+    # results (e.g. of `map(str)`), so the type of every key and value is part of the key, recursing into immutable containers.
+    if isinstance(obj, (frozendict, PersistentMap)):
+        return type(obj), frozenset((_typed(key), _typed(value)) for key, value in obj.items())
+
+    if isinstance(obj, frozenset):
+        return type(obj), frozenset(map(_typed, obj))
+
+    if isinstance(obj, tuple):
+        return type(obj), tuple(map(_typed, obj))
+
+    return type(obj), obj
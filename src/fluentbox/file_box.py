@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import array
+import collections.abc as abc
+import csv
+import functools
+import json
+import mmap
+import os
+import struct
+import typing
+from typing import Any, cast
+
+from .fluentbox import Box, SequenceViewBox, box
+
+
+class _MappedFile:
+    """A read-only memory map of a file. Empty files, which cannot be mapped, are represented by an empty buffer."""
+
+    def __init__(self, path: str | os.PathLike):
+        self._file = open(path, "rb")
+
+        try:
+            self.buffer: mmap.mmap | bytes = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        except ValueError:
+            self.buffer = b""
+
+    def close(self) -> None:
+        if isinstance(self.buffer, mmap.mmap):
+            self.buffer.close()
+
+        self._file.close()
+
+
+class _LineRecords(abc.Sequence):
+    """
+    Random-access sequence over the lines of a memory-mapped file. The offset of every line is only determined when it is needed
+    for random access (`len` or indexing), and then stored compactly in an `array.array`. Iterating does not build the index.
+    """
+
+    def __init__(self, path: str | os.PathLike, decode: abc.Callable[[bytes], Any], skip_lines: int = 0):
+        self._file = _MappedFile(path)
+        self._decode = decode
+        self._start = 0
+        self._offsets: array.array | None = None
+
+        for _ in range(skip_lines):
+            self._start = self._next_line(self._start)
+
+    def __len__(self) -> int:
+        return len(self._index())
+
+    def __iter__(self) -> abc.Iterator:
+        buffer, position = self._file.buffer, self._start
+
+        while position < len(buffer):
+            end = self._next_line(position)
+            yield self._decode(buffer[position:end].rstrip(b"\r\n"))
+            position = end
+
+    @typing.overload
+    def __getitem__(self, index: int) -> Any:
+        ...
+
+    @typing.overload
+    def __getitem__(self, index: slice) -> list:
+        ...
+
+    def __getitem__(self, index: int | slice) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        offsets = self._index()
+
+        if index < 0:
+            index += len(offsets)
+
+        if not 0 <= index < len(offsets):
+            raise IndexError("Record index out of range")
+
+        start = offsets[index]
+
+        return self._decode(self._file.buffer[start:self._next_line(start)].rstrip(b"\r\n"))
+
+    def close(self) -> None:
+        self._file.close()
+
+    def _index(self) -> array.array:
+        if self._offsets is None:
+            offsets, position, size = array.array("q"), self._start, len(self._file.buffer)
+
+            while position < size:
+                offsets.append(position)
+                position = self._next_line(position)
+
+            self._offsets = offsets
+
+        return self._offsets
+
+    def _next_line(self, position: int) -> int:
+        end = self._file.buffer.find(b"\n", position)
+
+        return len(self._file.buffer) if end == -1 else end + 1
+
+
+class _StructRecords(abc.Sequence):
+    """Random-access sequence over the fixed-width binary records of a memory-mapped file. No index is needed."""
+
+    def __init__(self, path: str | os.PathLike, record_format: str, fields: abc.Sequence[str] | None = None):
+        self._file = _MappedFile(path)
+        self._struct = struct.Struct(record_format)
+        self._fields = tuple(fields) if fields else None
+
+        if len(self._file.buffer) % self._struct.size:
+            self._file.close()
+            raise ValueError(f"File size is not a multiple of the record size {self._struct.size}")
+
+    def __len__(self) -> int:
+        return len(self._file.buffer) // self._struct.size
+
+    def __iter__(self) -> abc.Iterator:
+        for record in self._struct.iter_unpack(self._file.buffer):
+            yield self._record(record)
+
+    @typing.overload
+    def __getitem__(self, index: int) -> Any:
+        ...
+
+    @typing.overload
+    def __getitem__(self, index: slice) -> list:
+        ...
+
+    def __getitem__(self, index: int | slice) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        if index < 0:
+            index += len(self)
+
+        if not 0 <= index < len(self):
+            raise IndexError("Record index out of range")
+
+        return self._record(self._struct.unpack_from(self._file.buffer, index * self._struct.size))
+
+    def close(self) -> None:
+        self._file.close()
+
+    def _record(self, values: tuple) -> Any:
+        return dict(zip(self._fields, values)) if self._fields else values
+
+
+class FileBox[T](SequenceViewBox[T]):
+    """
+    A read-only `SequenceBox` over the records of a file, backed by a memory map. Records are decoded when they are accessed,
+    so pipelines like `where`, `pluck` and `reduce` only keep their results in memory, not the file. `chunk` yields the chunks
+    lazily. The file stays open until `close` is called, or until the `with` block the `FileBox` is used in ends.
+    """
+
+    __slots__ = ()
+
+    _items: _LineRecords | _StructRecords
+
+    def __enter__(self) -> typing.Self:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def chunk(self, chunk_size: int) -> Box[list[T]]:  # type: ignore[override]
+        return Box(cast(list[T], self[i: i + chunk_size]) for i in range(0, len(self), chunk_size))
+
+    def close(self) -> None:
+        """Close the underlying file."""
+        self._items.close()
+
+
+def _csv_decoder(path: str | os.PathLike, encoding: str, dialect: str) -> abc.Callable[[bytes], dict[str, str]]:
+    with open(path, encoding=encoding, newline="") as file:
+        header = next(csv.reader(file, dialect=dialect), [])
+
+    return lambda line: dict(zip(header, next(csv.reader([line.decode(encoding)], dialect=dialect), [])))
+
+
+def from_file(
+        path: str | os.PathLike,
+        file_format: str = "lines",
+        *,
+        stream: bool = False,
+        encoding: str = "utf-8",
+        dialect: str = "excel",
+        record_format: str | None = None,
+        fields: abc.Sequence[str] | None = None,
+) -> FileBox | Box:
+    """
+    Create a `Box` over the records in a file, without loading the file into memory.
+
+    Supported formats are `"lines"` (each line is a `str`), `"jsonl"` (each line is decoded as JSON), `"csv"` (each line after the
+    header is a `dict` keyed by the header; quoted fields spanning multiple lines are not supported) and `"binary"` (fixed-width
+    records decoded with the `struct` format `record_format`, as tuples, or as dicts if `fields` are given).
+
+    By default, a `FileBox` with random access is returned. With `stream=True`, a `Box` over a generator is returned instead,
+    which reads the file once, front to back, and closes it when exhausted.
+
+    :param path: The file to read.
+    :param file_format: The format of the file: `"lines"`, `"jsonl"`, `"csv"` or `"binary"`.
+    :param stream: Whether to return a one-pass streaming `Box` rather than a random-access `FileBox`.
+    :param encoding: The encoding of text files.
+    :param dialect: The `csv` dialect of CSV files.
+    :param record_format: The `struct` format of a binary record.
+    :param fields: Names of the values in a binary record.
+    :return: A new `FileBox` instance, or a streaming `Box` instance.
+    :raises ValueError: When the format is unknown, or the binary file does not consist of whole records.
+    """
+    if file_format == "binary":
+        if record_format is None:
+            raise ValueError("A record format is required for binary files")
+
+        records: _LineRecords | _StructRecords = _StructRecords(path, record_format, fields)
+        return FileBox(records) if not stream else Box(_stream(records))
+
+    skip_lines = 0
+    decode: abc.Callable[[bytes], Any]
+
+    match file_format:
+        case "lines":
+            decode = functools.partial(bytes.decode, encoding=encoding)
+        case "jsonl":
+            decode = json.loads
+        case "csv":
+            decode, skip_lines = _csv_decoder(path, encoding, dialect), 1
+        case _:
+            raise ValueError(f"Unknown file format: '{file_format}'")
+
+    records = _LineRecords(path, decode, skip_lines)
+
+    return FileBox(records) if not stream else Box(_stream(records))
+
+
+def _stream(records: _LineRecords | _StructRecords) -> abc.Generator:
+    try:
+        yield from records
+
+    finally:
+        records.close()
+
+
+box.from_file = from_file  # type: ignore[attr-defined]
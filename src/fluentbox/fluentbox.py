@@ -1,13 +1,54 @@
 from __future__ import annotations
 
+import bisect
+import collections
 import collections.abc as abc
+import concurrent.futures
+import functools
+import heapq
+import itertools
+import math
 import numbers
 import operator
+import types
 import typing
+import weakref
 from typing import final, Any, cast, Protocol, runtime_checkable
 
 from frozendict import frozendict
 
+from .aggregates import Accumulator, accumulator_factory, aggregate_groups
+
+if typing.TYPE_CHECKING:
+    from .array_box import ArrayBox
+    from .async_box import AsyncBox
+    from .cache import BoxCache, CachedBox
+    from .persistent import PersistentMappingBox
+    from .record_box import RecordBox
+    from .shared import SharedMemoryHandle
+
+
+type WhereCondition = tuple[abc.Hashable] | tuple[abc.Hashable, str | None] | tuple[abc.Hashable, str | None, Any]
+
+
+type AggregateSpec = str | abc.Callable[[], Accumulator] | tuple[abc.Hashable | abc.Callable[[Any], Any], str | abc.Callable[[], Accumulator]]
+
+
+type BoxFactory = abc.Callable[[Any, bool], Box]
+
+
+type SortKey = abc.Hashable | abc.Callable[[Any], Any] | list[abc.Hashable | abc.Callable[[Any], Any]]
+
+
+_MISSING: Any = object()
+
+# Whether items of a type can be rebuilt from an iterable by `Box._new`, cached per type.
+_REBUILDABLE_TYPES: dict[type, bool] = {}
+
+# The factories registered with `box.register`, and the factory that `box()` resolved for every type of items it was called with.
+_BOX_FACTORIES: dict[type, BoxFactory] = {}
+_DISPATCH_CACHE: dict[type, BoxFactory | None] = {}
+
 
 @runtime_checkable
 class SizedIterable[T](abc.Sized, abc.Iterable[T], Protocol):
@@ -15,8 +56,50 @@ class SizedIterable[T](abc.Sized, abc.Iterable[T], Protocol):
     pass
 
 
+class _HashIndex(abc.Container):
+    """
+    Membership index over an iterable. Hashable values are looked up in a hash set; unhashable values are kept in a list
+    and scanned linearly, so that arbitrary iterables are supported while the common case is O(1) per lookup.
+    """
+
+    def __init__(self, items: abc.Iterable = ()):
+        self._hashed: abc.Container = set()
+        self._unhashable: list = []
+
+        if isinstance(items, (abc.Set, abc.Mapping)):
+            # These are already hash-based; there is no need to copy them.
+            self._hashed = items
+            return
+
+        for value in items:
+            self.add(value)
+
+    def __contains__(self, value: object) -> bool:
+        try:
+            if value in self._hashed:
+                return True
+
+        except TypeError:
+            # An unhashable value can only be equal to unhashable values.
+            return value in self._unhashable
+
+        return bool(self._unhashable) and value in self._unhashable
+
+    def add(self, value: Any) -> None:
+        try:
+            cast(set, self._hashed).add(value)
+
+        except TypeError:
+            self._unhashable.append(value)
+
+
 class Box[T](abc.Iterable[T]):
-    """Base class for all `Box` types."""
+    """
+    Base class for all `Box` types. All `Box` classes declare `__slots__`, so that instances do not carry a `__dict__`;
+    subclasses adding state must declare their own slots.
+    """
+
+    __slots__ = ("_items",)
 
     _items: abc.Iterable[T]
     _OPERATOR_MAPPING: dict[str, abc.Callable[[T, Any], bool]] = {
@@ -28,6 +111,9 @@ class Box[T](abc.Iterable[T]):
         ">=": operator.ge,
         "<": operator.lt,
         ">": operator.gt,
+        "in": lambda obj, value: obj in value,
+        "not in": lambda obj, value: obj not in value,
+        "between": lambda obj, value: value[0] <= obj <= value[1],
     }
 
     def __init__(self, items: abc.Iterable[T]):
@@ -36,8 +122,7 @@ class Box[T](abc.Iterable[T]):
 
         :param items: The iterable to collect.
         """
-        if not hasattr(self, "_items"):
-            self._items = items
+        self._items = items
 
     def __bool__(self) -> bool:
         """
@@ -56,10 +141,14 @@ class Box[T](abc.Iterable[T]):
         """
         return obj in self._items
 
-    def __iter__(self) -> abc.Generator[T]:
+    def __iter__(self) -> abc.Iterator[T]:
         """Loop over the items this `Box` contains. Yields items one by one."""
         yield from self._items
 
+    def __reduce__(self) -> tuple:
+        # Only the payload is pickled; derived state such as secondary indexes and live views is not.
+        return type(self), (self._items,)
+
     @final
     @property
     def item_type(self) -> type[T]:
@@ -68,6 +157,53 @@ class Box[T](abc.Iterable[T]):
         """
         return type(self._items)
 
+    def aggregate(self, *aggregates: str, key: abc.Hashable | abc.Callable[[T], Any] | None = None, **named: AggregateSpec) -> MutableMappingBox[str, Any]:
+        """
+        Compute several statistics over the items in a single pass. Every statistic is computed by a streaming accumulator in bounded
+        memory, so this also works on generators; percentiles and distinct counts are approximate on large inputs.
+        See `aggregates.accumulator_factory` for the available aggregates.
+
+        Example: `box(rows).aggregate("count", total=("amount", "sum"), p95=("latency", "p95"))`.
+
+        :param aggregates: Names of aggregates to compute over the items (or over `key`), keyed by their name in the result.
+        :param key: The attribute or key (or a callback) to aggregate for the positional aggregates.
+        :param named: Aggregates keyed by their name in the result. Each is either an aggregate, computed over the items (or over
+            `key`), or an `(attribute or key or callback, aggregate)` pair. An aggregate may also be an `Accumulator` factory.
+        :return: A new `MutableMappingBox` mapping the names to the results.
+        :raises ValueError: When an aggregate name is unknown.
+        """
+        specs = self._compile_aggregates(aggregates, key, named)
+        accumulators = [(getter, factory()) for _, getter, factory in specs]
+
+        for value in self:
+            for getter, accumulator in accumulators:
+                accumulator.add(value if getter is None else getter(value))
+
+        return cast(MutableMappingBox[str, Any], box({name: accumulator.result() for (name, _, _), (_, accumulator) in zip(specs, accumulators)}))
+
+    def aggregate_by[TKey: abc.Hashable](self, group: str | abc.Callable[[T], TKey] | list[str | abc.Callable[[T], Any]], *aggregates: str, key: abc.Hashable | abc.Callable[[T], Any] | None = None, nested: bool = False, spill_threshold: int | None = None, spill_dir: str | None = None, **named: AggregateSpec) -> MutableMappingBox[TKey, dict[str, Any]]:
+        """
+        Compute several statistics per group in a single pass, like `group_by(group).aggregate(...)`, but without building the groups:
+        only the accumulators of every group are kept in memory, so generators with many items can be aggregated as well.
+
+        Example: `box(rows).aggregate_by("user", "count", total=("amount", "sum"))`.
+
+        :param group: The attribute or key to group by, a callback computing the group of an item, or a list of those, see `group_by`.
+        :param aggregates: The aggregates to compute for every group, see `aggregate`.
+        :param key: The attribute or key (or a callback) to aggregate for the positional aggregates.
+        :param nested: Whether to nest the groups of multiple levels, rather than keying them by tuples.
+        :param spill_threshold: The maximum number of groups to keep accumulators for in memory. Further groups are partitioned to
+            temporary files and aggregated afterwards, see `aggregates.aggregate_groups`.
+        :param spill_dir: The directory to write temporary files to when spilling. Defaults to the system's temporary directory.
+        :param named: Aggregates keyed by their name in the result, see `aggregate`.
+        :return: A new `MutableMappingBox` mapping every group to a dict of the names and results of the aggregates.
+        :raises ValueError: When an aggregate name is unknown, or when `spill_threshold` is smaller than 1.
+        """
+        callback, levels = self._compile_group_key(group, nested)
+        specs = self._compile_aggregates(aggregates, key, named)
+
+        return _aggregate_pairs(((callback(value), value) for value in self), specs, levels, spill_threshold, spill_dir)
+
     def all(self) -> abc.Iterable[T]:
         """
         Get the underlying iterable that this `Box` wraps around, effectively unwrapping.
@@ -77,12 +213,31 @@ class Box[T](abc.Iterable[T]):
         """
         return self._items
 
+    def anti_join[TKey](self, other: abc.Iterable, key: abc.Hashable | abc.Callable[[T], TKey], other_key: abc.Hashable | abc.Callable[[Any], TKey] | None = None, *, presorted: bool = False) -> Box[T]:
+        """
+        Create a new `Box` instance containing the items of this `Box` that have no matching item in the other iterable.
+        See `join` for the arguments.
+
+        :return: A new `Box` containing the items without a match.
+        """
+        return self._new(value for value, matches in self._join_matches(other, key, other_key, presorted) if not matches)
+
+    def batched_map[TMapped](self, callback: abc.Callable[[list[T]], abc.Iterable[TMapped]], batch_size: int) -> Box[TMapped]:
+        """
+        Apply the callback to batches of items, and flatten the results. This is useful for callbacks that are more efficient
+        on many items at once, such as bulk database lookups. Only one batch is kept in memory at a time.
+
+        :param callback: The callback, which receives a list of at most `batch_size` items and returns an iterable of results.
+        :param batch_size: The size of each batch.
+        :return: A new `Box` containing the flattened results.
+        """
+        return cast(Box[TMapped], self._new(itertools.chain.from_iterable(map(callback, Box(self).chunk(batch_size)))))
+
     def chunk(self, chunk_size: int) -> Box[list[T]]:
         """
         Split the items in chunks (each chunk being a list). Each chunk will have the given size, except for (possibly) the last chunk,
         which will have a size between 1 and the given chunk size. A new `Box` is returned containing the chunked items.
-
-        Note that if the underlying iterable is a generator, it will be exhausted!
+        The chunks are produced lazily, so only one chunk is kept in memory at a time.
 
         :param chunk_size: The chunk size.
         :return: A new `Box` instance containing the chunked items.
@@ -96,19 +251,82 @@ class Box[T](abc.Iterable[T]):
 
                 if len(chunk) == chunk_size:
                     yield chunk
+                    chunk = []
+
+            if chunk:
+                yield chunk
 
         return type(self)(generator())
 
+    def count_by(self, key: SortKey | None = None) -> MutableMappingBox[Any, int]:
+        """
+        Count the items per value of the given attribute or key, or of the result of the given callback. The counting itself is done
+        by `collections.Counter`, without a Python-level call per item.
+
+        :param key: The attribute or key to count by, a callable computing it, or a list of those. If omitted, the items themselves
+            are counted.
+        :return: A new `MutableMappingBox` mapping every value to its number of items, in order of first occurrence.
+        :raises ValueError: When an item has neither the attribute nor the key.
+        """
+        getter = self._compile_sort_key(key)
+        items = self._iterable()
+
+        return cast(MutableMappingBox[Any, int], box(dict(collections.Counter(items if getter is None else map(getter, items)))))
+
     def diff(self, other: abc.Iterable) -> Box[T]:
         """
         Create a new `Box` instance, whose items are the items in this `Box` that are not in the other iterable.
         If this `Box` has a generator as its underlying iterable, the new `Box` instance will have a generator as its underlying iterable as well;
         but be aware that exhausting either the original or the resulting generator will also exhaust the other.
 
+        The other iterable is indexed once by hash, so this takes linear rather than quadratic time for hashable items.
+
         :param other: The other iterable to check against. This may be a `Box` or any other iterable type.
         :return: A new `Box` containing the items that are not in the other iterable.
         """
-        return self._new(value for value in self if value not in other)
+        index = _HashIndex(other)
+
+        return self._new(value for value in self if value not in index)
+
+    def diff_by[TKey](self, other: abc.Iterable, key: abc.Hashable | abc.Callable[[Any], TKey]) -> Box[T]:
+        """
+        Create a new `Box` instance, whose items are the items in this `Box` whose key does not occur among the keys of the items
+        in the other iterable. The keys of the other iterable are indexed once by hash.
+
+        :param other: The other iterable to check against. This may be a `Box` or any other iterable type.
+        :param key: The attribute or key of the items to compare (resolved like `where`), or a callable computing it.
+        :return: A new `Box` containing the items whose key is not in the other iterable.
+        """
+        callback = key if callable(key) else self._compile_getter(key)
+        index = _HashIndex(map(callback, other))
+
+        return self._new(value for value in self if callback(value) not in index)
+
+    def distinct(self, max_size: int | None = None) -> Box[T]:
+        """
+        Create a new `Box` instance without duplicate items, keeping the first occurrence of each item. The items must be hashable.
+        If a maximum size is given, only the most recently seen `max_size` distinct items are remembered, which bounds the memory
+        usage on large streams; a duplicate is then only removed if its previous occurrence is among those.
+
+        :param max_size: The maximum number of distinct items to remember. By default, all distinct items are remembered.
+        :return: A new `Box` containing the distinct items.
+        """
+        def generator() -> abc.Generator[T]:
+            seen: collections.OrderedDict[T, None] = collections.OrderedDict()
+
+            for value in self:
+                if value in seen:
+                    seen.move_to_end(value)
+                    continue
+
+                seen[value] = None
+
+                if max_size is not None and len(seen) > max_size:
+                    seen.popitem(last=False)
+
+                yield value
+
+        return self._new(generator())
 
     def each(self, callback: abc.Callable[[T], Any]) -> Box[T]:
         """
@@ -158,28 +376,27 @@ class Box[T](abc.Iterable[T]):
     def first_or_fail(self) -> T:
         return self.first(or_fail=True)
 
-    def first_where(self, key: abc.Hashable, operation: str | None = None, value: Any = None, /, or_fail: bool = False) -> T | None:
+    def first_where(self, key: abc.Hashable | list[WhereCondition], operation: str | None = None, value: Any = None, /, or_fail: bool = False) -> T | None:
         """
         Get the first element that satisfies the condition. If no element could be found and `or_fail` is `True`, an `IndexError` is thrown;
         if `or_fail` is `False`, `None` will be returned.
 
-        :param key: The attribute or key of the item to evaluate.
+        :param key: The attribute or key of the item to evaluate, or a list of `(key, operation, value)` conditions that must all hold.
         :param operation: The operation to use when evaluating.
         :param value: The value to evaluate the item's attribute or key against.
         :param or_fail: Whether to throw an `IndexError` or not, if no item satisfying the condition could be found.
         :return: The first item that satisfies the condition.
         :raises IndexError: When no item could be found that satisfies the condition and `or_fail` is `True`.
         """
-        for item in self:
-            if self._where(item, key, operation, value):
-                return item
+        for item in filter(self._compile_where(key, operation, value), self):
+            return item
 
         if or_fail:
             raise IndexError
 
         return None
 
-    def first_where_or_fail(self, key: abc.Hashable, operation: str | None = None, value: Any = None) -> T:
+    def first_where_or_fail(self, key: abc.Hashable | list[WhereCondition], operation: str | None = None, value: Any = None) -> T:
         """
         Get the first element that satisfies the condition. If no such item is found, an `IndexError` is thrown.
 
@@ -191,27 +408,109 @@ class Box[T](abc.Iterable[T]):
         """
         return self.first_where(key, operation, value, or_fail=True)
 
-    def group_by[TKey: abc.Hashable](self, key: str | abc.Callable[[T], TKey]) -> MutableMappingBox[TKey, list[T]]:
-        result: dict[TKey, list[T]] = {}
-        callback: abc.Callable[[T], TKey]
+    def flat_map[TMapped](self, callback: abc.Callable[[T], abc.Iterable[TMapped]]) -> Box[TMapped]:
+        """
+        Apply the callback to each item, and flatten the resulting iterables into a single `Box`.
 
-        if isinstance(key, str):
-            def callback(val):
-                return self.__get_attribute_or_key(val, key, raise_on_error=True)
+        :param callback: The callback, which returns an iterable for each item.
+        :return: A new `Box` containing the flattened results.
+        """
+        return cast(Box[TMapped], self._new(itertools.chain.from_iterable(map(callback, self))))
 
-        else:
-            callback = key
+    def group_by[TKey: abc.Hashable](self, key: str | abc.Callable[[T], TKey] | list[str | abc.Callable[[T], Any]], *, nested: bool = False) -> GroupedBox[TKey, T]:
+        """
+        Group the items by the given attribute or key, or by the result of the given callback. The groups are built right away, so
+        later changes to the underlying iterable are not reflected in them. To compute statistics per group without building lists
+        of all items, use `aggregate_by` instead.
+
+        Items may be grouped by several levels at once, e.g. `group_by(["country", "city"])`, keyed by tuples such as
+        `("NL", "Utrecht")`, or with `nested=True`, as nested dicts such as `{"NL": {"Utrecht": [...]}}`.
+
+        :param key: The attribute or key to group by, a callback computing the group of an item, or a list of those.
+        :param nested: Whether to nest the groups of multiple levels, rather than keying them by tuples.
+        :return: A new `GroupedBox` mapping every group to the list of its items.
+        """
+        callback, levels = self._compile_group_key(key, nested)
+        groups: dict[TKey, list[T]] = {}
 
         for value in self:
             result_key = callback(value)
 
-            if result_key in result:
-                result[result_key].append(value)
+            if result_key in groups:
+                groups[result_key].append(value)
 
             else:
-                result[result_key] = [value]
+                groups[result_key] = [value]
 
-        return box(result)
+        return GroupedBox(_nest(groups.items(), levels) if levels else groups, levels)
+
+    def group_join[TKey, T2, TResult](self, other: abc.Iterable[T2], key: abc.Hashable | abc.Callable[[T], TKey], other_key: abc.Hashable | abc.Callable[[T2], TKey] | None = None, *, result: abc.Callable[[T, list[T2]], TResult] | None = None, presorted: bool = False) -> Box[TResult]:
+        """
+        Create a new `Box` instance pairing every item of this `Box` with the list of matching items in the other iterable,
+        which is empty if there are none. See `join` for the arguments.
+
+        :return: A new `Box` containing a `(item, matches)` pair (or the result of `result(item, matches)`) for every item.
+        """
+        def generator() -> abc.Generator:
+            for value, matches in self._join_matches(other, key, other_key, presorted):
+                yield (value, list(matches)) if result is None else result(value, list(matches))
+
+        return cast(Box[TResult], self._new(generator()))
+
+    def intersect(self, other: abc.Iterable) -> Box[T]:
+        """
+        Create a new `Box` instance, whose items are the items in this `Box` that are also in the other iterable.
+        The other iterable is indexed once by hash, so this takes linear rather than quadratic time for hashable items.
+
+        :param other: The other iterable to check against. This may be a `Box` or any other iterable type.
+        :return: A new `Box` containing the items that are in the other iterable.
+        """
+        index = _HashIndex(other)
+
+        return self._new(value for value in self if value in index)
+
+    def join[TKey, T2, TResult](self, other: abc.Iterable[T2], key: abc.Hashable | abc.Callable[[T], TKey], other_key: abc.Hashable | abc.Callable[[T2], TKey] | None = None, *, result: abc.Callable[[T, T2], TResult] | None = None, presorted: bool = False) -> Box[TResult]:
+        """
+        Create a new `Box` instance containing a pair for every combination of an item of this `Box` and an item of the other iterable
+        with equal keys (an inner join). Every key must be hashable, unless `presorted` is set.
+
+        A hash table is built on one side, while the other side is streamed. If both sides have a length, the table is built on the
+        smaller side, and the pairs follow the order of the larger side; otherwise, the table is built on the other iterable and the
+        pairs follow the order of this `Box`. If both sides are already sorted by their key, set `presorted` to merge them instead,
+        which streams both sides and only keeps the items of one key of the other iterable in memory.
+
+        Example: `box(orders).join(customers, "customer_id", "id", result=lambda order, customer: {**order, **customer})`.
+
+        :param other: The other iterable to join with. This may be a `Box` or any other iterable type.
+        :param key: The attribute or key of the items of this `Box` to join on (resolved like `where`), or a callable computing it.
+        :param other_key: The attribute or key (or a callable) for the items of the other iterable. Defaults to `key`.
+        :param result: A callback combining two matching items. By default, matching items are paired in a tuple.
+        :param presorted: Whether both sides are sorted by their key, to perform a sort-merge join.
+        :return: A new `Box` containing the joined items.
+        """
+        combine: abc.Callable[[Any, Any], Any] = result if result is not None else lambda value, other_value: (value, other_value)
+
+        if not presorted and isinstance(self._items, abc.Sized) and isinstance(other, abc.Sized) and len(self._items) < len(other):
+            getter, other_getter = self._compile_join_keys(key, other_key)
+
+            def build_left() -> abc.Generator:
+                table: dict[Any, list] = {}
+
+                for value in self:
+                    table.setdefault(getter(value), []).append(value)
+
+                for other_value in other:
+                    for value in table.get(other_getter(other_value), ()):
+                        yield combine(value, other_value)
+
+            return cast(Box[TResult], self._new(build_left()))
+
+        def generator() -> abc.Generator:
+            for value, matches in self._join_matches(other, key, other_key, presorted):
+                for other_value in matches:
+                    yield combine(value, other_value)
+
+        return cast(Box[TResult], self._new(generator()))
 
     def key_by[TKey: abc.Hashable](self, key: TKey | abc.Callable[[T], TKey]) -> MutableMappingBox[TKey, T]:
         if isinstance(key, str):
@@ -219,6 +518,35 @@ class Box[T](abc.Iterable[T]):
 
         return self.map_and_key_by(lambda value: (key(value), value))
 
+    def lazy(self) -> LazyBox[T]:
+        """
+        Create a lazy `Box` over the items of this `Box`. Chained calls to `map`, `filter`, `where` and `pluck` on the result do not
+        build intermediate containers; they are recorded in a plan that is executed in a single pass once a terminal method
+        (`all`, `collect`, `first`, `reduce`, `sum`, `group_by`, `key_by` or iteration) is called.
+
+        :return: A new `LazyBox` instance wrapping this `Box`.
+        """
+        return LazyBox(self)
+
+    def left_join[TKey, T2, TResult](self, other: abc.Iterable[T2], key: abc.Hashable | abc.Callable[[T], TKey], other_key: abc.Hashable | abc.Callable[[T2], TKey] | None = None, *, result: abc.Callable[[T, T2 | None], TResult] | None = None, presorted: bool = False) -> Box[TResult]:
+        """
+        Create a new `Box` instance like `join`, but also containing the items of this `Box` without a match, paired with `None`.
+        The hash table is always built on the other iterable, so the pairs follow the order of this `Box`. See `join` for the arguments.
+
+        :return: A new `Box` containing the joined items.
+        """
+        combine: abc.Callable[[Any, Any], Any] = result if result is not None else lambda value, other_value: (value, other_value)
+
+        def generator() -> abc.Generator:
+            for value, matches in self._join_matches(other, key, other_key, presorted):
+                if not matches:
+                    yield combine(value, None)
+
+                for other_value in matches:
+                    yield combine(value, other_value)
+
+        return cast(Box[TResult], self._new(generator()))
+
     def map[TMapped](self, callback: abc.Callable[[T], TMapped]) -> Box[TMapped]:
         return self._new(callback(value) for value in self)
 
@@ -234,6 +562,34 @@ class Box[T](abc.Iterable[T]):
 
         return box(result)
 
+    def max(self) -> T | None:
+        """
+        :return: The largest item, or `None` if the `Box` is empty.
+        """
+        return max(self._iterable(), default=None)  # type: ignore[type-var]
+
+    def max_by(self, key: SortKey | None = None) -> T | None:
+        """
+        Get the item with the largest key, or the first of them if several are equally large. If the `Box` is empty, `None` is returned.
+
+        :param key: The attribute or key to compare, a callable computing it, or a list of those. If omitted, the items themselves
+            are compared.
+        :return: The item with the largest key.
+        :raises ValueError: When an item has neither the attribute nor the key.
+        """
+        return max(self, key=self._compile_sort_key(key), default=None)  # type: ignore[arg-type, type-var]
+
+    def mean(self, compensated: bool = False) -> Any:
+        """
+        Compute the arithmetic mean of the items. Unlike `average`, an empty `Box` has no mean rather than raising an error.
+
+        :param compensated: Whether to add up the items without accumulating rounding errors. See `sum`.
+        :return: The mean of the items, or `None` if the `Box` is empty.
+        """
+        values = self._values()
+
+        return _add(values, compensated) / len(values) if values else None
+
     def merge[T2](self, other: abc.Iterable[T2]) -> Box[T | T2]:
         def generator() -> abc.Generator:
             yield from self
@@ -241,11 +597,53 @@ class Box[T](abc.Iterable[T]):
 
         return self._new(generator())
 
+    def min(self) -> T | None:
+        """
+        :return: The smallest item, or `None` if the `Box` is empty.
+        """
+        return min(self._iterable(), default=None)  # type: ignore[type-var]
+
+    def min_by(self, key: SortKey | None = None) -> T | None:
+        """
+        Get the item with the smallest key, or the first of them if several are equally small. If the `Box` is empty, `None` is returned.
+
+        :param key: The attribute or key to compare, a callable computing it, or a list of those. If omitted, the items themselves
+            are compared.
+        :return: The item with the smallest key.
+        :raises ValueError: When an item has neither the attribute nor the key.
+        """
+        return min(self, key=self._compile_sort_key(key), default=None)  # type: ignore[arg-type, type-var]
+
+    def parallel(self, executor: concurrent.futures.Executor | None = None, chunk_size: int = 1024) -> ParallelBox[T]:
+        """
+        Create a `Box` whose `map`, `filter`, `each`, `group_by` and `reduce` methods split the items into chunks and process the chunks
+        on an executor. When no executor is given, a `ThreadPoolExecutor` is created (and shut down) for every call.
+        To make use of multiple cores for CPU-bound callbacks, pass a `ProcessPoolExecutor`; the callbacks must then be picklable.
+
+        :param executor: The executor to submit the chunks to. The caller remains responsible for shutting it down.
+        :param chunk_size: The amount of items to process per task.
+        :return: A new `ParallelBox` instance wrapping this `Box`.
+        """
+        return ParallelBox(self, executor, chunk_size)
+
     def pipe_into[T2](self, callback: type[T2] | typing.Callable[[typing.Self], T2]) -> T2:
         return callback(self)
 
     def pluck[TDefault](self, key: abc.Hashable, *, default: TDefault = None, raise_on_error: bool = False) -> Box[T | TDefault]:
-        return self.map(lambda item: self.__get_attribute_or_key(item, key, raise_on_error=raise_on_error, default=default))
+        return self.map(self._compile_pluck(key, default, raise_on_error))
+
+    def product(self) -> Any:
+        """
+        Multiply the items, from left to right, using `math.prod`.
+
+        :return: The product of the items, or `None` if the `Box` is empty (consistent with `sum`).
+        """
+        iterator: abc.Iterator[Any] = iter(self._iterable())
+
+        if (first := next(iterator, _MISSING)) is _MISSING:
+            return None
+
+        return math.prod(iterator, start=first)
 
     def reduce[TInitial, T2](self, callback: abc.Callable[[T | TInitial, T], T2], initial_value: TInitial = None) -> T2:
         result: TInitial | T | T2 = initial_value
@@ -261,165 +659,1332 @@ class Box[T](abc.Iterable[T]):
 
         return result
 
-    def sum(self) -> Any:
-        return self.reduce(lambda x, y: x + y)
+    def semi_join[TKey](self, other: abc.Iterable, key: abc.Hashable | abc.Callable[[T], TKey], other_key: abc.Hashable | abc.Callable[[Any], TKey] | None = None, *, presorted: bool = False) -> Box[T]:
+        """
+        Create a new `Box` instance containing the items of this `Box` that have at least one matching item in the other iterable.
+        Unlike `join`, every item occurs at most once. See `join` for the arguments.
 
-    def _new[TValue](self, items: abc.Iterable[TValue]) -> typing.Self:
-        return type(self)(self.item_type(items))
+        :return: A new `Box` containing the items with a match.
+        """
+        return self._new(value for value, matches in self._join_matches(other, key, other_key, presorted) if matches)
 
-    @typing.overload
-    def _where[TKey: abc.Hashable, TValue](self, obj: abc.Mapping[TKey, TValue], key: TKey, operation: str | None = None, value: Any = None) -> bool:
-        ...
+    def skip(self, count: int) -> Box[T]:
+        """
+        Create a new `Box` instance without the first `count` items.
 
-    @typing.overload
-    def _where(self, obj: object, key: str, operation: str | None = None, value: Any = None) -> bool:
-        ...
+        :param count: The number of items to skip.
+        :return: A new `Box` containing the remaining items.
+        """
+        return self._new(itertools.islice(self, count, None))
 
-    @final
-    def _where(self, obj: object, key: str, operation: str | None = None, value: Any = None) -> bool:
-        if hasattr(obj, key):
-            obj = getattr(obj, key)
+    def sliding_window(self, size: int, step: int = 1) -> Box[tuple[T, ...]]:
+        """
+        Create a new `Box` instance containing tuples of `size` consecutive items. Each window starts `step` items after
+        the previous one. Incomplete windows at the end are not included. Only one window is kept in memory at a time.
 
-        elif isinstance(obj, abc.Mapping):
-            obj = obj[key]
+        :param size: The number of items per window.
+        :param step: The number of items between the starts of consecutive windows.
+        :return: A new `Box` containing the windows.
+        """
+        if size < 1 or step < 1:
+            raise ValueError("The window size and step must be at least 1")
 
-        else:
-            raise ValueError(f"Object {obj} has no attribute or item {key}")
+        def generator() -> abc.Generator[tuple[T, ...]]:
+            window: collections.deque[T] = collections.deque(maxlen=size)
+            to_skip = 0
 
-        if operation is None:
-            # If no operator was given, we will simply check if the attribute is truthy.
-            return bool(obj)
+            for value in self:
+                window.append(value)
 
-        if operation not in self._OPERATOR_MAPPING:
-            raise ValueError(f"Invalid operator: '{operation}'")
+                if len(window) < size:
+                    continue
 
-        return self._OPERATOR_MAPPING[operation](obj, value)
+                if to_skip:
+                    to_skip -= 1
+                    continue
 
-    def where(self, key: abc.Hashable, operation: str | None = None, value: Any = None) -> Box[T]:
-        return self.filter(lambda obj: self._where(obj, key, operation, value))
+                yield tuple(window)
+                to_skip = step - 1
 
-    def zip[T2](self, other: abc.Iterable[T2]) -> Box[tuple[T, T2]]:
-        return self._new(zip(self, other))
+        return cast(Box[tuple[T, ...]], self._new(generator()))
 
-    @staticmethod
-    @typing.overload
-    def __get_attribute_or_key[TKey: abc.Hashable, TValue, TDefault](obj: abc.Mapping[TKey, TValue], key: TKey, *, raise_on_error: bool = False, default: TDefault = None) -> TValue | TDefault:
-        ...
+    def sort_by(self, key: SortKey | None = None, descending: bool | list[bool] = False) -> Box[T]:
+        """
+        Create a new `Box` instance containing the items in sorted order. The sort is stable, and the key of every item is computed
+        only once. When sorting by a list of keys, items are ordered by the first key, then by the second key, and so on.
+
+        :param key: The attribute or key to sort by, a callable computing it, or a list of those. If omitted, the items themselves
+            are sorted.
+        :param descending: Whether to sort in descending order. When sorting by a list of keys, this may be a list with a direction per key.
+        :return: A new `Box` containing the sorted items.
+        :raises ValueError: When the number of directions does not match the number of keys, or an item lacks an attribute or key
+            to sort by.
+        """
+        if not isinstance(descending, list):
+            return self._new(sorted(self, key=self._compile_sort_key(key), reverse=descending))  # type: ignore[arg-type, type-var]
 
-    @staticmethod
-    @typing.overload
-    def __get_attribute_or_key(obj: object, key: str, *, raise_on_error: bool = False, default: Any = None) -> Any:
-        ...
+        keys = key if isinstance(key, list) else [key]
 
-    @staticmethod
-    def __get_attribute_or_key(obj: object, key: str, *, raise_on_error: bool = False, default: Any = None) -> Any:
-        if hasattr(obj, key):
-            return getattr(obj, key)
+        if len(keys) != len(descending):
+            raise ValueError(f"Expected {len(keys)} sort directions, got {len(descending)}")
 
-        elif isinstance(obj, abc.Mapping) and key in obj.keys():
-            return obj[key]
+        if len(set(descending)) <= 1:
+            return self._new(sorted(self, key=self._compile_sort_key(keys), reverse=bool(descending and descending[0])))  # type: ignore[arg-type, type-var]
 
-        if raise_on_error:
-            raise KeyError("Object of type {} does not have key or attribute {}".format(type(obj), key))
+        # With mixed directions, sort by each key in turn, from the least to the most significant; stability preserves earlier sorts.
+        result = list(self)
 
-        return default
+        for sort_key, sort_descending in reversed(list(zip(keys, descending))):
+            result.sort(key=self._compile_sort_key(sort_key), reverse=sort_descending)
 
+        return self._new(result)
 
-class SizedBox[T](abc.Sized, Box):
-    _items: SizedIterable[T]
+    def sum(self, compensated: bool = False) -> Any:
+        """
+        Add up the items, from left to right. Items of type `int` and `float` are added up by the builtin `sum`, and other items by
+        `operator.add`, so that no Python-level callback is called per item.
 
-    def all(self) -> SizedIterable[T]:
-        return self._items
+        :param compensated: Whether to add up (real) numbers with `math.fsum`, which tracks the rounding errors of the intermediate
+            sums and is therefore more precise than Kahan summation. The result is then always a `float`.
+        :return: The sum of the items, or `None` if the `Box` is empty, since the neutral element depends on the type of the items.
+        """
+        return _add(self._iterable(), compensated)
 
-    def __len__(self) -> int:
-        return len(self._items)
+    def take(self, count: int) -> Box[T]:
+        """
+        Create a new `Box` instance containing only the first `count` items. Further items are not consumed.
 
-    def average(self) -> Any:
-        if not self:
-            raise ZeroDivisionError
+        :param count: The number of items to take.
+        :return: A new `Box` containing the first items.
+        """
+        return self._new(itertools.islice(self, count))
 
-        assert isinstance(the_sum := self.sum(), numbers.Complex)
-        return the_sum / len(self)
+    def take_while(self, callback: abc.Callable[[T], bool]) -> Box[T]:
+        """
+        Create a new `Box` instance containing the items up to (but excluding) the first item that does not pass the test.
 
+        :param callback: The test callback.
+        :return: A new `Box` containing the leading items that pass the test.
+        """
+        return self._new(itertools.takewhile(callback, self))
 
-class SequenceBox[T](SizedBox, abc.Sequence[T]):
-    _items: abc.Sequence
+    def top_k(self, count: int, key: SortKey | None = None, descending: bool = True) -> Box[T]:
+        """
+        Create a new `Box` instance containing the `count` largest items, from largest to smallest, like `sort_by(key, True).take(count)`.
+        Only `count` items are kept in a heap while the items are passed through, so this takes O(n log count) time and O(count) memory,
+        also on generators.
+
+        :param count: The number of items to keep.
+        :param key: The attribute or key to compare, a callable computing it, or a list of those. If omitted, the items themselves
+            are compared.
+        :param descending: Whether to keep the largest items. If set to `False`, the smallest items are kept, from smallest to largest.
+        :return: A new `Box` containing the top items.
+        :raises ValueError: When an item has neither the attribute nor the key.
+        """
+        select = heapq.nlargest if descending else heapq.nsmallest
 
-    def __init__(self, items: T | abc.Sequence[T]):
-        super().__init__(items)
+        return self._new(select(count, self, key=self._compile_sort_key(key)))  # type: ignore[arg-type]
 
-        if isinstance(items, abc.Sequence):
-            self._items = items
+    def _new[TValue](self, items: abc.Iterable[TValue]) -> typing.Self:
+        item_type: type = type(self._items)
 
-        else:
-            self._items = [items]
+        try:
+            rebuild = _REBUILDABLE_TYPES[item_type]
 
-    def _new(self, items: abc.Iterable[T]) -> SequenceBox[T]:
-        return cast(SequenceBox, super()._new(items))
+        except KeyError:
+            # Iterators such as generators cannot be rebuilt from an iterable; keep the new `Box` lazy instead.
+            rebuild = _REBUILDABLE_TYPES[item_type] = not issubclass(item_type, abc.Iterator)
 
-    @typing.overload
-    def __getitem__(self, index: int) -> T:
-        ...
+        return type(self)(item_type(items) if rebuild else cast(abc.Iterable[T], items))
 
-    @typing.overload
-    def __getitem__(self, index: slice) -> slice:
-        ...
+    def _iterable(self) -> abc.Iterable[T]:
+        # Terminal operations iterate the items directly, rather than through the generator of `__iter__`.
+        return self._items
 
-    def __getitem__(self, index: T | slice) -> T | slice:
-        return self._items[index]
+    def _values(self) -> list[T] | tuple[T, ...]:
+        values = self._iterable()
 
-    def all(self) -> abc.Sequence[T]:
-        return self._items
+        return values if type(values) is list or type(values) is tuple else list(values)
 
-    def chunk(self, chunk_size: int) -> SequenceBox[abc.Iterable[T]]:
-        # Using slices is more efficient than using the for-loop implementation in `Box`.
-        return self._new(self[i: i + chunk_size] for i in range(0, len(self), chunk_size))
+    @classmethod
+    def _compile_aggregates(cls, aggregates: abc.Iterable[str], key: abc.Hashable | abc.Callable | None, named: abc.Mapping[str, AggregateSpec]) -> list[tuple[str, abc.Callable[[Any], Any] | None, abc.Callable[[], Accumulator]]]:
+        """
+        Resolve the arguments of `aggregate` into `(name, getter, accumulator factory)` triples. A getter of `None` means that
+        the items themselves are aggregated.
+        """
+        def getter_for(getter_key: abc.Hashable | abc.Callable | None) -> abc.Callable[[Any], Any] | None:
+            if getter_key is None or callable(getter_key):
+                return getter_key
 
-    def reverse(self) -> SequenceBox[T]:
-        return self._new(reversed(self))
+            return cls._compile_getter(getter_key)
 
+        default_getter = getter_for(key)
+        specs = [(name, default_getter, accumulator_factory(name)) for name in aggregates]
 
-class MappingBox[TKey: abc.Hashable, TValue](SizedBox, abc.Mapping[TKey, TValue]):
-    _items: abc.Mapping
+        for name, spec in named.items():
+            if isinstance(spec, tuple):
+                specs.append((name, getter_for(spec[0]), accumulator_factory(spec[1])))
 
-    def __getitem__(self, key: TKey) -> TValue:
-        return self._items[key]
+            else:
+                specs.append((name, default_getter, accumulator_factory(spec)))
 
-    def all(self) -> abc.Mapping[TKey, TValue]:
-        return self._items
+        return specs
 
-    def filter(self, callback: abc.Callable[[TKey, TValue], bool] | None = None) -> MappingBox[TKey, TValue]:
-        if callback is None:
-            # noinspection PyUnusedLocal
-            def callback(key: TKey, value: TValue) -> bool:
-                return bool(value)
+    @classmethod
+    def _compile_getter(cls, key: abc.Hashable) -> abc.Callable[[Any], Any]:
+        """
+        Compile a callable that looks up the given attribute or key on an item. The lookup strategy (`operator.attrgetter` for attributes,
+        `operator.itemgetter` for mappings) is resolved once per item type and reused for every subsequent item of that type.
+        Should the specialized strategy fail for a particular item, the generic lookup is used for that item instead.
 
-        return cast(MappingBox, self._new({key: value for key, value in self.items() if callback(key, value)}))
+        :param key: The attribute or key to look up.
+        :return: A callable that takes an item and returns its attribute or key value.
+        :raises ValueError: When calling the result on an item that has neither the attribute nor the key.
+        """
+        getters: dict[type, abc.Callable[[Any], Any]] = {}
 
-    def only(self, keys: abc.Iterable[abc.Hashable]) -> MappingBox:
-        # noinspection PyUnusedLocal
-        def callback(key: abc.Hashable, value: Any) -> bool:
-            return key in keys
+        def generic(obj: Any) -> Any:
+            if isinstance(key, str) and hasattr(obj, key):
+                return getattr(obj, key)
 
-        return self.filter(callback)
+            if isinstance(obj, abc.Mapping):
+                return obj[key]
 
+            raise ValueError(f"Object {obj} has no attribute or item {key}")
 
-class MutableMappingBox[TKey: abc.Hashable, TValue](MappingBox[TKey, TValue], abc.MutableMapping[TKey, TValue]):
-    _items: abc.MutableMapping
+        def getter(obj: Any) -> Any:
+            try:
+                specialized = getters[type(obj)]
 
-    def __setitem__(self, key: TKey, value: TValue) -> None:
+            except KeyError:
+                if isinstance(key, str) and hasattr(obj, key):
+                    specialized = operator.attrgetter(key)
+
+                elif isinstance(obj, abc.Mapping):
+                    specialized = operator.itemgetter(key)
+
+                else:
+                    specialized = generic
+
+                getters[type(obj)] = specialized
+
+            try:
+                return specialized(obj)
+
+            except (AttributeError, KeyError):
+                return generic(obj)
+
+        if isinstance(key, str) and hasattr(dict, key):
+            return getter
+
+        def dict_getter(obj: Any) -> Any:
+            # Plain dicts cannot have attributes of their own, so their key is looked up directly, without resolving a strategy.
+            return obj[key] if type(obj) is dict else getter(obj)
+
+        return dict_getter
+
+    @classmethod
+    def _compile_group_key(cls, key: str | abc.Callable | list[str | abc.Callable], nested: bool) -> tuple[abc.Callable[[Any], Any], int]:
+        """
+        Resolve the key of `group_by` and `aggregate_by` into a callback computing the group of an item, and the number of levels
+        to nest the groups in (0 to not nest them).
+        """
+        keys = key if isinstance(key, list) else [key]
+        getters = [cls._compile_pluck(level, raise_on_error=True) if isinstance(level, str) else level for level in keys]
+
+        if not isinstance(key, list):
+            return getters[0], 0
+
+        def callback(value: Any) -> tuple:
+            return tuple(getter(value) for getter in getters)
+
+        return callback, len(keys) if nested else 0
+
+    @classmethod
+    def _compile_pluck(cls, key: abc.Hashable, default: Any = None, raise_on_error: bool = False) -> abc.Callable[[Any], Any]:
+        """
+        Compile the lookup of `pluck`. Plain dicts cannot have attributes of their own, so unless the key names an attribute of `dict`
+        itself, their key is looked up directly; other items are looked up like in `__get_attribute_or_key`.
+        """
+        get_attribute_or_key = cls.__get_attribute_or_key
+
+        def generic(obj: Any) -> Any:
+            return get_attribute_or_key(obj, key, raise_on_error=raise_on_error, default=default)
+
+        if not isinstance(key, str) or hasattr(dict, key):
+            return generic
+
+        if raise_on_error:
+            def getter(obj: Any) -> Any:
+                if type(obj) is dict and key in obj:
+                    return obj[key]
+
+                return generic(obj)
+
+            return getter
+
+        def getter_or_default(obj: Any) -> Any:
+            return obj.get(key, default) if type(obj) is dict else generic(obj)
+
+        return getter_or_default
+
+    @classmethod
+    def _compile_sort_key(cls, key: SortKey | None) -> abc.Callable[[Any], Any] | None:
+        if key is None or callable(key):
+            return key
+
+        if isinstance(key, list):
+            getters = [cls._compile_sort_key(sort_key) or (lambda obj: obj) for sort_key in key]
+
+            return lambda obj: tuple(getter(obj) for getter in getters)
+
+        return cls._compile_getter(key)
+
+    @classmethod
+    def _compile_where(cls, key: abc.Hashable | list[WhereCondition], operation: str | None = None, value: Any = None) -> abc.Callable[[Any], bool]:
+        """
+        Compile the condition(s) of a `where` clause into a single predicate. The operator and key lookup are resolved once,
+        rather than for every item that is evaluated.
+
+        :param key: The attribute or key of the item to evaluate, or a list of `(key, operation, value)` conditions that must all hold.
+        :param operation: The operation to use when evaluating.
+        :param value: The value to evaluate the item's attribute or key against.
+        :return: The predicate.
+        :raises ValueError: When an invalid operator is given.
+        """
+        if isinstance(key, list):
+            predicates = tuple(cls._compile_where(*condition) for condition in key)
+
+            if len(predicates) == 1:
+                return predicates[0]
+
+            def conjunction(obj: Any) -> bool:
+                for predicate in predicates:
+                    if not predicate(obj):
+                        return False
+
+                return True
+
+            return conjunction
+
+        getter = cls._compile_getter(key)
+
+        if operation is None:
+            # If no operator was given, we will simply check if the attribute is truthy.
+            return lambda obj: bool(getter(obj))
+
+        if operation not in cls._OPERATOR_MAPPING:
+            raise ValueError(f"Invalid operator: '{operation}'")
+
+        compare = cls._OPERATOR_MAPPING[operation]
+
+        return lambda obj: compare(getter(obj), value)
+
+    @classmethod
+    def _compile_join_keys(cls, key: abc.Hashable | abc.Callable, other_key: abc.Hashable | abc.Callable | None) -> tuple[abc.Callable[[Any], Any], abc.Callable[[Any], Any]]:
+        getter = key if callable(key) else cls._compile_getter(key)
+
+        if other_key is None:
+            return getter, getter
+
+        return getter, other_key if callable(other_key) else cls._compile_getter(other_key)
+
+    def _join_matches(self, other: abc.Iterable, key: abc.Hashable | abc.Callable, other_key: abc.Hashable | abc.Callable | None, presorted: bool) -> abc.Generator[tuple[T, abc.Sequence]]:
+        """
+        Pair every item of this `Box` with the items of the other iterable that have an equal key. All joins are built on this.
+        Items with equal keys share the same (read-only) list of matches.
+        """
+        getter, other_getter = self._compile_join_keys(key, other_key)
+
+        if not presorted:
+            table: dict[Any, list] = {}
+
+            for other_value in other:
+                table.setdefault(other_getter(other_value), []).append(other_value)
+
+            for value in self:
+                yield value, table.get(getter(value), ())
+
+            return
+
+        # Sort-merge: advance through the other iterable in step with this `Box`, keeping only the matches of the current key.
+        others = iter(other)
+        current = next(others, _MISSING)
+        current_key = other_getter(current) if current is not _MISSING else None
+        group_key: Any = _MISSING
+        group: list = []
+
+        for value in self:
+            value_key = getter(value)
+
+            if group_key is _MISSING or value_key != group_key:
+                while current is not _MISSING and current_key < value_key:
+                    current = next(others, _MISSING)
+                    current_key = other_getter(current) if current is not _MISSING else None
+
+                group_key, group = value_key, []
+
+                while current is not _MISSING and current_key == value_key:
+                    group.append(current)
+                    current = next(others, _MISSING)
+                    current_key = other_getter(current) if current is not _MISSING else None
+
+            yield value, group
+
+    def union[T2](self, other: abc.Iterable[T2]) -> Box[T | T2]:
+        """
+        Create a new `Box` instance containing the items in this `Box`, followed by the items of the other iterable that do not occur in
+        this `Box` or earlier in the other iterable. All items are indexed by hash while they are being passed through.
+
+        :param other: The other iterable to add. This may be a `Box` or any other iterable type.
+        :return: A new `Box` containing the union of both.
+        """
+        def generator() -> abc.Generator[T | T2]:
+            index = _HashIndex()
+
+            for value in self:
+                index.add(value)
+                yield value
+
+            for other_value in other:
+                if other_value not in index:
+                    index.add(other_value)
+                    yield other_value
+
+        return cast(Box[T | T2], self._new(generator()))
+
+    def unique_by(self, key: SortKey) -> Box[T]:
+        """
+        Create a new `Box` instance containing, for every distinct key, the first item with that key, in their original order.
+
+        :param key: The attribute or key that makes items distinct, a callable computing it, or a list of those.
+        :return: A new `Box` containing the unique items.
+        :raises ValueError: When an item has neither the attribute nor the key.
+        """
+        getter = cast(abc.Callable[[Any], Any], self._compile_sort_key(key))
+
+        def generator() -> abc.Generator[T]:
+            seen = _HashIndex()
+
+            for value in self:
+                if (value_key := getter(value)) not in seen:
+                    seen.add(value_key)
+                    yield value
+
+        return self._new(generator())
+
+    def variance(self, population: bool = False) -> float | None:
+        """
+        Compute the variance of the (real) items, in two passes: the mean is computed with `math.fsum`, and the squared deviations from
+        it are added up with `math.sumprod`.
+
+        :param population: Whether to compute the population variance, rather than the sample variance.
+        :return: The variance, or `None` if there are too few items (none for the population variance, fewer than two otherwise).
+        """
+        values: abc.Sequence[Any] = self._values()
+
+        if len(values) < (1 if population else 2):
+            return None
+
+        mean = math.fsum(values) / len(values)
+        deviations = list(map(operator.sub, values, itertools.repeat(mean)))
+
+        return math.sumprod(deviations, deviations) / (len(values) if population else len(values) - 1)
+
+    def where(self, key: abc.Hashable | list[WhereCondition], operation: str | None = None, value: Any = None) -> Box[T]:
+        """
+        Create a new `Box` instance containing the items that satisfy the condition.
+
+        :param key: The attribute or key of the item to evaluate. Alternatively, a list of `(key, operation, value)` conditions may be
+            given; the items must satisfy all of them. Since lists cannot be used as keys, this is never ambiguous.
+        :param operation: The operation to use when evaluating. If omitted, the attribute or key is checked for being truthy.
+        :param value: The value to evaluate the item's attribute or key against. For `between`, this is an inclusive `(low, high)` pair.
+        :return: A new `Box` containing the items that satisfy the condition.
+        :raises ValueError: When an invalid operator is given.
+        """
+        return self.filter(self._compile_where(key, operation, value))
+
+    def zip[T2](self, other: abc.Iterable[T2]) -> Box[tuple[T, T2]]:
+        return self._new(zip(self, other))
+
+    @staticmethod
+    @typing.overload
+    def __get_attribute_or_key[TKey: abc.Hashable, TValue, TDefault](obj: abc.Mapping[TKey, TValue], key: TKey, *, raise_on_error: bool = False, default: TDefault = None) -> TValue | TDefault:
+        ...
+
+    @staticmethod
+    @typing.overload
+    def __get_attribute_or_key(obj: object, key: str, *, raise_on_error: bool = False, default: Any = None) -> Any:
+        ...
+
+    @staticmethod
+    def __get_attribute_or_key(obj: object, key: str, *, raise_on_error: bool = False, default: Any = None) -> Any:
+        if hasattr(obj, key):
+            return getattr(obj, key)
+
+        elif isinstance(obj, abc.Mapping) and key in obj.keys():
+            return obj[key]
+
+        if raise_on_error:
+            raise KeyError("Object of type {} does not have key or attribute {}".format(type(obj), key))
+
+        return default
+
+
+class LazyBox[T](Box[T]):
+    """
+    A `Box` that records `map` and `filter` steps (and therefore `where` and `pluck`) instead of executing them.
+    The recorded steps are pipelined through `map` and `filter` iterators, so every item flows through the entire plan
+    in one pass and no intermediate containers are allocated. Use `collect` to obtain an eager `Box` of the original type.
+    """
+
+    __slots__ = ("_origin", "_steps")
+
+    _origin: Box
+    _steps: tuple[tuple[bool, abc.Callable[[Any], Any]], ...]
+
+    def __init__(self, items: abc.Iterable[Any], steps: tuple[tuple[bool, abc.Callable[[Any], Any]], ...] = (), origin: Box | None = None):
+        """
+        Instantiate a new `LazyBox`. Does not evaluate or exhaust the given iterable.
+
+        :param items: The source iterable. If this is a `Box`, results are collected into a `Box` of the same type.
+        :param steps: The recorded plan, as `(is_filter, callback)` pairs.
+        :param origin: The `Box` that determines the type of the collected result. Defaults to `items` if it is a `Box`.
+        """
+        super().__init__(items)
+        self._steps = steps
+
+        if origin is None:
+            origin = items if isinstance(items, Box) else Box(items)
+
+        self._origin = origin
+
+    def __bool__(self) -> bool:
+        iterator = iter(self)
+        source = self._items
+
+        # The source may be wrapped in boxes, e.g. `Box(generator).lazy()`, of which the innermost items are consumed.
+        while isinstance(source, Box):
+            source = source._items
+
+        for item in iterator:
+            if isinstance(source, abc.Iterator):
+                # The source can only be consumed once, so the item is pushed back in front of the remaining (processed) items.
+                self._items, self._steps = itertools.chain((item,), iterator), ()
+
+            return True
+
+        return False
+
+    def __contains__(self, obj: T) -> bool:
+        return obj in iter(self)
+
+    def __iter__(self) -> abc.Iterator[T]:
+        iterator: abc.Iterator = iter(self._items)
+
+        for is_filter, callback in self._steps:
+            iterator = filter(callback, iterator) if is_filter else map(callback, iterator)
+
+        return iterator
+
+    def _iterable(self) -> abc.Iterable[T]:
+        return self
+
+    def __reduce__(self) -> tuple:
+        return type(self), (self._items, self._steps, self._origin)
+
+    def all(self) -> abc.Iterable[T]:
+        """
+        Execute the plan and get the resulting iterable, of the same type as the one wrapped by the original `Box`.
+
+        :return: The underlying iterable of the collected `Box`.
+        """
+        return self.collect().all()
+
+    def chunk(self, chunk_size: int) -> LazyBox[list[T]]:
+        # `Box.chunk` creates a new `LazyBox` without the original `Box`, which `collect` needs.
+        return LazyBox(Box(self).chunk(chunk_size), (), self._origin)
+
+    def collect(self) -> Box[T]:
+        """
+        Execute the plan and collect the results into an eager `Box` of the same type as the original `Box`. If the original `Box`
+        wraps an iterator (e.g. a generator), which cannot be rebuilt, the results are collected into a list.
+
+        :return: A new, eager `Box` instance.
+        """
+        origin = self._origin
+
+        return origin._new(list(self) if isinstance(origin._items, abc.Iterator) else iter(self))
+
+    def filter(self, callback: abc.Callable[[T], bool] | None = None) -> LazyBox[T]:
+        # `filter` performs the truthy check for `bool` itself, without any Python-level call.
+        return LazyBox(self._items, self._steps + ((True, callback if callback is not None else bool),), self._origin)
+
+    def lazy(self) -> LazyBox[T]:
+        return self
+
+    def map[TMapped](self, callback: abc.Callable[[T], TMapped]) -> LazyBox[TMapped]:
+        return LazyBox(self._items, self._steps + ((False, callback),), self._origin)
+
+    def _new[TValue](self, items: abc.Iterable[TValue]) -> typing.Self:
+        # Steps that are not recorded (e.g. `diff`, `merge`, `zip`) are chained as generators so that the `Box` stays lazy.
+        return type(self)(items, (), self._origin)
+
+
+def _add(values: abc.Iterable, compensated: bool) -> Any:
+    iterator = iter(values)
+
+    if (first := next(iterator, _MISSING)) is _MISSING:
+        return None
+
+    if compensated:
+        return math.fsum(itertools.chain((first,), iterator))
+
+    if type(first) is int or type(first) is float:
+        # The builtin `sum` adds up `int` and `float` items in C, and falls back to regular addition for other types of items.
+        return sum(iterator, first)
+
+    return functools.reduce(operator.add, iterator, first)
+
+
+def _map_chunk(callback: abc.Callable, chunk: abc.Iterable) -> list:
+    return [callback(value) for value in chunk]
+
+
+def _filter_chunk(callback: abc.Callable | None, chunk: abc.Iterable) -> list:
+    return list(filter(callback, chunk))
+
+
+def _flat_map_chunk(callback: abc.Callable, chunk: abc.Iterable) -> list:
+    return [mapped for value in chunk for mapped in callback(value)]
+
+
+def _each_chunk(callback: abc.Callable, chunk: abc.Iterable) -> None:
+    for value in chunk:
+        callback(value)
+
+
+def _group_by_chunk(key: str | abc.Callable | list, chunk: abc.Iterable) -> dict:
+    return cast(dict, Box(chunk).group_by(key).all())
+
+
+def _reduce_chunk(callback: abc.Callable, chunk: abc.Iterable) -> Any:
+    return Box(chunk).reduce(callback)
+
+
+class ParallelBox[T](Box[T]):
+    """
+    A `Box` that processes `map`, `flat_map`, `filter`, `each`, `group_by` and `reduce` in chunks on a `concurrent.futures` executor.
+    Results are combined in chunk order, so the order of the original `Box` is preserved. The results are eager `Box` instances
+    of the same type as the original `Box`.
+    """
+
+    __slots__ = ("_executor", "_chunk_size")
+
+    _items: Box[T]
+    _executor: concurrent.futures.Executor | None
+    _chunk_size: int
+
+    def __init__(self, items: Box[T], executor: concurrent.futures.Executor | None = None, chunk_size: int = 1024):
+        """
+        Instantiate a new `ParallelBox`.
+
+        :param items: The `Box` to process.
+        :param executor: The executor to submit the chunks to. If omitted, a `ThreadPoolExecutor` is used for every call.
+        :param chunk_size: The amount of items to process per task.
+        """
+        if chunk_size < 1:
+            raise ValueError("The chunk size must be at least 1")
+
+        super().__init__(items)
+        self._executor = executor
+        self._chunk_size = chunk_size
+
+    def __reduce__(self) -> tuple:
+        # Executors cannot be pickled; the unpickled `ParallelBox` uses a `ThreadPoolExecutor` instead.
+        return type(self), (self._items, None, self._chunk_size)
+
+    def each(self, callback: abc.Callable[[T], Any]) -> ParallelBox[T]:
+        for _ in self._run(_each_chunk, callback):
+            pass
+
+        return self
+
+    def filter(self, callback: abc.Callable[[T], bool] | None = None) -> Box[T]:
+        return self._items._new(itertools.chain.from_iterable(self._run(_filter_chunk, callback)))
+
+    def flat_map[TMapped](self, callback: abc.Callable[[T], abc.Iterable[TMapped]]) -> Box[TMapped]:
+        return cast(Box[TMapped], self._items._new(itertools.chain.from_iterable(self._run(_flat_map_chunk, callback))))
+
+    def group_by[TKey: abc.Hashable](self, key: str | abc.Callable[[T], TKey] | list[str | abc.Callable[[T], Any]], *, nested: bool = False) -> GroupedBox[TKey, T]:
+        """
+        Group the items chunk by chunk, and merge the groups.
+        """
+        result: dict[TKey, list[T]] = {}
+
+        # Partial groups are merged in chunk order, so each group keeps the original order of its items.
+        for partial in self._run(_group_by_chunk, key):
+            for result_key, values in partial.items():
+                if result_key in result:
+                    result[result_key].extend(values)
+
+                else:
+                    result[result_key] = values
+
+        levels = len(key) if nested and isinstance(key, list) else 0
+
+        return GroupedBox(_nest(result.items(), levels) if levels else result, levels)
+
+    def map[TMapped](self, callback: abc.Callable[[T], TMapped]) -> Box[TMapped]:
+        return cast(Box[TMapped], self._items._new(itertools.chain.from_iterable(self._run(_map_chunk, callback))))
+
+    def reduce[TInitial, T2](self, callback: abc.Callable[[T | TInitial, T], T2], initial_value: TInitial = None) -> T2:  # type: ignore[assignment]
+        """
+        Reduce every chunk separately, and then reduce the partial results in chunk order, starting from the initial value.
+        The result is therefore only equal to that of `Box.reduce` if the callback is associative.
+        """
+        return Box(self._run(_reduce_chunk, callback)).reduce(callback, initial_value)
+
+    def _run(self, function: abc.Callable[[Any, list], Any], argument: Any) -> abc.Iterator:
+        chunks = self._items.chunk(self._chunk_size)
+
+        if self._executor is not None:
+            return self._executor.map(function, itertools.repeat(argument), chunks)
+
+        with concurrent.futures.ThreadPoolExecutor() as executor:
+            # Exhaust the results before the executor is shut down.
+            return iter(list(executor.map(function, itertools.repeat(argument), chunks)))
+
+    def _new[TValue](self, items: abc.Iterable[TValue]) -> typing.Self:
+        # Methods that are not parallelized (e.g. `diff`, `take`, `chunk`) are applied to the original `Box`, and chained methods
+        # are parallelized again.
+        return type(self)(self._items._new(items), self._executor, self._chunk_size)
+
+
+class SizedBox[T](abc.Sized, Box):
+    __slots__ = ()
+
+    _items: SizedIterable[T]
+
+    def all(self) -> SizedIterable[T]:
+        return self._items
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def average(self) -> Any:
+        if not self:
+            raise ZeroDivisionError
+
+        the_sum = self.sum()
+        # The exact type check avoids the comparatively slow `numbers.Complex` check for the common cases.
+        assert type(the_sum) is int or type(the_sum) is float or isinstance(the_sum, numbers.Complex)
+        return the_sum / len(self)
+
+
+class _HashedIndex:
+    """Secondary index mapping each value of a key to the positions of the items having that value."""
+
+    def __init__(self, values: abc.Iterable[Any]):
+        self._positions: dict[Any, list[int]] = {}
+
+        for position, value in enumerate(values):
+            if value in self._positions:
+                self._positions[value].append(position)
+
+            else:
+                self._positions[value] = [position]
+
+    def positions(self, operation: str | None, value: Any) -> list[int] | None:
+        try:
+            if operation in ("=", "=="):
+                return self._positions.get(value, [])
+
+            # For strings, `in` tests for substrings, which cannot be looked up.
+            if operation == "in" and not isinstance(value, (str, bytes)):
+                # Equal members of the value (or members listed twice) select the same items, which must only be included once.
+                return sorted({position for member in value for position in self._positions.get(member, ())})
+
+        except TypeError:
+            # Unhashable values cannot be looked up, but can still be compared to the items by scanning them.
+            pass
+
+        return None
+
+
+class _SortedIndex:
+    """Secondary index keeping the values of a key in sorted order, to answer equality and range conditions by bisection."""
+
+    def __init__(self, values: abc.Iterable[Any]):
+        pairs = sorted((value, position) for position, value in enumerate(values))
+        self._values = [value for value, _ in pairs]
+        self._positions = [position for _, position in pairs]
+
+    def positions(self, operation: str | None, value: Any) -> list[int] | None:
+        values = self._values
+
+        match operation:
+            case "=" | "==":
+                start, stop = bisect.bisect_left(values, value), bisect.bisect_right(values, value)
+            case "<":
+                start, stop = 0, bisect.bisect_left(values, value)
+            case "<=":
+                start, stop = 0, bisect.bisect_right(values, value)
+            case ">":
+                start, stop = bisect.bisect_right(values, value), len(values)
+            case ">=":
+                start, stop = bisect.bisect_left(values, value), len(values)
+            case "between":
+                start, stop = bisect.bisect_left(values, value[0]), bisect.bisect_right(values, value[1])
+            case _:
+                return None
+
+        # Restore the original order of the items.
+        return sorted(self._positions[start:stop])
+
+
+class SequenceBox[T](SizedBox, abc.Sequence[T]):
+    __slots__ = ("_indexes",)
+
+    _items: abc.Sequence
+    _indexes: dict[abc.Hashable, list[_HashedIndex | _SortedIndex]]
+
+    def __init__(self, items: T | abc.Sequence[T]):
+        # Lists and tuples are checked first, since checking against `abc.Sequence` is comparatively slow.
+        if type(items) is list or type(items) is tuple or isinstance(items, abc.Sequence):
+            self._items = items
+
+        else:
+            self._items = [items]
+
+    def _new(self, items: abc.Iterable[T]) -> SequenceBox[T]:
+        return cast(SequenceBox, super()._new(items))
+
+    @typing.overload
+    def __getitem__(self, index: int) -> T:
+        ...
+
+    @typing.overload
+    def __getitem__(self, index: slice) -> slice:
+        ...
+
+    def __getitem__(self, index: T | slice) -> T | slice:
+        return self._items[index]
+
+    def all(self) -> abc.Sequence[T]:
+        return self._items
+
+    def chunk(self, chunk_size: int) -> SequenceBox[abc.Iterable[T]]:
+        # Using slices is more efficient than using the for-loop implementation in `Box`.
+        return self._new(self[i: i + chunk_size] for i in range(0, len(self), chunk_size))
+
+    def drop_indexes(self) -> typing.Self:
+        """
+        Remove all secondary indexes created by `index_by` and `sorted_index`.
+
+        :return: The original `SequenceBox`.
+        """
+        self._indexes = {}
+
+        return self
+
+    def first_where(self, key: abc.Hashable | list[WhereCondition], operation: str | None = None, value: Any = None, /, or_fail: bool = False) -> T | None:
+        if (positions := self._indexed_positions(key, operation, value)) is not None:
+            if positions:
+                return cast(T, self._items[positions[0]])
+
+            if or_fail:
+                raise IndexError
+
+            return None
+
+        return super().first_where(key, operation, value, or_fail=or_fail)
+
+    def index_by(self, key: abc.Hashable) -> typing.Self:
+        """
+        Create a hash index on the given attribute or key. Subsequent `where` and `first_where` calls with an equality (`=`, `==`)
+        or `in` condition on that key look up the matching items in the index, rather than scanning all items.
+        The index is dropped when the items are modified through a `MutableSequenceBox`, which must be created explicitly, since
+        `box()` wraps lists in a read-only `SequenceBox`. Modifications made directly to the underlying sequence are not tracked,
+        in which case `drop_indexes` must be called.
+
+        :param key: The attribute or key to index.
+        :return: The original `SequenceBox`, to allow chaining.
+        :raises TypeError: When a value of the key is not hashable.
+        """
+        return self._add_index(key, _HashedIndex(map(self._compile_getter(key), self._items)))
+
+    def reverse(self) -> SequenceBox[T]:
+        return self._new(reversed(self))
+
+    def sorted_index(self, key: abc.Hashable) -> typing.Self:
+        """
+        Create a sorted index on the given attribute or key. Subsequent `where` and `first_where` calls with an equality or range
+        (`<`, `<=`, `>`, `>=`, `between`) condition on that key bisect the index, rather than scanning all items.
+        The same invalidation rules as for `index_by` apply.
+
+        :param key: The attribute or key to index.
+        :return: The original `SequenceBox`, to allow chaining.
+        :raises TypeError: When the values of the key cannot be ordered.
+        """
+        return self._add_index(key, _SortedIndex(map(self._compile_getter(key), self._items)))
+
+    def to_shared_memory(self) -> SharedMemoryHandle:
+        """
+        Copy the items into a new shared memory block, so that worker processes can read them without each receiving a pickled
+        copy. Pass the returned handle to the workers, which attach to the items with `box.from_shared_memory(handle)`.
+        Only fixed-width items are supported: numeric NumPy arrays, `array.array` instances, bytes, and sequences of only
+        `bool`, only `int` (stored as 64-bit integers) or `int` and `float` (stored as doubles).
+
+        The block must be freed by calling `unlink` on the handle once the workers are done, e.g. by using it in a `with` block.
+
+        :return: A new `SharedMemoryHandle` instance.
+        :raises TypeError: When the items are not fixed-width numbers.
+        :raises OverflowError: When an `int` does not fit in 64 bits.
+        """
+        from .shared import to_shared_memory
+
+        return to_shared_memory(self)
+
+    def where(self, key: abc.Hashable | list[WhereCondition], operation: str | None = None, value: Any = None) -> Box[T]:
+        if (positions := self._indexed_positions(key, operation, value)) is not None:
+            return self._new(self._items[position] for position in positions)
+
+        return super().where(key, operation, value)
+
+    def _add_index(self, key: abc.Hashable, index: _HashedIndex | _SortedIndex) -> typing.Self:
+        indexes = getattr(self, "_indexes", None)
+
+        if indexes is None:
+            indexes = self._indexes = {}
+
+        indexes.setdefault(key, []).append(index)
+
+        return self
+
+    def _indexed_positions(self, key: abc.Hashable | list[WhereCondition], operation: str | None, value: Any) -> list[int] | None:
+        """
+        Find the positions of the items satisfying the condition(s) using a secondary index, if possible. For multiple conditions,
+        the first condition that can be answered by an index selects the candidates, which are then checked against the others.
+
+        :return: The positions in ascending order, or `None` if no index applies.
+        """
+        if not getattr(self, "_indexes", None):
+            return None
+
+        conditions = [(tuple(condition) + (None, None))[:3] for condition in key] if isinstance(key, list) else [(key, operation, value)]
+
+        for condition in conditions:
+            for index in self._indexes.get(condition[0], ()):
+                if (positions := index.positions(condition[1], condition[2])) is None:
+                    continue
+
+                if len(conditions) == 1:
+                    return positions
+
+                predicate = self._compile_where([other for other in conditions if other is not condition])
+
+                return [position for position in positions if predicate(self._items[position])]
+
+        return None
+
+
+# `reverse` returns a new `Box`, like all other `Box` methods, rather than reversing the items in place.
+class MutableSequenceBox[T](SequenceBox[T], abc.MutableSequence[T]):  # type: ignore[misc]
+    __slots__ = ()
+
+    _items: abc.MutableSequence
+
+    def __setitem__(self, index: int | slice, value: Any) -> None:
+        self.drop_indexes()
+        self._items[index] = value
+
+    def __delitem__(self, index: int | slice) -> None:
+        self.drop_indexes()
+        del self._items[index]
+
+    def all(self) -> abc.MutableSequence[T]:
+        return self._items
+
+    def insert(self, index: int, value: T) -> None:
+        self.drop_indexes()
+        self._items.insert(index, value)
+
+
+class SequenceViewBox[T](SequenceBox[T]):
+    """
+    A `SequenceBox` over a sequence that it does not own and that cannot necessarily be constructed from an iterable, such as
+    a `memoryview`. New `Box` instances created from it (e.g. by `map` or `filter`) are backed by a list instead.
+    """
+
+    __slots__ = ()
+
+    def _new(self, items: abc.Iterable[T]) -> SequenceBox[T]:  # type: ignore[override]
+        return SequenceBox(list(items))
+
+
+class MappingBox[TKey: abc.Hashable, TValue](SizedBox, abc.Mapping[TKey, TValue]):
+    __slots__ = ()
+
+    _items: abc.Mapping
+
+    def __getitem__(self, key: TKey) -> TValue:
+        return self._items[key]
+
+    def all(self) -> abc.Mapping[TKey, TValue]:
+        return self._items
+
+    def cached(self, cache: BoxCache | None = None) -> CachedBox:
+        """
+        Create a proxy that memoizes the results of pipelines over this `MappingBox`, e.g. `mbox.cached().where(...).group_by(...)`.
+        Results are keyed by this `MappingBox`, the chain of method calls and their arguments; running an identical pipeline again
+        only takes a lookup per step. Immutable boxes backed by a `frozendict` or `PersistentMap` are keyed by their contents, so equal
+        boxes share results, unless their keys or values differ in type (such as `1` and `True`).
+        `MutableMappingBox` instances are keyed by identity, and their results are invalidated when they are changed through the box.
+        See `CachedBox` for details.
+
+        :param cache: The `BoxCache` to store the results in, with its own size limit and time to live. By default, a shared cache is used.
+        :return: A new `CachedBox` instance.
+        :raises TypeError: When this `MappingBox` is not mutable and not backed by a `frozendict` or `PersistentMap`, so that changes
+            cannot be detected.
+        """
+        from .cache import CachedBox
+
+        return CachedBox(self, cache)
+
+    def filter(self, callback: abc.Callable[[TKey, TValue], bool] | None = None) -> MappingBox[TKey, TValue]:
+        if callback is None:
+            # noinspection PyUnusedLocal
+            def callback(key: TKey, value: TValue) -> bool:
+                return bool(value)
+
+        return cast(MappingBox, self._new({key: value for key, value in self.items() if callback(key, value)}))
+
+    def only(self, keys: abc.Iterable[abc.Hashable]) -> MappingBox:
+        index = _HashIndex(keys)
+
+        # noinspection PyUnusedLocal
+        def callback(key: abc.Hashable, value: Any) -> bool:
+            return key in index
+
+        return self.filter(callback)
+
+    def persistent(self) -> PersistentMappingBox[TKey, TValue]:
+        """
+        Copy the items into a `PersistentMappingBox`, from which slightly different immutable mappings can be derived in O(log n)
+        time each, with `set`, `without` and `update`.
+
+        :return: A new `PersistentMappingBox` instance.
+        """
+        from .persistent import PersistentMappingBox
+
+        return PersistentMappingBox(self._items)
+
+    def where(self, key: abc.Hashable | list[WhereCondition], operation: str | None = None, value: Any = None) -> MappingBox[TKey, TValue]:
+        """
+        Create a new `MappingBox` containing the entries of which the value satisfies the condition, like `filter` tests the values
+        by default. See `Box.where` for the arguments.
+        """
+        predicate = self._compile_where(key, operation, value)
+
+        # noinspection PyUnusedLocal
+        def callback(entry_key: TKey, entry_value: TValue) -> bool:
+            return predicate(entry_value)
+
+        return self.filter(callback)
+
+
+class MutableMappingBox[TKey: abc.Hashable, TValue](MappingBox[TKey, TValue], abc.MutableMapping[TKey, TValue]):
+    """
+    A mutable `MappingBox`. Live views created by `live_filter`, `live_group_by` and `live_sum` are updated on every change made
+    through the `MutableMappingBox` (including `update`, `pop`, `clear` etc.), but not on changes made to the underlying mapping directly.
+    """
+
+    __slots__ = ("_observers",)
+
+    _items: abc.MutableMapping
+    # Weak references to the live views, keyed by their id since mappings are not hashable.
+    _observers: dict[int, weakref.ref[_LiveView]] | None
+
+    def __init__(self, items: abc.MutableMapping[TKey, TValue]):
+        self._items = items
+        self._observers = None
+
+    def __setitem__(self, key: TKey, value: TValue) -> None:
+        if not self._observers:
+            self._items[key] = value
+            return
+
+        old = self._items.get(key, _MISSING)
         self._items[key] = value
 
+        for reference in tuple(self._observers.values()):
+            if (observer := reference()) is not None:
+                observer._update(key, old, value)
+
     def __delitem__(self, key: TKey) -> None:
-        del self._items[key]
+        if not self._observers:
+            del self._items[key]
+            return
+
+        old = self._items.pop(key)
+
+        for reference in tuple(self._observers.values()):
+            if (observer := reference()) is not None:
+                observer._update(key, old, _MISSING)
 
     def all(self) -> abc.MutableMapping[TKey, TValue]:
         return self._items
 
+    def live_filter(self, callback: abc.Callable[[TKey, TValue], bool] | None = None) -> LiveFilterBox[TKey, TValue]:
+        """
+        Create a read-only view containing the entries that pass the test, like `filter`. The view is kept up to date as entries
+        are set or deleted, testing only the changed entry, so reading it never rescans this `MutableMappingBox`.
+        The view stops being updated once it is no longer referenced.
+
+        :param callback: The test, called with the key and the value. If omitted, the values are tested for being truthy.
+        :return: A new `LiveFilterBox` instance.
+        """
+        return self._observe(LiveFilterBox(self, callback))
+
+    def live_group_by[TGroup: abc.Hashable](self, key: abc.Hashable | abc.Callable[[TValue], TGroup]) -> LiveGroupBox[TGroup, TKey, TValue]:
+        """
+        Create a read-only view grouping the entries by the given attribute or key of their values, or by the result of the given
+        callback. Every group is a read-only mapping of the entries in it. The view is kept up to date as entries are set or deleted,
+        moving only the changed entry, and stops being updated once it is no longer referenced.
+
+        :param key: The attribute or key of the values to group by (resolved like `where`), or a callback computing the group of a value.
+        :return: A new `LiveGroupBox` instance.
+        """
+        return self._observe(LiveGroupBox(self, key))
+
+    def live_sum(self, key: abc.Hashable | abc.Callable[[TValue], Any] | None = None) -> LiveSum:
+        """
+        Create a sum of the values, or of the given attribute or key of the values, that is kept up to date as entries are set or
+        deleted. Reading it takes constant time. It stops being updated once it is no longer referenced.
+        Since changes are applied by adding and subtracting, sums of floats may accumulate rounding errors over time.
+
+        :param key: The attribute or key of the values to sum (resolved like `where`), or a callback computing it.
+            If omitted, the values themselves are summed.
+        :return: A new `LiveSum` instance.
+        """
+        return self._observe(LiveSum(self, key))
+
+    def _observe[TView: _LiveView](self, view: TView) -> TView:
+        if self._observers is None:
+            self._observers = {}
+
+        observers, view_id = self._observers, id(view)
+        # The view unregisters itself once it is garbage collected.
+        observers[view_id] = weakref.ref(view, lambda _: observers.pop(view_id, None))
+
+        return view
+
+
+class GroupedBox[TKey: abc.Hashable, T](MutableMappingBox[TKey, list[T]]):
+    """
+    The result of `Box.group_by`: a `MutableMappingBox` mapping every group to the list of its items, of which `aggregate`
+    computes statistics per group.
+    """
+
+    __slots__ = ("_levels",)
+
+    _levels: int
+
+    def __init__(self, items: abc.MutableMapping[TKey, list[T]], levels: int = 0):
+        """
+        :param items: The groups.
+        :param levels: The number of levels the groups are nested in, or 0 if they are not nested.
+        """
+        super().__init__(items)
+        self._levels = levels
+
+    def __reduce__(self) -> tuple:
+        return type(self), (self._items, self._levels)
+
+    def aggregate(self, *aggregates: str, key: abc.Hashable | abc.Callable[[T], Any] | None = None, **named: AggregateSpec) -> MutableMappingBox[TKey, dict[str, Any]]:  # type: ignore[override]
+        """
+        Compute several statistics per group in a single pass. See `Box.aggregate` for the arguments.
+
+        :return: A new `MutableMappingBox` mapping every group to a dict of the names and results of the aggregates.
+        """
+        pairs = ((group, value) for group, values in _flatten(self._items, self._levels) for value in values)
+
+        return _aggregate_pairs(pairs, self._compile_aggregates(aggregates, key, named), self._levels)
+
+    def _new(self, items: abc.Iterable) -> MutableMappingBox:  # type: ignore[override]
+        return MutableMappingBox(dict(items))
+
+
+def _aggregate_pairs(pairs: abc.Iterable[tuple[Any, Any]], specs: list[tuple[str, abc.Callable[[Any], Any] | None, abc.Callable[[], Accumulator]]], levels: int, spill_threshold: int | None = None, spill_dir: str | None = None) -> MutableMappingBox:
+    """Aggregate `(group, item)` pairs with the specs of `Box._compile_aggregates`, and nest the groups in `levels` levels."""
+    results = (
+        (group, {name: result for (name, _, _), result in zip(specs, group_results)})
+        for group, group_results in aggregate_groups(pairs, [getter for _, getter, _ in specs], [factory for _, _, factory in specs], spill_threshold, spill_dir)
+    )
+
+    return cast(MutableMappingBox, box(_nest(results, levels) if levels else dict(results)))
+
+
+def _nest(entries: abc.Iterable[tuple[Any, Any]], levels: int) -> dict:
+    """Turn entries keyed by tuples of `levels` keys into nested dicts."""
+    nested: dict = {}
+
+    for keys, value in entries:
+        level = nested
+
+        for level_key in keys[:levels - 1]:
+            level = level.setdefault(level_key, {})
+
+        level[keys[levels - 1]] = value
+
+    return nested
+
+
+def _flatten(nested: abc.Mapping, levels: int) -> abc.Iterable[tuple[Any, Any]]:
+    """The inverse of `_nest`: yield the entries of nested dicts, keyed by tuples of `levels` keys."""
+    if levels <= 1:
+        return ((keys if levels == 0 else (keys,), value) for keys, value in nested.items())
+
+    return (((level_key, *keys), value) for level_key, inner in nested.items() for keys, value in _flatten(inner, levels - 1))
+
+
+class _LiveView:
+    """A view on a `MutableMappingBox` that is updated whenever one of its entries is set or deleted."""
+
+    __slots__ = ()
+
+    def _update(self, key: Any, old: Any, new: Any) -> None:
+        """
+        Apply a change to an entry.
+
+        :param key: The key of the entry.
+        :param old: The previous value, or `_MISSING` if the entry was added.
+        :param new: The new value, or `_MISSING` if the entry was deleted.
+        """
+        raise NotImplementedError
+
+
+class LiveFilterBox[TKey: abc.Hashable, TValue](MappingBox[TKey, TValue], _LiveView):
+    """
+    A read-only `MappingBox` of the entries of a `MutableMappingBox` that pass a test, maintained incrementally.
+    Created by `MutableMappingBox.live_filter`. Entries that start passing the test after a change are moved to the end.
+    """
+
+    __slots__ = ("_callback", "__weakref__")
+
+    _items: dict[TKey, TValue]
+
+    def __init__(self, source: abc.Mapping[TKey, TValue], callback: abc.Callable[[TKey, TValue], bool] | None = None):
+        self._callback = callback if callback is not None else lambda key, value: bool(value)
+        self._items = {key: value for key, value in source.items() if self._callback(key, value)}
+
+    def __reduce__(self) -> tuple:
+        # A live view cannot be live in another process; it is pickled as a snapshot.
+        return MutableMappingBox, (dict(self._items),)
+
+    def _update(self, key: TKey, old: Any, new: Any) -> None:
+        if new is not _MISSING and self._callback(key, new):
+            self._items[key] = new
+
+        else:
+            self._items.pop(key, None)
+
+    def _new(self, items: abc.Iterable) -> MutableMappingBox:  # type: ignore[override]
+        # New `Box` instances are snapshots, not live views.
+        return MutableMappingBox(dict(items))
+
+
+class LiveGroupBox[TGroup: abc.Hashable, TKey: abc.Hashable, TValue](MappingBox[TGroup, abc.Mapping[TKey, TValue]], _LiveView):
+    """
+    A read-only `MappingBox` mapping groups to the entries of a `MutableMappingBox` in them, maintained incrementally.
+    Created by `MutableMappingBox.live_group_by`. Empty groups are removed.
+    """
+
+    __slots__ = ("_getter", "_members", "_key_groups", "__weakref__")
+
+    _items: dict[TGroup, types.MappingProxyType[TKey, TValue]]
+
+    def __init__(self, source: abc.Mapping[TKey, TValue], key: abc.Hashable | abc.Callable[[TValue], TGroup]):
+        self._getter = key if callable(key) else Box._compile_getter(key)
+        self._items = {}
+        # The entries of every group, and the group of every key, so that an entry can be moved even if its value was mutated in place.
+        self._members: dict[TGroup, dict[TKey, TValue]] = {}
+        self._key_groups: dict[TKey, TGroup] = {}
+
+        for entry_key, value in source.items():
+            self._update(entry_key, _MISSING, value)
+
+    def __reduce__(self) -> tuple:
+        return MutableMappingBox, ({group: dict(members) for group, members in self._members.items()},)
+
+    def _update(self, key: TKey, old: Any, new: Any) -> None:
+        if old is not _MISSING:
+            old_group = self._key_groups.pop(key)
+            old_members = self._members[old_group]
+            del old_members[key]
+
+            if not old_members:
+                del self._members[old_group], self._items[old_group]
+
+        if new is not _MISSING:
+            group = self._getter(new)
+
+            if (members := self._members.get(group)) is None:
+                members = self._members[group] = {}
+                self._items[group] = types.MappingProxyType(members)
+
+            members[key] = new
+            self._key_groups[key] = group
+
+    def _new(self, items: abc.Iterable) -> MutableMappingBox:  # type: ignore[override]
+        return MutableMappingBox(dict(items))
+
+
+class LiveSum(_LiveView):
+    """A sum over the values of a `MutableMappingBox`, maintained incrementally. Created by `MutableMappingBox.live_sum`."""
+
+    __slots__ = ("_getter", "_terms", "_total", "__weakref__")
+
+    def __init__(self, source: abc.Mapping, key: abc.Hashable | abc.Callable[[Any], Any] | None = None):
+        self._getter = key if key is None or callable(key) else Box._compile_getter(key)
+        # The term of every key, so that it can be subtracted even if its value was mutated in place.
+        self._terms: dict[Any, Any] = {}
+        self._total: Any = 0
+
+        for entry_key, value in source.items():
+            self._update(entry_key, _MISSING, value)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.value!r})"
+
+    @property
+    def value(self) -> Any:
+        """
+        :return: The current sum, or `None` if the `MutableMappingBox` is empty (consistent with `Box.sum`).
+        """
+        return self._total if self._terms else None
+
+    def _update(self, key: Any, old: Any, new: Any) -> None:
+        if old is not _MISSING:
+            self._total -= self._terms.pop(key)
+
+        if new is not _MISSING:
+            term = new if self._getter is None else self._getter(new)
+            self._terms[key] = term
+            self._total += term
+
+
+class MutableSetBox[TValue](SizedBox, abc.MutableSet):
+    __slots__ = ()
 
-class MutableSetBox[TValue](SizedBox, abc.MutableSet, set):
     _items: abc.MutableSet
 
+    @classmethod
+    def _from_iterable[TItem](cls, items: abc.Iterable[TItem]) -> MutableSetBox[TItem]:
+        # Used by the set operators of `abc.Set`, such as `|` and `&`.
+        return cast(MutableSetBox[TItem], cls(set(items)))
+
     def all(self) -> abc.MutableSet[TValue]:
         return self._items
 
@@ -436,53 +2001,175 @@ def box(items: None) -> SequenceBox[list]:
 
 
 @typing.overload
-def box[T: abc.Hashable](items: abc.MutableSet[T]) -> MutableSetBox[T]:
+def box[T](items: abc.AsyncIterable[T]) -> AsyncBox[T]:
+    ...
+
+
+@typing.overload
+def box[T: abc.Hashable](items: abc.MutableSet[T], *, copy: bool = True) -> MutableSetBox[T]:
     ...
 
 
 @typing.overload
-def box[TKey: abc.Hashable, TValue](items: abc.MutableMapping[TKey, TValue]) -> MutableMappingBox[TKey, TValue]:
+def box[TKey: abc.Hashable, TValue](items: abc.MutableMapping[TKey, TValue], *, copy: bool = True) -> MutableMappingBox[TKey, TValue]:
     ...
 
 
 @typing.overload
-def box[TKey: abc.Hashable, TValue](items: abc.Mapping[TKey, TValue]) -> MappingBox[TKey, TValue]:
+def box[TKey: abc.Hashable, TValue](items: abc.Mapping[TKey, TValue], *, copy: bool = True) -> MappingBox[TKey, TValue]:
     ...
 
 
 @typing.overload
-def box[T](items: abc.Sequence[T]) -> SequenceBox[T]:
+def box[T](items: abc.Sequence[T], *, copy: bool = True, vectorize: bool = False, columnar: bool = False) -> SequenceBox[T]:
     ...
 
 
 @typing.overload
-def box[T](items: SizedIterable[T]) -> SizedBox[T]:
+def box[T](items: SizedIterable[T], *, copy: bool = True) -> SizedBox[T]:
     ...
 
 
-def box(items=None):
+def box(items=None, *, copy=True, vectorize=False, columnar=False):
+    """
+    Wrap the given items in the most specific `Box` type.
+
+    By default, the items are copied into a new container, so that the `Box` and the caller's container are independent.
+    With `copy=False`, the caller's container is wrapped directly, which takes constant time and memory. The `Box` and the
+    container then alias each other: mutations through a mutable `Box` are visible in the container and vice versa, and
+    mappings are no longer converted into a `frozendict`, so an immutable `MappingBox` is only as immutable as its mapping.
+    Methods that produce a new `Box` (e.g. `map`, `filter`) never alias the original container. See also `box.view`.
+
+    :param items: The items to wrap. Non-iterables are wrapped in a list; `None` results in an empty `SequenceBox`.
+    :param copy: Whether to copy the items into a new container, rather than wrapping the given container.
+    :param vectorize: Whether to wrap homogeneous `int` or `float` sequences in a NumPy-backed `ArrayBox`.
+        NumPy arrays and `array.array` instances are always wrapped in an `ArrayBox` if NumPy is installed.
+    :param columnar: Whether to store sequences of homogeneous mappings column by column, in a `RecordBox`. This always copies.
+    :return: The new `Box` instance.
+
+    The `Box` type is looked up by the type of the items, and the result of that lookup is cached per type, so wrapping items of
+    a type that was wrapped before costs little more than a dict lookup. Use `box.register` to add support for other types.
+    """
     if items is None:
         return box([])
 
-    if not isinstance(items, abc.Iterable):
-        return box([items])
+    if columnar and isinstance(items, abc.Sequence) and items and all(isinstance(row, abc.Mapping) for row in items):
+        from .record_box import RecordBox
 
-    if isinstance(items, abc.MutableSet):
-        return MutableSetBox(set(items))
+        try:
+            return RecordBox.from_rows(items)
 
-    if isinstance(items, abc.MutableMapping):
-        return MutableMappingBox(dict(items))
+        except ValueError:
+            # Heterogeneous rows cannot be stored in columns; use a regular `SequenceBox` instead.
+            pass
+
+    if vectorize:
+        from .array_box import ArrayBox
 
+        if ArrayBox.accepts(items, homogeneous=True):
+            return ArrayBox(items, copy=copy)
+
+    item_type = type(items)
+
+    try:
+        factory = _DISPATCH_CACHE[item_type]
+
+    except KeyError:
+        factory = _DISPATCH_CACHE[item_type] = _resolve_factory(item_type)
+
+    if factory is None:
+        raise TypeError("Cannot create Box instance from item type {}".format(item_type))
+
+    return factory(items, copy)
+
+
+def register(item_type: type, factory: BoxFactory) -> None:
+    """
+    Register how `box()` wraps items of the given type, e.g. `box.register(MyList, lambda items, copy: SequenceBox(list(items)))`.
+
+    The registration also applies to subclasses of the type, and if the type is an abstract base class or a runtime-checkable
+    protocol, to every type that is considered a subclass of it. Registrations for the type of the items itself or one of its
+    (nominal) base classes take precedence over those; among the latter, the most recent registration takes precedence.
+
+    :param item_type: The type of items.
+    :param factory: A callable creating a `Box` from the items and the `copy` flag that was passed to `box()`.
+    """
+    # Re-registering a type moves it to the end, so that it takes precedence over earlier abstract registrations.
+    _BOX_FACTORIES.pop(item_type, None)
+    _BOX_FACTORIES[item_type] = factory
+    _DISPATCH_CACHE.clear()
+
+
+def _resolve_factory(item_type: type) -> BoxFactory | None:
+    for base in item_type.__mro__:
+        if base in _BOX_FACTORIES:
+            return _BOX_FACTORIES[base]
+
+    for registered_type, factory in reversed(_BOX_FACTORIES.items()):
+        if issubclass(item_type, registered_type):
+            return factory
+
+    if not issubclass(item_type, abc.Iterable):
+        return _wrap_item
+
+    return None
+
+
+def _wrap_item(item: Any, copy: bool) -> SequenceBox:
+    return cast(SequenceBox, box([item]))
+
+
+def _sequence_box(items: abc.Sequence, copy: bool) -> SequenceBox:
+    if copy:
+        return SequenceBox(list(items))
+
+    # Only lists and tuples are known to be constructible from an iterable, which `SequenceBox` needs to create new instances.
+    return SequenceBox(items) if isinstance(items, (list, tuple)) else SequenceViewBox(items)
+
+
+register(SizedIterable, lambda items, copy: SizedBox(list(items) if copy else items))
+register(abc.Sequence, _sequence_box)
+register(abc.Mapping, lambda items, copy: MappingBox(frozendict(items) if copy else items))
+register(abc.MutableMapping, lambda items, copy: MutableMappingBox(dict(items) if copy else items))
+register(abc.MutableSet, lambda items, copy: MutableSetBox(set(items) if copy else items))
+
+
+def view(items: typing.Any) -> SequenceViewBox | MappingBox:
+    """
+    Create a read-only `Box` over the given container in constant time, without copying it.
+
+    Objects supporting the buffer protocol, such as `bytes`, `bytearray`, `memoryview`, `array.array` and `mmap.mmap`, are wrapped
+    in a read-only `memoryview`; its items are those of the buffer's format (e.g. `float` for an `array.array` of type `"d"`).
+    Mappings are wrapped in a read-only `types.MappingProxyType`, and other sequences are wrapped as-is.
+
+    The view aliases the container: changes made to the container by its owner are visible through the view. While a view on a
+    resizable buffer (e.g. a `bytearray` or `array.array`) or an `mmap` exists, that object cannot be resized or closed.
+    Methods that produce a new `Box` (e.g. `map`, `filter`, `chunk`) return regular list-backed boxes; `chunk` yields views.
+
+    :param items: The container to view.
+    :return: A new `SequenceViewBox` or `MappingBox`.
+    :raises TypeError: When the container is not a buffer, mapping or sequence.
+    """
     if isinstance(items, abc.Mapping):
-        return MappingBox(frozendict(items))  # type: ignore
+        return MappingBox(types.MappingProxyType(items))
+
+    try:
+        buffer = memoryview(items)
+
+    except TypeError:
+        pass
+
+    else:
+        return SequenceViewBox(buffer.toreadonly())
 
     if isinstance(items, abc.Sequence):
-        return SequenceBox(list(items))
+        return SequenceViewBox(items)
+
+    raise TypeError("Cannot create a view on item type {}".format(type(items)))
 
-    if isinstance(items, SizedIterable):
-        return SizedBox(list(items))
 
-    raise TypeError("Cannot create Box instance from item type {}".format(type(items)))
+box.register = register  # type: ignore[attr-defined]
+box.view = view  # type: ignore[attr-defined]
 
 
 if __name__ == "__main__":
@@ -0,0 +1,473 @@
+from __future__ import annotations
+
+import collections.abc as abc
+import itertools
+from typing import Any, cast
+
+from .fluentbox import _MISSING, MappingBox, box
+
+# Every level of the trie consumes 5 bits of the hash, so that a node has at most 32 entries.
+_BITS = 5
+_MASK = (1 << _BITS) - 1
+
+
+class _Node:
+    """
+    A node of the trie, in the compressed (CHAMP) layout: for each of the 32 possible hash fragments at its level, the node holds
+    either a key and its value, a child node, or nothing. `datamap` and `nodemap` have a bit set for each fragment that holds a key
+    respectively a child; the keys, values and children are stored in that order, without gaps.
+    """
+
+    __slots__ = ("datamap", "nodemap", "keys", "values", "nodes")
+
+    def __init__(self, datamap: int, nodemap: int, keys: tuple, values: tuple, nodes: tuple):
+        self.datamap = datamap
+        self.nodemap = nodemap
+        self.keys = keys
+        self.values = values
+        self.nodes = nodes
+
+    def assoc(self, shift: int, key_hash: int, key: Any, value: Any) -> tuple[_Node, bool]:
+        bit = 1 << ((key_hash >> shift) & _MASK)
+
+        if self.datamap & bit:
+            index = (self.datamap & (bit - 1)).bit_count()
+            existing_key = self.keys[index]
+
+            if existing_key is key or existing_key == key:
+                if self.values[index] is value:
+                    return self, False
+
+                return _Node(self.datamap, self.nodemap, self.keys, _replace(self.values, index, value), self.nodes), False
+
+            # Both keys share this fragment, so they are moved into a new child node.
+            child = _merge(shift + _BITS, existing_key, self.values[index], key_hash, key, value)
+            node_index = (self.nodemap & (bit - 1)).bit_count()
+
+            return _Node(
+                self.datamap ^ bit, self.nodemap | bit, _remove(self.keys, index), _remove(self.values, index),
+                _insert(self.nodes, node_index, child),
+            ), True
+
+        if self.nodemap & bit:
+            index = (self.nodemap & (bit - 1)).bit_count()
+            existing = self.nodes[index]
+            child, added = existing.assoc(shift + _BITS, key_hash, key, value)
+
+            if child is existing:
+                return self, False
+
+            return _Node(self.datamap, self.nodemap, self.keys, self.values, _replace(self.nodes, index, child)), added
+
+        index = (self.datamap & (bit - 1)).bit_count()
+
+        return _Node(
+            self.datamap | bit, self.nodemap, _insert(self.keys, index, key), _insert(self.values, index, value), self.nodes
+        ), True
+
+    def without(self, shift: int, key_hash: int, key: Any) -> _Node | None:
+        bit = 1 << ((key_hash >> shift) & _MASK)
+
+        if self.datamap & bit:
+            index = (self.datamap & (bit - 1)).bit_count()
+            existing_key = self.keys[index]
+
+            if not (existing_key is key or existing_key == key):
+                return self
+
+            if self.datamap == bit and not self.nodemap:
+                return None
+
+            return _Node(self.datamap ^ bit, self.nodemap, _remove(self.keys, index), _remove(self.values, index), self.nodes)
+
+        if not self.nodemap & bit:
+            return self
+
+        index = (self.nodemap & (bit - 1)).bit_count()
+        existing = self.nodes[index]
+        child = existing.without(shift + _BITS, key_hash, key)
+
+        if child is existing:
+            return self
+
+        if child is not None and (child.nodes or len(child.keys) > 1):
+            return _Node(self.datamap, self.nodemap, self.keys, self.values, _replace(self.nodes, index, child))
+
+        nodes = _remove(self.nodes, index)
+
+        if child is None:
+            return _Node(self.datamap, self.nodemap ^ bit, self.keys, self.values, nodes) if self.datamap or nodes else None
+
+        # A child with a single key left is inlined, so that the trie stays as shallow as possible.
+        data_index = (self.datamap & (bit - 1)).bit_count()
+
+        return _Node(
+            self.datamap | bit, self.nodemap ^ bit, _insert(self.keys, data_index, child.keys[0]),
+            _insert(self.values, data_index, child.values[0]), nodes,
+        )
+
+
+class _CollisionNode:
+    """A leaf of the trie holding keys of which the hashes are equal."""
+
+    __slots__ = ("key_hash", "keys", "values")
+
+    nodes = ()
+
+    def __init__(self, key_hash: int, keys: tuple, values: tuple):
+        self.key_hash = key_hash
+        self.keys = keys
+        self.values = values
+
+    def assoc(self, shift: int, key_hash: int, key: Any, value: Any) -> tuple[_Node | _CollisionNode, bool]:
+        if key_hash != self.key_hash:
+            # The new key only shares a prefix of the hash; both are placed under a node at this level.
+            return _Node(0, 1 << ((self.key_hash >> shift) & _MASK), (), (), (self,)).assoc(shift, key_hash, key, value)
+
+        for index, existing_key in enumerate(self.keys):
+            if existing_key is key or existing_key == key:
+                if self.values[index] is value:
+                    return self, False
+
+                return _CollisionNode(key_hash, self.keys, _replace(self.values, index, value)), False
+
+        return _CollisionNode(key_hash, self.keys + (key,), self.values + (value,)), True
+
+    def without(self, shift: int, key_hash: int, key: Any) -> _CollisionNode | None:
+        if key_hash != self.key_hash:
+            return self
+
+        for index, existing_key in enumerate(self.keys):
+            if existing_key is key or existing_key == key:
+                return _CollisionNode(key_hash, _remove(self.keys, index), _remove(self.values, index)) if len(self.keys) > 1 else None
+
+        return self
+
+
+_EMPTY_NODE = _Node(0, 0, (), (), ())
+
+
+class PersistentMap[TKey: abc.Hashable, TValue](abc.Mapping[TKey, TValue]):
+    """
+    An immutable mapping stored as a hash array mapped trie (HAMT). `set`, `without` and `update` return new `PersistentMap`
+    instances that share all unchanged parts of the trie with the original, so deriving a mapping that differs in a few keys takes
+    O(log n) time and memory per key, rather than copying all items. Lookups take O(log n) time as well, with a base of 32, so
+    that even mappings with millions of keys are at most five levels deep. Building a `PersistentMap` and looking up keys are
+    still several times slower than with a `dict`, so it pays off when many mappings are derived from one base.
+
+    Keys are iterated in the order of their hashes, not in the order they were inserted. Like `frozendict`, a `PersistentMap` is
+    hashable if its values are.
+    """
+
+    __slots__ = ("_root", "_length", "_hash")
+
+    _root: _Node
+    _length: int
+    _hash: int | None
+
+    def __init__(self, items: abc.Mapping[TKey, TValue] | abc.Iterable[tuple[TKey, TValue]] = ()):
+        """
+        :param items: A mapping or key/value pairs, as accepted by `dict`. Later pairs take precedence over earlier ones.
+        """
+        if isinstance(items, PersistentMap):
+            self._root, self._length = items._root, items._length
+
+        else:
+            entries = [(hash(key), key, value) for key, value in (items if isinstance(items, dict) else dict(items)).items()]
+            self._root, self._length = _build(entries, 0) if entries else _EMPTY_NODE, len(entries)
+
+        self._hash = None
+
+    def __contains__(self, key: object) -> bool:
+        return _find(self._root, hash(key), key) is not _MISSING
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, PersistentMap) and other._root is self._root:
+            return True
+
+        return super().__eq__(other)
+
+    def __getitem__(self, key: TKey) -> TValue:
+        value = _find(self._root, hash(key), key)
+
+        if value is _MISSING:
+            raise KeyError(key)
+
+        return cast(TValue, value)
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            self._hash = hash(frozenset(self.items()))
+
+        return self._hash
+
+    def __iter__(self) -> abc.Iterator[TKey]:
+        return itertools.chain.from_iterable(keys for keys, _ in _leaves(self._root))
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __reduce__(self) -> tuple:
+        return PersistentMap, (dict(self.items()),)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self.items())!r})"
+
+    def get(self, key: TKey, default: Any = None) -> TValue | Any:
+        value = _find(self._root, hash(key), key)
+
+        return default if value is _MISSING else value
+
+    def items(self) -> abc.ItemsView[TKey, TValue]:
+        return _ItemsView(self)
+
+    def set(self, key: TKey, value: TValue) -> PersistentMap[TKey, TValue]:
+        """
+        :param key: The key to set.
+        :param value: The new value of the key.
+        :return: A new `PersistentMap` in which the key has the given value, or this `PersistentMap` if it already had.
+        """
+        root, added = self._root.assoc(0, hash(key), key, value)
+
+        return self if root is self._root else self._derive(root, self._length + added)
+
+    def update(self, other: abc.Mapping[TKey, TValue] | abc.Iterable[tuple[TKey, TValue]] = (), /, **kwargs: TValue) -> PersistentMap[TKey, TValue]:
+        """
+        :param other: A mapping or key/value pairs to set, as accepted by `dict.update`.
+        :param kwargs: More keys to set.
+        :return: A new `PersistentMap` in which all given keys are set.
+        """
+        root, length = self._root, self._length
+        pairs = other.items() if isinstance(other, abc.Mapping) else other
+
+        for key, value in (*pairs, *kwargs.items()):
+            root, added = root.assoc(0, hash(key), key, value)
+            length += added
+
+        return self if root is self._root else self._derive(root, length)
+
+    def values(self) -> abc.ValuesView[TValue]:
+        return _ValuesView(self)
+
+    def without(self, *keys: TKey) -> PersistentMap[TKey, TValue]:
+        """
+        :param keys: The keys to remove. Keys that do not exist are ignored.
+        :return: A new `PersistentMap` without the given keys.
+        """
+        root, length = self._root, self._length
+
+        for key in keys:
+            key_hash = hash(key)
+
+            if _find(root, key_hash, key) is not _MISSING:
+                root = root.without(0, key_hash, key) or _EMPTY_NODE
+                length -= 1
+
+        return self if root is self._root else self._derive(root, length)
+
+    def _derive(self, root: _Node, length: int) -> PersistentMap[TKey, TValue]:
+        derived = object.__new__(PersistentMap)
+        derived._root, derived._length, derived._hash = root, length, None
+
+        return derived
+
+
+class _ItemsView(abc.ItemsView):
+    __slots__ = ()
+
+    _mapping: PersistentMap
+
+    def __iter__(self) -> abc.Iterator[tuple[Any, Any]]:
+        return itertools.chain.from_iterable(itertools.starmap(zip, _leaves(self._mapping._root)))
+
+
+class _ValuesView(abc.ValuesView):
+    __slots__ = ()
+
+    _mapping: PersistentMap
+
+    def __iter__(self) -> abc.Iterator[Any]:
+        return itertools.chain.from_iterable(values for _, values in _leaves(self._mapping._root))
+
+
+class PersistentMappingBox[TKey: abc.Hashable, TValue](MappingBox[TKey, TValue]):
+    """
+    An immutable `MappingBox` backed by a `PersistentMap`. `set`, `without` and `update` return new boxes that share structure with
+    this one, so many slightly different mappings can be derived from one large base cheaply. `filter` and `only` share structure
+    as well: `filter` removes the rejected keys from the trie when fewer keys are rejected than kept, and `only` looks up the given
+    keys rather than scanning all items.
+    """
+
+    __slots__ = ()
+
+    _items: PersistentMap[TKey, TValue]
+
+    def __init__(self, items: abc.Mapping[TKey, TValue] | abc.Iterable[tuple[TKey, TValue]] = ()):
+        """
+        :param items: A `PersistentMap`, which is used as-is, or a mapping or key/value pairs to copy into a new one.
+        """
+        self._items = items if isinstance(items, PersistentMap) else PersistentMap(items)
+
+    def filter(self, callback: abc.Callable[[TKey, TValue], bool] | None = None) -> PersistentMappingBox[TKey, TValue]:  # type: ignore[override]
+        if callback is None:
+            # noinspection PyUnusedLocal
+            def callback(key: TKey, value: TValue) -> bool:
+                return bool(value)
+
+        kept: list[tuple[TKey, TValue]] = []
+        rejected: list[TKey] = []
+
+        for key, value in self._items.items():
+            if callback(key, value):
+                kept.append((key, value))
+
+            else:
+                rejected.append(key)
+
+        if len(rejected) <= len(kept):
+            return PersistentMappingBox(self._items.without(*rejected))
+
+        return PersistentMappingBox(kept)
+
+    def only(self, keys: abc.Iterable[abc.Hashable]) -> PersistentMappingBox:
+        items: PersistentMap[Any, TValue] = self._items
+
+        return PersistentMappingBox([(key, value) for key in keys if (value := items.get(key, _MISSING)) is not _MISSING])
+
+    def persistent(self) -> PersistentMappingBox[TKey, TValue]:
+        return self
+
+    def set(self, key: TKey, value: TValue) -> PersistentMappingBox[TKey, TValue]:
+        """
+        Create a new `PersistentMappingBox` in which the key has the given value. This box is left unchanged.
+
+        :param key: The key to set.
+        :param value: The new value of the key.
+        :return: A new `PersistentMappingBox` instance, sharing all other keys with this one.
+        """
+        return PersistentMappingBox(self._items.set(key, value))
+
+    def update(self, other: abc.Mapping[TKey, TValue] | abc.Iterable[tuple[TKey, TValue]] = (), /, **kwargs: TValue) -> PersistentMappingBox[TKey, TValue]:
+        """
+        Create a new `PersistentMappingBox` in which the given keys are set. This box is left unchanged.
+
+        :param other: A mapping or key/value pairs to set, as accepted by `dict.update`.
+        :param kwargs: More keys to set.
+        :return: A new `PersistentMappingBox` instance, sharing all other keys with this one.
+        """
+        return PersistentMappingBox(self._items.update(other, **kwargs))
+
+    def without(self, *keys: TKey) -> PersistentMappingBox[TKey, TValue]:
+        """
+        Create a new `PersistentMappingBox` without the given keys. This box is left unchanged.
+
+        :param keys: The keys to remove. Keys that do not exist are ignored.
+        :return: A new `PersistentMappingBox` instance, sharing all other keys with this one.
+        """
+        return PersistentMappingBox(self._items.without(*keys))
+
+
+def _build(entries: list[tuple[int, Any, Any]], shift: int) -> _Node:
+    # Builds the trie for distinct keys at once, by partitioning them by hash fragment, rather than copying nodes for every key.
+    buckets: dict[int, list[tuple[int, Any, Any]]] = {}
+
+    for entry in entries:
+        fragment = (entry[0] >> shift) & _MASK
+
+        if fragment in buckets:
+            buckets[fragment].append(entry)
+
+        else:
+            buckets[fragment] = [entry]
+
+    datamap, nodemap, keys, values = 0, 0, [], []
+    nodes: list[_Node | _CollisionNode] = []
+
+    for fragment in sorted(buckets):
+        bucket = buckets[fragment]
+
+        if len(bucket) == 1:
+            datamap |= 1 << fragment
+            keys.append(bucket[0][1])
+            values.append(bucket[0][2])
+
+        else:
+            nodemap |= 1 << fragment
+
+            if len({key_hash for key_hash, _, _ in bucket}) == 1:
+                nodes.append(_CollisionNode(bucket[0][0], tuple(key for _, key, _ in bucket), tuple(value for _, _, value in bucket)))
+
+            else:
+                nodes.append(_build(bucket, shift + _BITS))
+
+    return _Node(datamap, nodemap, tuple(keys), tuple(values), tuple(nodes))
+
+
+def _find(node: _Node | _CollisionNode, key_hash: int, key: Any) -> Any:
+    shift = 0
+
+    while type(node) is _Node:
+        bit = 1 << ((key_hash >> shift) & _MASK)
+
+        if node.datamap & bit:
+            existing_key = node.keys[index := (node.datamap & (bit - 1)).bit_count()]
+
+            return node.values[index] if existing_key is key or existing_key == key else _MISSING
+
+        if not node.nodemap & bit:
+            return _MISSING
+
+        node, shift = node.nodes[(node.nodemap & (bit - 1)).bit_count()], shift + _BITS
+
+    # Only collision nodes are left once the loop ends.
+    node = cast(_CollisionNode, node)
+
+    if node.key_hash == key_hash:
+        for index, existing_key in enumerate(node.keys):
+            if existing_key is key or existing_key == key:
+                return node.values[index]
+
+    return _MISSING
+
+
+def _insert(entries: tuple, index: int, entry: Any) -> tuple:
+    return entries[:index] + (entry,) + entries[index:]
+
+
+def _leaves(node: _Node | _CollisionNode) -> abc.Iterator[tuple[tuple, tuple]]:
+    # Yields the keys and values held by every node below, so that the items themselves can be iterated at C speed.
+    pending = [node]
+
+    while pending:
+        node = pending.pop()
+        yield node.keys, node.values
+        pending.extend(node.nodes)
+
+
+def _merge(shift: int, key: Any, value: Any, other_hash: int, other_key: Any, other_value: Any) -> _Node | _CollisionNode:
+    # Creates the node holding two keys that share the hash fragments above this level.
+    key_hash = hash(key)
+
+    if key_hash == other_hash:
+        return _CollisionNode(key_hash, (key, other_key), (value, other_value))
+
+    fragment, other_fragment = (key_hash >> shift) & _MASK, (other_hash >> shift) & _MASK
+
+    if fragment == other_fragment:
+        return _Node(0, 1 << fragment, (), (), (_merge(shift + _BITS, key, value, other_hash, other_key, other_value),))
+
+    if fragment < other_fragment:
+        return _Node((1 << fragment) | (1 << other_fragment), 0, (key, other_key), (value, other_value), ())
+
+    return _Node((1 << fragment) | (1 << other_fragment), 0, (other_key, key), (other_value, value), ())
+
+
+def _remove(entries: tuple, index: int) -> tuple:
+    return entries[:index] + entries[index + 1:]
+
+
+def _replace(entries: tuple, index: int, entry: Any) -> tuple:
+    return entries[:index] + (entry,) + entries[index + 1:]
+
+
+box.register(PersistentMap, lambda items, copy: PersistentMappingBox(items))  # type: ignore[attr-defined]
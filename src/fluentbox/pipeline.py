@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import collections.abc as abc
+import functools
+import inspect
+import itertools
+from typing import Any
+
+from .fluentbox import Box, SequenceBox, box
+
+type Operation = tuple[str, tuple, dict[str, Any]]
+type Stage = abc.Callable[[abc.Iterator], abc.Iterator]
+
+
+class Pipeline:
+    """
+    A reusable chain of `Box` operations, recorded once and applied to many iterables, e.g.::
+
+        totals = fluentbox.pipeline().where("status", "==", "paid").pluck("amount").sum()
+
+        for batch in batches:
+            total = totals(batch)
+
+    Calling a `Pipeline` with an iterable or `Box` gives the same result as calling the recorded methods on `box(items)` (or on the
+    `Box` itself), but without the per-call setup: the conditions of `where`, the lookups of `pluck` and the other callbacks are
+    compiled once, and the leading `where`, `filter`, `map`, `pluck`, `flat_map`, `take`, `skip` and `take_while` operations are fused
+    into a single chain of iterators, so that no intermediate containers are created. Operations after the first other operation
+    (e.g. `group_by`), and all operations on `Box` types that implement these methods themselves (e.g. `ArrayBox`, `filter` and
+    `where` on a `MappingBox`, or a `SequenceBox` with indexes), are called as regular methods.
+
+    Recording an operation returns a new `Pipeline`, so pipelines may share a common prefix. Iterables are not copied by `box()`,
+    and iterators are wrapped in a plain `Box`.
+    """
+
+    __slots__ = ("_operations", "_stages", "_rest")
+
+    def __init__(self, operations: tuple[Operation, ...] = ()):
+        """
+        :param operations: The recorded operations, as `(method name, args, kwargs)` triples.
+        """
+        self._operations = operations
+        self._stages: tuple[tuple[str, Stage], ...] | None = None
+        self._rest: tuple[Operation, ...] = ()
+
+    def __getattr__(self, name: str) -> abc.Callable[..., Pipeline]:
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        def record(*args: Any, **kwargs: Any) -> Pipeline:
+            return Pipeline(self._operations + ((name, args, kwargs),))
+
+        return record
+
+    def __call__(self, items: abc.Iterable | Box) -> Any:
+        """
+        Apply the recorded operations.
+
+        :param items: The items to apply the operations to.
+        :return: The result of the last operation.
+        """
+        if self._stages is None:
+            self.compile()
+
+        if isinstance(items, Box):
+            result = items
+
+        else:
+            # Iterators cannot be wrapped by `box()`, since it would have to exhaust them to create a container.
+            result = Box(items) if isinstance(items, abc.Iterator) else box(items, copy=False)  # type: ignore[call-overload]
+        operations = self._operations
+
+        if self._stages and _fusable(result, self._stages):
+            iterator = iter(result._iterable())
+
+            for _, stage in self._stages:
+                iterator = stage(iterator)
+
+            result, operations = result._new(iterator), self._rest
+
+        for name, args, kwargs in operations:
+            result = getattr(result, name)(*args, **kwargs)
+
+        return result
+
+    def __repr__(self) -> str:
+        calls = "".join(
+            f".{name}({', '.join([*map(repr, args), *(f'{key}={value!r}' for key, value in kwargs.items())])})"
+            for name, args, kwargs in self._operations
+        )
+
+        return f"pipeline(){calls}"
+
+    def compile(self) -> Pipeline:
+        """
+        Compile the recorded operations. This is done automatically when the `Pipeline` is first called.
+
+        :return: This `Pipeline`.
+        """
+        stages: list[tuple[str, Stage]] = []
+
+        for name, args, kwargs in self._operations:
+            try:
+                stage = _compile_stage(name, args, kwargs)
+
+            except (TypeError, ValueError):
+                # The arguments may only be valid for a `Box` type with its own implementation (e.g. `ArrayBox.map(abs, vectorize=True)`);
+                # otherwise, the method itself raises the error when the `Pipeline` is called.
+                stage = None
+
+            if stage is None:
+                break
+
+            stages.append((name, stage))
+
+        self._rest = self._operations[len(stages):]
+        self._stages = tuple(stages)
+
+        return self
+
+
+def pipeline() -> Pipeline:
+    """
+    Start recording a reusable chain of `Box` operations. See `Pipeline`.
+
+    :return: A new, empty `Pipeline` instance.
+    """
+    return Pipeline()
+
+
+def _compile_stage(name: str, args: tuple, kwargs: dict[str, Any]) -> Stage | None:
+    # Operations are bound to the signatures in `Box`, so that keyword arguments are supported as well.
+    if name not in _STAGES:
+        return None
+
+    arguments = _STAGES[name][0].bind(None, *args, **kwargs).arguments
+    arguments.pop("self")
+
+    return _STAGES[name][1](**arguments)
+
+
+def _stage(method: abc.Callable, compile_stage: abc.Callable[..., Stage]) -> tuple[inspect.Signature, abc.Callable[..., Stage]]:
+    return inspect.signature(method), compile_stage
+
+
+_STAGES: dict[str, tuple[inspect.Signature, abc.Callable[..., Stage]]] = {
+    "filter": _stage(Box.filter, lambda callback=None: functools.partial(filter, callback)),
+    "flat_map": _stage(Box.flat_map, lambda callback: lambda iterator: itertools.chain.from_iterable(map(callback, iterator))),
+    "map": _stage(Box.map, lambda callback: functools.partial(map, callback)),
+    "pluck": _stage(Box.pluck, lambda key, **options: functools.partial(map, Box._compile_pluck(key, **options))),
+    "skip": _stage(Box.skip, lambda count: lambda iterator: itertools.islice(iterator, count, None)),
+    "take": _stage(Box.take, lambda count: lambda iterator: itertools.islice(iterator, count)),
+    "take_while": _stage(Box.take_while, lambda callback: functools.partial(itertools.takewhile, callback)),
+    "where": _stage(Box.where, lambda key, **condition: functools.partial(filter, Box._compile_where(key, **condition))),
+}
+
+
+def _fusable(bx: Box, stages: tuple[tuple[str, Stage], ...]) -> bool:
+    # The stages reproduce the implementations in `Box`; a `SequenceBox` without indexes uses those as well.
+    cls = type(bx)
+
+    for name, _ in stages:
+        method = getattr(cls, name)
+
+        if method is not getattr(Box, name) and not (method is SequenceBox.where and not getattr(bx, "_indexes", None)):
+            return False
+
+    return True
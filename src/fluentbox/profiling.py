@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+import array
+import collections.abc as abc
+import functools
+import inspect
+import threading
+import time
+import tracemalloc
+import typing
+from typing import Any, NamedTuple, cast
+
+from frozendict import frozendict
+
+from .fluentbox import Box, LazyBox
+from .persistent import PersistentMap
+
+try:
+    import numpy as np
+
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore[assignment]
+
+# Containers whose length is cheap to determine and does not consume or materialize anything.
+_COUNTABLE: tuple[type, ...] = (list, tuple, dict, set, frozenset, frozendict, PersistentMap, array.array, memoryview, range) + (
+    (np.ndarray,) if np is not None else ()
+)
+
+
+class ProfileEvent(NamedTuple):
+    """A single profiled call of a `Box` method, as passed to the sinks of a `Profile`."""
+
+    box_type: str
+    method: str
+    items_in: int | None
+    items_out: int | None
+    seconds: float
+    allocated: int | None
+
+
+class MethodStats:
+    """The totals of all profiled calls of a method on a `Box` type."""
+
+    __slots__ = ("calls", "items_in", "items_out", "seconds", "allocated")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.items_in = 0
+        self.items_out = 0
+        self.seconds = 0.0
+        self.allocated = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(calls={self.calls}, items_in={self.items_in}, items_out={self.items_out}, "
+            f"seconds={self.seconds:.6f}, allocated={self.allocated})"
+        )
+
+    def add(self, event: ProfileEvent) -> None:
+        self.calls += 1
+        self.items_in += event.items_in or 0
+        self.items_out += event.items_out or 0
+        self.seconds += event.seconds
+        self.allocated += event.allocated or 0
+
+
+class Profile:
+    """
+    Records every call of a public `Box` method while it is active, e.g. `with fluentbox.profile() as p: ...`. For each call, the
+    number of items in the box and in the result, the wall time, and optionally the memory allocated are recorded. The totals per
+    method are kept in `stats`, and every call is also passed to the sinks, which are callables receiving a `ProfileEvent`.
+
+    Methods are only instrumented while at least one `Profile` is active; the instrumentation is removed again afterwards, so that
+    it adds no overhead otherwise. Profiling is process-wide: calls from all threads are recorded by all active profiles.
+
+    Calls made by a method to the same method of the same box (e.g. through `super()`) are only recorded once. Items are only
+    counted when that is cheap and has no side effects, e.g. not for generators or lazily grouped boxes. Methods returning lazy
+    results (generators, `LazyBox`) are timed until they return, not until their result is consumed.
+    """
+
+    def __init__(self, *sinks: abc.Callable[[ProfileEvent], Any], memory: bool = False):
+        """
+        :param sinks: Callables that receive a `ProfileEvent` for every call, e.g. to log slow calls or export metrics.
+        :param memory: Whether to measure the memory allocated by every call, using `tracemalloc`. This slows down all allocations
+            while profiling.
+        """
+        self.stats: dict[str, MethodStats] = {}
+        self.memory = memory
+        self._sinks = sinks
+        self._started_tracing = False
+
+    def __enter__(self) -> typing.Self:
+        self.start()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.stop()
+
+    def report(self, limit: int | None = None) -> str:
+        """
+        :param limit: The maximum number of methods to include.
+        :return: A table of the recorded methods, slowest first.
+        """
+        rows = sorted(self.stats.items(), key=lambda entry: entry[1].seconds, reverse=True)[:limit]
+        lines = [f"{'method':<40} {'calls':>8} {'items in':>12} {'items out':>12} {'seconds':>10} {'allocated':>12}"]
+
+        for name, stats in rows:
+            lines.append(
+                f"{name:<40} {stats.calls:>8} {stats.items_in:>12} {stats.items_out:>12} {stats.seconds:>10.6f} {stats.allocated:>12}"
+            )
+
+        return "\n".join(lines)
+
+    def start(self) -> None:
+        """Start recording calls. Prefer using the `Profile` in a `with` block."""
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+        _activate(self)
+
+    def stop(self) -> None:
+        """Stop recording calls. The recorded statistics are kept."""
+        _deactivate(self)
+
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def _record(self, event: ProfileEvent) -> None:
+        name = f"{event.box_type}.{event.method}"
+
+        if (stats := self.stats.get(name)) is None:
+            stats = self.stats[name] = MethodStats()
+
+        stats.add(event)
+
+        for sink in self._sinks:
+            sink(event)
+
+
+def profile(*sinks: abc.Callable[[ProfileEvent], Any], memory: bool = False) -> Profile:
+    """
+    Profile the `Box` methods called in a `with` block::
+
+        with fluentbox.profile() as p:
+            handle_request()
+
+        print(p.report())
+
+    See `Profile` for details.
+
+    :param sinks: Callables that receive a `ProfileEvent` for every call.
+    :param memory: Whether to measure the memory allocated by every call, using `tracemalloc`.
+    :return: A new `Profile` instance.
+    """
+    return Profile(*sinks, memory=memory)
+
+
+_lock = threading.Lock()
+# The active profiles, replaced rather than mutated, so that instrumented methods can read it without locking.
+_active: tuple[Profile, ...] = ()
+# The original functions of the instrumented methods, to restore them once no profile is active.
+_originals: list[tuple[type, str, abc.Callable]] = []
+_calls = threading.local()
+
+
+def _activate(profile_: Profile) -> None:
+    global _active
+
+    with _lock:
+        if not _active:
+            _instrument_all()
+
+        _active = _active + (profile_,)
+
+
+def _deactivate(profile_: Profile) -> None:
+    global _active
+
+    with _lock:
+        if profile_ not in _active:
+            return
+
+        _active = tuple(active for active in _active if active is not profile_)
+
+        if not _active:
+            for cls, name, function in reversed(_originals):
+                setattr(cls, name, function)
+
+            _originals.clear()
+
+
+def _box_types() -> list[type]:
+    types: list[type] = []
+    pending: list[type] = [Box]
+
+    while pending:
+        cls = pending.pop()
+
+        if cls not in types:
+            types.append(cls)
+            pending.extend(cls.__subclasses__())
+
+    return types
+
+
+def _instrument_all() -> None:
+    for cls in _box_types():
+        for name, member in list(vars(cls).items()):
+            if not name.startswith("_") and inspect.isfunction(member):
+                _originals.append((cls, name, member))
+                setattr(cls, name, _instrument(member, name))
+
+
+def _instrument(function: abc.Callable, name: str) -> abc.Callable:
+    @functools.wraps(function)
+    def instrumented(self: Box, *args: Any, **kwargs: Any) -> Any:
+        active = _active
+        calls = _calls.__dict__.setdefault("calls", set())
+        call = (id(self), name)
+
+        if not active or call in calls:
+            return function(self, *args, **kwargs)
+
+        calls.add(call)
+        items_in = _size(self)
+        memory = tracemalloc.is_tracing() and any(profile_.memory for profile_ in active)
+        allocated_before = tracemalloc.get_traced_memory()[0] if memory else 0
+        start = time.perf_counter()
+
+        try:
+            result = function(self, *args, **kwargs)
+
+        finally:
+            calls.discard(call)
+
+        seconds = time.perf_counter() - start
+        allocated = tracemalloc.get_traced_memory()[0] - allocated_before if memory else None
+        event = ProfileEvent(type(self).__name__, name, items_in, _size(result), seconds, allocated)
+
+        for profile_ in active:
+            profile_._record(event)
+
+        return result
+
+    return instrumented
+
+
+def _size(obj: Any) -> int | None:
+    if isinstance(obj, Box):
+        if isinstance(obj, LazyBox):
+            return None
+
+        obj = obj._items
+
+    return len(cast(abc.Sized, obj)) if isinstance(obj, _COUNTABLE) else None
@@ -0,0 +1,284 @@
+from __future__ import annotations
+
+import array
+import collections.abc as abc
+import typing
+from typing import Any, cast
+
+from .fluentbox import Box, GroupedBox, MutableMappingBox, SequenceBox, WhereCondition, box
+
+
+class _Rows(abc.Sequence[dict[str, Any]]):
+    """Read-only row-wise view over a set of equally long columns. Row dicts are only built when they are accessed."""
+
+    def __init__(self, columns: dict[str, abc.Sequence], length: int):
+        self._columns = columns
+        self._length = length
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> abc.Iterator[dict[str, Any]]:
+        names = tuple(self._columns)
+
+        for values in zip(*self._columns.values()):
+            yield dict(zip(names, values))
+
+    @typing.overload
+    def __getitem__(self, index: int) -> dict[str, Any]:
+        ...
+
+    @typing.overload
+    def __getitem__(self, index: slice) -> list[dict[str, Any]]:
+        ...
+
+    def __getitem__(self, index: int | slice) -> dict[str, Any] | list[dict[str, Any]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._length))]
+
+        return {name: column[index] for name, column in self._columns.items()}
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self)!r})"
+
+
+class RecordBox(SequenceBox[dict[str, Any]]):
+    """
+    A `SequenceBox` of homogeneous records, stored column by column. Each field is kept as its own `list` (or `array.array`),
+    so that `pluck` returns a column without copying, and `where`, `group_by` and `key_by` on a field only scan that field's column.
+    Row dicts are only built when rows are accessed, e.g. when iterating or calling `to_rows`.
+    """
+
+    __slots__ = ("_columns",)
+
+    _items: _Rows
+    _columns: dict[str, abc.Sequence]
+
+    def __init__(self, columns: abc.Mapping[str, abc.Sequence]):
+        """
+        Instantiate a new `RecordBox` from columns. The columns are used as-is, not copied.
+
+        :param columns: A mapping from field names to their column of values. All columns must be equally long.
+        :raises ValueError: When the columns are not equally long.
+        """
+        self._columns = dict(columns)
+        lengths = {len(column) for column in self._columns.values()}
+
+        if len(lengths) > 1:
+            raise ValueError(f"Columns must be equally long, got lengths {sorted(lengths)}")
+
+        self._items = _Rows(self._columns, lengths.pop() if lengths else 0)
+
+    def __reduce__(self) -> tuple:
+        return RecordBox, (self._columns,)
+
+    @classmethod
+    def from_rows(cls, rows: abc.Iterable[abc.Mapping[str, Any] | object], typecodes: abc.Mapping[str, str] | None = None) -> RecordBox:
+        """
+        Create a `RecordBox` from rows. The rows may be mappings or objects; for objects, their attributes are used as fields.
+        All rows must have the same fields as the first row.
+
+        :param rows: The rows to store.
+        :param typecodes: Optionally, `array.array` typecodes for numeric fields, to store those columns compactly.
+        :return: A new `RecordBox` instance.
+        :raises ValueError: When a row does not have the same fields as the first row.
+        """
+        iterator = iter(rows)
+        first = next(iterator, None)
+
+        if first is None:
+            return cls({})
+
+        first_row = cls._as_mapping(first)
+        names = tuple(first_row)
+        columns: dict[str, list] = {name: [value] for name, value in first_row.items()}
+        appends = [columns[name].append for name in names]
+
+        for row in iterator:
+            row = cls._as_mapping(row)
+
+            if len(row) != len(names):
+                raise ValueError(f"Row {row} does not have fields {names}")
+
+            try:
+                for append, name in zip(appends, names):
+                    append(row[name])
+
+            except KeyError:
+                raise ValueError(f"Row {row} does not have fields {names}") from None
+
+        if typecodes:
+            for name, typecode in typecodes.items():
+                columns[name] = array.array(typecode, columns[name])  # type: ignore[assignment]
+
+        return cls(columns)
+
+    @typing.overload  # type: ignore[override]
+    def __getitem__(self, index: int) -> dict[str, Any]:
+        ...
+
+    @typing.overload
+    def __getitem__(self, index: slice) -> RecordBox:
+        ...
+
+    def __getitem__(self, index: int | slice) -> dict[str, Any] | RecordBox:
+        if isinstance(index, slice):
+            return RecordBox({name: column[index] for name, column in self._columns.items()})
+
+        return self._items[index]
+
+    @property
+    def columns(self) -> dict[str, abc.Sequence]:
+        """
+        :return: The columns, keyed by field name. These are not copied; mutating them mutates the `RecordBox`.
+        """
+        return self._columns
+
+    @property
+    def fields(self) -> tuple[str, ...]:
+        """
+        :return: The names of the fields.
+        """
+        return tuple(self._columns)
+
+    def chunk(self, chunk_size: int) -> SequenceBox[RecordBox]:  # type: ignore[override]
+        return SequenceBox([self[i: i + chunk_size] for i in range(0, len(self), chunk_size)])
+
+    def group_by[TKey: abc.Hashable](self, key: str | abc.Callable[[dict[str, Any]], TKey] | list[str | abc.Callable[[dict[str, Any]], Any]], *, nested: bool = False) -> GroupedBox[TKey, dict[str, Any]]:
+        """
+        Group the records. If a single field name is given, only that field's column is hashed, and every group is a `RecordBox` itself.
+        Otherwise, the callback is applied to each row, as in `Box.group_by`.
+
+        :param key: The field to group by, a callback computing the group of a row, or a list of those.
+        :param nested: See `Box.group_by`.
+        :return: A new `GroupedBox` mapping each group to its records.
+        """
+        if not isinstance(key, str) or key not in self._columns:
+            return super().group_by(key, nested=nested)
+
+        positions: dict[Any, list[int]] = {}
+
+        for position, value in enumerate(self._columns[key]):
+            if value in positions:
+                positions[value].append(position)
+
+            else:
+                positions[value] = [position]
+
+        return GroupedBox(cast(dict[TKey, list[dict[str, Any]]], {value: self._take(indices) for value, indices in positions.items()}))
+
+    def key_by[TKey: abc.Hashable](self, key: TKey | abc.Callable[[dict[str, Any]], TKey]) -> MutableMappingBox[TKey, dict[str, Any]]:
+        if not isinstance(key, str) or key not in self._columns:
+            return super().key_by(key)
+
+        # Later rows take precedence over earlier rows with the same key, as in `Box.key_by`.
+        positions = {value: position for position, value in enumerate(self._columns[key])}
+
+        return cast(MutableMappingBox[TKey, dict[str, Any]], box({value: self._items[position] for value, position in positions.items()}))
+
+    def pluck[TDefault](self, key: abc.Hashable, *, default: TDefault = None, raise_on_error: bool = False) -> SequenceBox[Any]:  # type: ignore[assignment]
+        """
+        Get the values of a field. The column itself is wrapped, without copying it.
+
+        :param key: The field.
+        :param default: The value for every row if the field does not exist.
+        :param raise_on_error: Whether to raise a `KeyError` if the field does not exist.
+        :return: A new `SequenceBox` wrapping the column.
+        :raises KeyError: When the field does not exist and `raise_on_error` is `True`.
+        """
+        if key in self._columns:
+            return SequenceBox(self._columns[key])
+
+        if raise_on_error:
+            raise KeyError(f"Records do not have field {key}")
+
+        return SequenceBox([default] * len(self))
+
+    def sort_by(self, key: Any = None, descending: bool | list[bool] = False) -> Box[dict[str, Any]]:
+        """
+        Sort the records. When sorting by fields, only the columns of those fields are read, and the result is a `RecordBox` itself.
+        Otherwise, see `Box.sort_by`.
+        """
+        fields = key if isinstance(key, list) else [key]
+
+        if not all(isinstance(field, str) and field in self._columns for field in fields):
+            return super().sort_by(key, descending)
+
+        getters: list[abc.Hashable | abc.Callable[[Any], Any]] = [self._columns[field].__getitem__ for field in fields]
+        positions = SequenceBox[int](list(range(len(self)))).sort_by(getters if isinstance(key, list) else getters[0], descending)
+
+        return self._take(cast(list[int], positions.all()))
+
+    def to_rows(self) -> list[dict[str, Any]]:
+        """
+        Convert the records back into a list of row dicts.
+
+        :return: A list containing a new dict for each record.
+        """
+        return list(self._items)
+
+    def where(self, key: abc.Hashable | list[WhereCondition], operation: str | None = None, value: Any = None) -> Box[dict[str, Any]]:
+        """
+        Create a new `RecordBox` containing the records that satisfy the condition(s). Conditions on fields only scan the column of
+        that field. See `Box.where` for the supported operations.
+        """
+        conditions = [(tuple(condition) + (None, None))[:3] for condition in key] if isinstance(key, list) else [(key, operation, value)]
+
+        if any(field not in self._columns for field, _, _ in conditions):
+            return super().where(key, operation, value)
+
+        selected: list[int] | None = None
+
+        for field, condition_operation, condition_value in conditions:
+            predicate = self._compile_operation(condition_operation, condition_value)
+            column = self._columns[field]
+
+            if selected is None:
+                selected = [position for position, item in enumerate(column) if predicate(item)]
+
+            else:
+                # Subsequent conditions only need to look at the records that are still selected.
+                selected = [position for position in selected if predicate(column[position])]
+
+        return self._take(selected or [])
+
+    @staticmethod
+    def _as_mapping(row: abc.Mapping[str, Any] | object) -> abc.Mapping[str, Any]:
+        return row if isinstance(row, abc.Mapping) else vars(row)
+
+    @classmethod
+    def _compile_operation(cls, operation: str | None, value: Any) -> abc.Callable[[Any], bool]:
+        if operation is None:
+            return bool
+
+        if operation not in cls._OPERATOR_MAPPING:
+            raise ValueError(f"Invalid operator: '{operation}'")
+
+        compare = cls._OPERATOR_MAPPING[operation]
+
+        return lambda obj: compare(obj, value)
+
+    def _new(self, items: abc.Iterable[Any]) -> SequenceBox[Any]:  # type: ignore[override]
+        values = list(items)
+
+        if not values:
+            return RecordBox({name: [] for name in self._columns})
+
+        if all(isinstance(value, abc.Mapping) for value in values):
+            try:
+                return RecordBox.from_rows(values)
+
+            except ValueError:
+                # The rows are no longer homogeneous, so they cannot be stored in columns.
+                pass
+
+        return SequenceBox[Any](values)
+
+    def _take(self, positions: list[int]) -> RecordBox:
+        columns: dict[str, abc.Sequence] = {}
+
+        for name, column in self._columns.items():
+            values = [column[position] for position in positions]
+            columns[name] = array.array(column.typecode, values) if isinstance(column, array.array) else values
+
+        return RecordBox(columns)
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import array
+import collections.abc as abc
+import struct
+import sys
+import typing
+from multiprocessing import shared_memory
+from typing import Any, cast
+
+from .fluentbox import SequenceBox, SequenceViewBox, box
+
+try:
+    import numpy as np
+
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore[assignment]
+
+# The `struct` formats of the fixed-width items that can be placed in shared memory.
+_FORMATS = frozenset("?bBhHiIlLqQfd")
+
+
+class SharedMemoryHandle:
+    """
+    A picklable reference to items placed in a shared memory block by `SequenceBox.to_shared_memory`. Only the name, format and
+    length of the block are pickled, so sending a handle to a worker process is cheap regardless of the number of items; the worker
+    attaches to the block with `box.from_shared_memory`.
+
+    The process that created the block owns it: it must keep the handle until the workers are done, and then `unlink` the block.
+    Using the handle in a `with` block does so automatically.
+    """
+
+    __slots__ = ("name", "format", "length", "_shm")
+
+    def __init__(self, name: str, item_format: str, length: int, shm: shared_memory.SharedMemory | None = None):
+        """
+        :param name: The name of the shared memory block.
+        :param item_format: The `struct` format of a single item.
+        :param length: The number of items.
+        :param shm: The open shared memory block, in the process that created it.
+        """
+        self.name = name
+        self.format = item_format
+        self.length = length
+        self._shm = shm
+
+    def __enter__(self) -> typing.Self:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+        self.unlink()
+
+    def __reduce__(self) -> tuple:
+        return SharedMemoryHandle, (self.name, self.format, self.length)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(name={self.name!r}, format={self.format!r}, length={self.length})"
+
+    def close(self) -> None:
+        """Close this process's access to the shared memory block. The block itself remains available to other processes."""
+        if self._shm is not None:
+            self._shm.close()
+
+    def unlink(self) -> None:
+        """
+        Free the shared memory block. Only the process that created it should call this, once no process needs the items anymore.
+        """
+        if self._shm is None:
+            self._shm = _attach(self.name)
+            self._shm.close()
+
+        self._shm.unlink()
+
+
+class SharedMemoryBox[T](SequenceViewBox[T]):
+    """
+    A read-only `SequenceBox` over items in a shared memory block, created by `box.from_shared_memory`. The items are not copied
+    into the process; they are read from the block when accessed. The block stays attached until `close` is called, or until the
+    `with` block the `SharedMemoryBox` is used in ends.
+    """
+
+    __slots__ = ("_shm",)
+
+    _items: memoryview
+    _shm: shared_memory.SharedMemory
+
+    def __init__(self, shm: shared_memory.SharedMemory, item_format: str, length: int):
+        """
+        :param shm: The attached shared memory block.
+        :param item_format: The `struct` format of a single item.
+        :param length: The number of items.
+        """
+        self._shm = shm
+        self._items = _cast_buffer(shm, item_format, length).toreadonly()
+
+    def __enter__(self) -> typing.Self:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def __reduce__(self) -> tuple:
+        # The block is only referenced by name, so workers should send a `SharedMemoryHandle` instead; a copy of the items is sent.
+        return SequenceBox, (list(self._items),)
+
+    def close(self) -> None:
+        """Detach from the shared memory block. Items can no longer be accessed afterwards."""
+        self._items.release()
+        self._shm.close()
+
+
+def to_shared_memory(sequence: SequenceBox) -> SharedMemoryHandle:
+    """
+    Copy the items of a `SequenceBox` into a new shared memory block. See `SequenceBox.to_shared_memory`.
+    """
+    items = sequence.all()
+    item_format = _item_format(items)
+
+    if np is not None and isinstance(items, np.ndarray):
+        # Views such as reversed or strided arrays are not contiguous, so their buffer cannot be cast.
+        items = np.ascontiguousarray(items)
+
+    length = len(items)
+
+    shm = shared_memory.SharedMemory(create=True, size=max(1, length * struct.calcsize(item_format)))
+
+    try:
+        if length:
+            target = _cast_buffer(shm, item_format, length)
+
+            # The block cannot be closed while the view on it exists, so the view is released even if copying fails.
+            try:
+                if isinstance(items, (bytes, bytearray, memoryview, array.array)) or (np is not None and isinstance(items, np.ndarray)):
+                    target[:] = memoryview(items).cast("B").cast(item_format)  # type: ignore[call-overload]
+
+                else:
+                    target[:] = array.array(item_format, items) if item_format != "?" else memoryview(bytes(items)).cast("?")
+
+            finally:
+                target.release()
+
+    except BaseException:
+        shm.close()
+        shm.unlink()
+        raise
+
+    return SharedMemoryHandle(shm.name, item_format, length, shm)
+
+
+def from_shared_memory(handle: SharedMemoryHandle) -> SharedMemoryBox:
+    """
+    Attach to the items that another process placed in shared memory with `SequenceBox.to_shared_memory`, without copying them.
+
+    :param handle: The handle returned by `to_shared_memory`, usually received as an argument of a worker function.
+    :return: A new `SharedMemoryBox` instance, which must be closed when it is no longer needed.
+    :raises FileNotFoundError: When the shared memory block does not exist (anymore).
+    """
+    return SharedMemoryBox(_attach(handle.name), handle.format, handle.length)
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+
+    # Before Python 3.13, attaching registers the block with the resource tracker. Worker processes started by `multiprocessing`
+    # share the tracker of the process that created the block, so this is harmless there; unregistering would break `unlink`.
+    return shared_memory.SharedMemory(name=name)
+
+
+def _cast_buffer(shm: shared_memory.SharedMemory, item_format: str, length: int) -> memoryview:
+    # The buffer of a block is only `None` once it is closed, and any `struct` format of a single item can be cast to.
+    buffer = cast(memoryview, shm.buf)
+
+    return buffer[:length * struct.calcsize(item_format)].cast(item_format)  # type: ignore[call-overload, no-any-return]
+
+
+def _item_format(items: abc.Sequence) -> str:
+    if np is not None and isinstance(items, np.ndarray):
+        if items.ndim == 1 and items.dtype.kind in "biuf" and items.dtype.isnative and items.dtype.char in _FORMATS:
+            return items.dtype.char
+
+        raise TypeError(f"Cannot place an array of {items.dtype} in shared memory")
+
+    if isinstance(items, array.array):
+        if items.typecode in _FORMATS:
+            return items.typecode
+
+        raise TypeError(f"Cannot place an array of typecode '{items.typecode}' in shared memory")
+
+    if isinstance(items, (bytes, bytearray)):
+        return "B"
+
+    item_types = set(map(type, items))
+
+    if item_types <= {bool}:
+        return "?"
+
+    if item_types == {int}:
+        return "q"
+
+    if item_types <= {int, float}:
+        return "d"
+
+    raise TypeError(f"Cannot place items of types {sorted(item_type.__name__ for item_type in item_types)} in shared memory")
+
+
+box.from_shared_memory = from_shared_memory  # type: ignore[attr-defined]
@@ -0,0 +1,84 @@
+import operator
+import unittest
+
+from src.fluentbox import Box
+from src.fluentbox.aggregates import Accumulator, Count, DistinctCount, Percentile, Reduce, accumulator_factory, aggregate_groups
+
+
+class _Colliding(int):
+    def __hash__(self) -> int:
+        return 0
+
+
+class AccumulatorTest(unittest.TestCase):
+    def test_accumulator_factory(self) -> None:
+        self.assertIs(Count, accumulator_factory("count"))
+        self.assertIs(Count, accumulator_factory(Count))
+
+        percentile = accumulator_factory("p99.5")()
+        self.assertIsInstance(percentile, Percentile)
+
+        with self.assertRaises(ValueError):
+            accumulator_factory("p")
+
+    def test_percentile(self) -> None:
+        percentile = Percentile(25)
+
+        for value in [4, 1, 3, 2]:
+            percentile.add(value)
+
+        self.assertEqual(1.75, percentile.result())
+        self.assertIsNone(Percentile(50).result())
+
+        with self.assertRaises(ValueError):
+            Percentile(101)
+
+    def test_percentile_is_bounded(self) -> None:
+        percentile = Percentile(50, sample_size=100)
+
+        for value in range(10_000):
+            percentile.add(value)
+
+        self.assertEqual(100, len(percentile._sample))
+        self.assertAlmostEqual(5_000, percentile.result(), delta=1_500)
+
+    def test_distinct_count(self) -> None:
+        distinct = DistinctCount(k=16)
+
+        for value in [1, 2, 2, "a", "a", None]:
+            distinct.add(value)
+
+        # Below `k` distinct values, the count is exact.
+        self.assertEqual(4, distinct.result())
+
+    def test_custom_accumulator(self) -> None:
+        class Product(Accumulator):
+            def __init__(self) -> None:
+                self.product = 1
+
+            def add(self, value: int) -> None:
+                self.product *= value
+
+            def result(self) -> int:
+                return self.product
+
+        self.assertEqual({"product": 24}, Box([1, 2, 3, 4]).aggregate(product=Product).all())
+
+    def test_reduce(self) -> None:
+        self.assertEqual({"product": 24}, Box([1, 2, 3, 4]).aggregate(product=lambda: Reduce(operator.mul)).all())
+        self.assertEqual({"product": 1}, Box([]).aggregate(product=lambda: Reduce(operator.mul, 1)).all())
+        self.assertIsNone(Reduce(operator.mul).result())
+
+    def test_aggregate_groups_spills(self) -> None:
+        pairs = [(i % 100, i) for i in range(2000)]
+        expected = dict(aggregate_groups(pairs, [None, None], [Count, lambda: Reduce(max)]))
+
+        for threshold in (1, 10, 99, 100):
+            with self.subTest(threshold=threshold):
+                self.assertEqual(expected, dict(aggregate_groups(pairs, [None, None], [Count, lambda: Reduce(max)], threshold)))
+
+        self.assertEqual([100] * 2, [len(expected), sum(count for count, _ in expected.values()) // 20])
+
+        # Groups whose hashes collide are spilled again until the depth limit, and then aggregated in memory.
+        colliding = [(_Colliding(i % 5), i) for i in range(20)]
+        self.assertEqual(5, len(dict(aggregate_groups(colliding, [None], [Count], 1))))
@@ -0,0 +1,137 @@
+import array
+import unittest
+
+from src.fluentbox import ArrayBox, SequenceBox, box
+
+try:
+    import numpy as np
+
+except ImportError:  # pragma: no cover
+    np = None
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class ArrayBoxTest(unittest.TestCase):
+    def test_box_dispatch(self) -> None:
+        self.assertIsInstance(box(np.arange(3)), ArrayBox)
+        self.assertIsInstance(box(array.array("d", [1.0, 2.0])), ArrayBox)
+
+        # Homogeneous numeric lists are only vectorized when opted in.
+        self.assertNotIsInstance(box([1, 2, 3]), ArrayBox)
+        self.assertIsInstance(box([1, 2, 3], vectorize=True), ArrayBox)
+        self.assertNotIsInstance(box([1, 2.5, 3], vectorize=True), ArrayBox)
+        self.assertNotIsInstance(box(["a", "b"], vectorize=True), ArrayBox)
+
+        # box() copies its input, like it does for other container types.
+        source = array.array("d", [1.0, 2.0])
+        box(source).all()[0] = 9.0
+        self.assertEqual(1.0, source[0])
+
+    def test_sum_and_average(self) -> None:
+        bx = ArrayBox([1, 2, 3, 5])
+
+        self.assertEqual(11, bx.sum())
+        self.assertEqual(2.75, bx.average())
+        self.assertEqual(None, ArrayBox([]).sum())
+
+        with self.assertRaises(ZeroDivisionError):
+            ArrayBox([]).average()
+
+    def test_statistics(self) -> None:
+        bx = ArrayBox([2, 4, 4, 4, 5, 5, 7, 9])
+
+        self.assertEqual((2, 9), (bx.min(), bx.max()))
+        self.assertEqual(5.0, bx.mean())
+        self.assertEqual(4.0, bx.variance(population=True))
+        self.assertEqual(2 * 4 ** 3 * 5 ** 2 * 7 * 9, bx.product())
+        self.assertEqual({2: 1, 4: 3, 5: 2, 7: 1, 9: 1}, bx.count_by().all())
+        self.assertEqual(1.0, ArrayBox([1e100, 1.0, -1e100]).sum(compensated=True))
+
+        empty = ArrayBox([])
+        self.assertEqual([None] * 5, [empty.min(), empty.max(), empty.mean(), empty.variance(), empty.product()])
+
+    def test_where(self) -> None:
+        bx = ArrayBox([1, 5, 2, 8, 3])
+
+        self.assertEqual([5, 8], bx.where(None, ">", 3).all().tolist())
+        self.assertEqual([1, 2, 3], bx.where(None, "<=", 3).all().tolist())
+        self.assertEqual([2, 3], bx.where(None, "between", (2, 4)).all().tolist())
+        self.assertEqual([5, 8], bx.where(None, "in", {5, 8}).all().tolist())
+        self.assertEqual([1, 2, 3], bx.where(None, "not in", [5, 8]).all().tolist())
+        self.assertEqual([1.5], ArrayBox([0.0, 1.5]).where().all().tolist())
+
+        # `first_where` shares the signature of `where`.
+        self.assertEqual(5, bx.first_where(None, ">", 3))
+        self.assertIsNone(bx.first_where(None, ">", 8))
+
+        with self.assertRaises(IndexError):
+            bx.first_where_or_fail(None, ">", 8)
+
+        with self.assertRaises(ValueError):
+            bx.where(None, "~", 3)
+
+    def test_filter(self) -> None:
+        bx = ArrayBox([1, 5, 2, 8])
+
+        # Boolean masks are applied directly.
+        self.assertEqual([1, 2], bx.filter([True, False, True, False]).all().tolist())
+        self.assertEqual([5, 8], bx.filter(np.array([False, True, False, True])).all().tolist())
+
+        with self.assertRaises(ValueError):
+            bx.filter([True])
+
+        # Ufuncs and opted-in callbacks are evaluated on the entire array at once.
+        self.assertEqual([-1, -3], ArrayBox([-1, 2, -3]).filter(np.signbit).all().tolist())
+        self.assertEqual([5, 8], bx.filter(lambda items: items > 4, vectorize=True).all().tolist())
+
+        # Other callbacks are applied to every item, as a Python number.
+        seen = []
+        self.assertEqual([5], bx.filter(lambda item: seen.append(item) or item == 5).all().tolist())
+        self.assertEqual([1, 5, 2, 8], seen)
+
+    def test_map(self) -> None:
+        bx = ArrayBox([1, 2, 3])
+
+        mapped = bx.map(lambda items: items * 2 + 1, vectorize=True)
+        self.assertIsInstance(mapped, ArrayBox)
+        self.assertEqual([3, 5, 7], mapped.all().tolist())
+
+        mapped = bx.map(np.negative)
+        self.assertIsInstance(mapped, ArrayBox)
+        self.assertEqual([-1, -2, -3], mapped.all().tolist())
+
+        # Without opting in, the callback is not given the array.
+        self.assertEqual([True, True, True], ArrayBox([1.0, 2.0, 3.0]).map(lambda item: item.is_integer()).all())
+
+        # Callbacks that cannot be vectorized fall back to a regular SequenceBox.
+        mapped = bx.map(lambda item: {"value": int(item)})
+        self.assertNotIsInstance(mapped, ArrayBox)
+        self.assertEqual([{"value": 1}, {"value": 2}, {"value": 3}], mapped.all())
+
+    def test_chunk_and_reverse(self) -> None:
+        bx = ArrayBox([1, 2, 3, 4, 5])
+        chunks = bx.chunk(2)
+
+        self.assertIsInstance(chunks, SequenceBox)
+        self.assertEqual([[1, 2], [3, 4], [5]], [chunk.tolist() for chunk in chunks])
+
+        # Chunks and reversals are views on the same memory.
+        self.assertTrue(np.shares_memory(chunks[0], bx.all()))
+        self.assertEqual([5, 4, 3, 2, 1], bx.reverse().all().tolist())
+        self.assertTrue(np.shares_memory(bx.reverse().all(), bx.all()))
+
+    def test_bool_and_new(self) -> None:
+        self.assertTrue(ArrayBox([1, 2]))
+        self.assertFalse(ArrayBox([]))
+
+        self.assertEqual([1, 3], ArrayBox([1, 2, 3]).diff([2]).all().tolist())
+        self.assertEqual([(1, 3), (2, 4)], ArrayBox([1, 2]).zip([3, 4]).map(lambda pair: (int(pair[0]), int(pair[1]))).all())
+
+    def test_sort_by(self) -> None:
+        bx = ArrayBox([3, 1, 2])
+
+        self.assertIsInstance(bx.sort_by(), ArrayBox)
+        self.assertEqual([1, 2, 3], bx.sort_by().all().tolist())
+        self.assertEqual([3, 2, 1], bx.sort_by(descending=True).all().tolist())
+        self.assertEqual([1, 2, 3], bx.sort_by(lambda item: -item, descending=True).all().tolist())
+        self.assertEqual([3, 2], bx.top_k(2).all().tolist())
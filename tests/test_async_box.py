@@ -0,0 +1,96 @@
+import asyncio
+import unittest
+from collections import abc
+
+from src.fluentbox import AsyncBox, MutableMappingBox, SequenceBox, box
+
+
+async def numbers(count: int) -> abc.AsyncGenerator[int]:
+    for i in range(count):
+        await asyncio.sleep(0)
+        yield i
+
+
+class AsyncBoxTest(unittest.IsolatedAsyncioTestCase):
+    async def test_box_dispatch(self) -> None:
+        # box() wraps asynchronous iterables in an AsyncBox.
+        self.assertIsInstance(box(numbers(3)), AsyncBox)
+        self.assertEqual([0, 1, 2], await box(numbers(3)).all())
+
+        # Synchronous iterables are accepted as well.
+        self.assertEqual([1, 2], await AsyncBox([1, 2]).all())
+
+    async def test_map_and_filter(self) -> None:
+        async def double(item: int) -> int:
+            await asyncio.sleep(0)
+            return item * 2
+
+        # Both regular and coroutine callbacks are supported.
+        result = AsyncBox(numbers(6)).map(double).filter(lambda item: item % 4 == 0)
+        self.assertEqual([0, 4, 8], await result.all())
+
+        self.assertEqual([1, 2], await AsyncBox(numbers(3)).filter().all())
+
+    async def test_map_concurrency(self) -> None:
+        running = 0
+        peak = 0
+
+        async def callback(item: int) -> int:
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            # Later items finish earlier, yet the order of the results is preserved.
+            await asyncio.sleep(0.001 * (10 - item))
+            running -= 1
+            return item
+
+        self.assertEqual(list(range(10)), await AsyncBox(numbers(10)).map(callback, concurrency=3).all())
+        self.assertEqual(3, peak)
+
+        with self.assertRaises(ValueError):
+            AsyncBox(numbers(1)).map(callback, concurrency=0)
+
+    async def test_where(self) -> None:
+        rows = AsyncBox([{"id": 1, "name": "X"}, {"id": 2, "name": "Y"}, {"id": 3, "name": "X"}])
+
+        self.assertEqual([{"id": 3, "name": "X"}], await rows.where([("name", "==", "X"), ("id", ">", 1)]).all())
+
+    async def test_chunk(self) -> None:
+        self.assertEqual([[0, 1], [2, 3], [4]], await AsyncBox(numbers(5)).chunk(2).all())
+
+    async def test_first(self) -> None:
+        self.assertEqual(0, await AsyncBox(numbers(5)).first())
+        self.assertEqual(None, await AsyncBox(numbers(0)).first())
+
+        with self.assertRaises(IndexError):
+            await AsyncBox(numbers(0)).first(or_fail=True)
+
+    async def test_reduce(self) -> None:
+        async def add(x: int, y: int) -> int:
+            return x + y
+
+        self.assertEqual(10, await AsyncBox(numbers(5)).reduce(add))
+        self.assertEqual(15, await AsyncBox(numbers(5)).reduce(lambda x, y: x + y, 5))
+
+    async def test_group_by(self) -> None:
+        groups = await AsyncBox(numbers(5)).group_by(lambda item: item % 2)
+
+        self.assertIsInstance(groups, MutableMappingBox)
+        self.assertEqual({0: [0, 2, 4], 1: [1, 3]}, groups.all())
+
+        rows = AsyncBox([{"id": 1, "name": "X"}, {"id": 2, "name": "Y"}])
+        self.assertEqual(["X", "Y"], list(await rows.group_by("name")))
+
+        # A missing key raises the same error as `Box.group_by`.
+        with self.assertRaises(KeyError):
+            await AsyncBox([{"id": 1}]).group_by("name")
+
+    async def test_collect_and_each(self) -> None:
+        collected = await AsyncBox(numbers(3)).collect()
+
+        self.assertIsInstance(collected, SequenceBox)
+        self.assertEqual([0, 1, 2], collected.all())
+
+        seen = []
+        await AsyncBox(numbers(3)).each(seen.append)
+        self.assertEqual([0, 1, 2], seen)
@@ -0,0 +1,123 @@
+import time
+import unittest
+
+from frozendict import frozendict
+
+from src.fluentbox import BoxCache, CachedBox, MappingBox, MutableMappingBox, box
+from src.fluentbox.cache import CacheInfo
+
+
+def is_even(key: int, value: int) -> bool:
+    return value % 2 == 0
+
+
+def parity(key: int) -> int:
+    return key % 2
+
+
+class CachedBoxTest(unittest.TestCase):
+    def test_identical_queries_hit(self) -> None:
+        cache = BoxCache()
+        source = MappingBox(frozendict({1: 1, 2: 2, 3: 4}))
+
+        first = source.cached(cache).filter(is_even).group_by(parity)
+        self.assertIsInstance(first, CachedBox)
+        self.assertEqual({0: [2], 1: [3]}, first.unwrap().all())
+        self.assertEqual((0, 2), cache.cache_info()[:2])
+
+        second = source.cached(cache).filter(is_even).group_by(parity)
+        self.assertIs(first.unwrap(), second.unwrap())
+        self.assertEqual((2, 2), cache.cache_info()[:2])
+
+        # Equal immutable boxes share their results.
+        MappingBox(frozendict({1: 1, 2: 2, 3: 4})).cached(cache).filter(is_even)
+        self.assertEqual(3, cache.cache_info().hits)
+
+        # Unless their values differ in type.
+        self.assertIs(True, MappingBox(frozendict({"a": True})).cached(cache).filter().all()["a"])
+        self.assertIs(int, type(MappingBox(frozendict({"a": 1})).cached(cache).filter().all()["a"]))
+        self.assertEqual(3, cache.cache_info().hits)
+
+        # Different arguments are different queries; non-`Box` results are returned as-is.
+        self.assertEqual([1], list(source.cached(cache).filter(lambda key, value: value == 1)))
+        self.assertEqual(6, source.cached(cache).sum())
+        self.assertEqual(6, source.cached(cache).sum())
+        self.assertEqual(CacheInfo(hits=4, misses=6, maxsize=128, currsize=6), cache.cache_info())
+
+    def test_where_and_group_by(self) -> None:
+        cache = BoxCache()
+        source = MappingBox(frozendict({1: {"amount": 5}, 2: {"amount": 1}, 3: {"amount": 7}}))
+
+        # `where` tests the values of the entries, like `filter`.
+        for _ in range(2):
+            grouped = source.cached(cache).where("amount", ">", 2).group_by(parity)
+            self.assertEqual({1: [1, 3]}, grouped.unwrap().all())
+
+        self.assertEqual((2, 2), cache.cache_info()[:2])
+
+    def test_generator_results_are_materialized(self) -> None:
+        cache = BoxCache()
+        source = MappingBox(frozendict({1: 1, 2: 2}))
+
+        self.assertEqual([[1], [2]], list(source.cached(cache).chunk(1)))
+        self.assertEqual([[1], [2]], list(source.cached(cache).chunk(1)))
+        self.assertEqual([[2], [4]], list(source.cached(cache).chunk(1).map(lambda chunk: [chunk[0] * 2])))
+        self.assertEqual(2, cache.cache_info().hits)
+
+    def test_proxy(self) -> None:
+        proxy = box({1: 2}).cached(BoxCache())
+
+        self.assertEqual(1, len(proxy))
+        self.assertEqual(2, proxy[1])
+        self.assertIn(1, proxy)
+        self.assertEqual([1], list(proxy))
+        self.assertEqual({1: 2}, proxy.all())
+
+    def test_lru_and_ttl(self) -> None:
+        cache = BoxCache(maxsize=2)
+        source = MappingBox(frozendict({1: 1, 2: 2}))
+
+        for keys in ((1,), (2,), (1, 2)):
+            source.cached(cache).only(keys)
+
+        # The least recently used result was evicted.
+        self.assertEqual(2, len(cache))
+        source.cached(cache).only((1,))
+        self.assertEqual(0, cache.cache_info().hits)
+
+        cache = BoxCache(ttl=0.01)
+        source.cached(cache).only((1,))
+        time.sleep(0.02)
+        source.cached(cache).only((1,))
+        self.assertEqual((0, 2), cache.cache_info()[:2])
+
+        with self.assertRaises(ValueError):
+            BoxCache(maxsize=0)
+
+    def test_mutable_source_is_invalidated(self) -> None:
+        cache = BoxCache()
+        source = MutableMappingBox({1: 1, 2: 2})
+        evens = source.cached(cache).filter(is_even)
+
+        self.assertEqual({2: 2}, evens.all())
+        self.assertEqual({2: 2}, source.cached(cache).filter(is_even).all())
+
+        source[4] = 4
+        self.assertEqual(0, len(cache))
+        self.assertEqual({2: 2, 4: 4}, source.cached(cache).filter(is_even).all())
+
+        # Proxies created before the change replay their chain on the changed source.
+        self.assertEqual({2: 2, 4: 4}, evens.all())
+        self.assertEqual([0], list(evens.group_by(parity).unwrap().keys()))
+
+    def test_uncacheable(self) -> None:
+        cache = BoxCache()
+        source = MappingBox(frozendict({1: 1, 2: 2}))
+
+        # Unhashable arguments bypass the cache.
+        self.assertEqual({1: 1}, source.cached(cache).only([1]).all())
+        self.assertEqual({1: 1}, source.cached(cache).only([1]).all())
+        self.assertEqual(CacheInfo(hits=0, misses=0, maxsize=128, currsize=0), cache.cache_info())
+
+        with self.assertRaises(TypeError):
+            box.view({1: 2}).cached(cache)
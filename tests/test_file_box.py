@@ -0,0 +1,94 @@
+import json
+import os
+import struct
+import tempfile
+import unittest
+
+from src.fluentbox import Box, FileBox, box
+
+
+class FileBoxTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def write(self, name: str, content: bytes) -> str:
+        path = os.path.join(self.directory.name, name)
+
+        with open(path, "wb") as file:
+            file.write(content)
+
+        return path
+
+    def test_lines(self) -> None:
+        path = self.write("lines.txt", b"foo\nbar\r\nbaz")
+
+        with box.from_file(path) as lines:
+            self.assertIsInstance(lines, FileBox)
+            self.assertEqual(3, len(lines))
+            self.assertEqual("bar", lines[1])
+            self.assertEqual("baz", lines[-1])
+            self.assertEqual(["foo", "bar", "baz"], list(lines))
+            self.assertEqual(["bar", "baz"], lines[1:])
+            self.assertEqual(["bar", "baz"], lines.filter(lambda line: line.startswith("b")).all())
+
+            with self.assertRaises(IndexError):
+                _ = lines[3]
+
+    def test_empty_file(self) -> None:
+        with box.from_file(self.write("empty.txt", b"")) as lines:
+            self.assertEqual(0, len(lines))
+            self.assertEqual(None, lines.first())
+
+    def test_jsonl(self) -> None:
+        rows = [{"id": i, "group": i % 2} for i in range(5)]
+        path = self.write("rows.jsonl", b"".join(json.dumps(row).encode() + b"\n" for row in rows))
+
+        with box.from_file(path, "jsonl") as records:
+            self.assertEqual(rows[3], records[3])
+            self.assertEqual([1, 3], records.where("group", "==", 1).pluck("id").all())
+            self.assertEqual(10, records.pluck("id").sum())
+            self.assertEqual(10, records.reduce(lambda total, row: total + row["id"], 0))
+
+            # Chunks are produced lazily.
+            chunks = records.chunk(2)
+            self.assertIsInstance(chunks, Box)
+            self.assertEqual([[0, 1], [2, 3], [4]], [[row["id"] for row in chunk] for chunk in chunks])
+
+    def test_csv(self) -> None:
+        path = self.write("rows.csv", b'id,name\n1,foo\n2,"bar, baz"\n')
+
+        with box.from_file(path, "csv") as records:
+            self.assertEqual(2, len(records))
+            self.assertEqual([{"id": "1", "name": "foo"}, {"id": "2", "name": "bar, baz"}], list(records))
+            self.assertEqual({"id": "2", "name": "bar, baz"}, records.first_where("id", "==", "2"))
+
+    def test_binary(self) -> None:
+        path = self.write("records.bin", b"".join(struct.pack("<id", i, i / 2) for i in range(4)))
+
+        with box.from_file(path, "binary", record_format="<id") as records:
+            self.assertEqual(4, len(records))
+            self.assertEqual((3, 1.5), records[3])
+            self.assertEqual((0, 0.0), records[-4])
+
+        with box.from_file(path, "binary", record_format="<id", fields=("id", "value")) as records:
+            self.assertEqual([1.0, 1.5], records.where("id", ">", 1).pluck("value").all())
+
+        with self.assertRaises(ValueError):
+            box.from_file(path, "binary", record_format="<5i")
+
+        with self.assertRaises(ValueError):
+            box.from_file(path, "binary")
+
+    def test_stream(self) -> None:
+        path = self.write("lines.txt", b"foo\nbar\nbaz\n")
+        lines = box.from_file(path, stream=True)
+
+        self.assertNotIsInstance(lines, FileBox)
+        self.assertEqual(["FOO", "BAR"], list(lines.map(str.upper).take(2)))
+
+    def test_unknown_format(self) -> None:
+        with self.assertRaises(ValueError):
+            box.from_file(self.write("lines.txt", b""), "xml")
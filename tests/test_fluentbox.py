@@ -1,9 +1,19 @@
+import array
+import collections
+import concurrent.futures
+import itertools
 import math
+import mmap
+import operator
+import os
+import tempfile
 import unittest
 from collections import abc
 from typing import Any, cast
 
-from src.fluentbox import MappingBox, SequenceBox, MutableMappingBox, MutableSetBox, Box
+from src.fluentbox import fluentbox
+from src.fluentbox.fluentbox import SizedBox
+from src.fluentbox import MappingBox, SequenceBox, MutableMappingBox, MutableSetBox, Box, LazyBox, ParallelBox, MutableSequenceBox, SequenceViewBox, box
 
 
 class BoxTest(unittest.TestCase):
@@ -53,6 +63,381 @@ class BoxTest(unittest.TestCase):
         # This is similar to first applying .key_by and then applying .map, but it is done in one pass.
         self.assertEqual({1: "foo", 2: "bar", 3: "baz"}, box.map_and_key_by(lambda item: (item["id"], item["name"])).all())
 
+    def test_generator_stays_lazy(self) -> None:
+        consumed = []
+
+        def generator() -> abc.Generator[int]:
+            for i in range(3):
+                consumed.append(i)
+                yield i
+
+        box = Box(generator()).map(lambda item: item * 2).filter()
+
+        # Chaining on a generator-backed Box does not exhaust the generator.
+        self.assertEqual([], consumed)
+        self.assertIsInstance(box.all(), abc.Iterator)
+        self.assertEqual([2, 4], list(box))
+
+
+    def test_chunk(self) -> None:
+        box = Box(item for item in range(5)).chunk(2)
+
+        # Chunks are filled one at a time and the trailing partial chunk is kept.
+        self.assertEqual([[0, 1], [2, 3], [4]], list(box))
+
+
+    def test_streaming_operators_do_not_materialize(self) -> None:
+        # An infinite generator can be processed, as long as the pipeline is bounded.
+        box = Box(itertools.count())
+
+        self.assertEqual([0, 1, 2], list(Box(itertools.count()).take(3)))
+        self.assertEqual([3, 4], list(box.skip(3).take(2)))
+        self.assertEqual([0, 1, 2], list(Box(itertools.count()).take_while(lambda item: item < 3)))
+        self.assertEqual([(0, 1, 2), (2, 3, 4)], list(Box(itertools.count()).sliding_window(3, step=2).take(2)))
+        self.assertEqual([0, 0, 1, 1], list(Box(itertools.count()).flat_map(lambda item: [item, item]).take(4)))
+        self.assertEqual([1, 5, 9], list(Box(itertools.count()).batched_map(lambda batch: [sum(batch)], 2).take(3)))
+        self.assertEqual([0, 1, 2], list(Box(itertools.count()).map(lambda item: item % 3).distinct(max_size=3).take(3)))
+
+    def test_sliding_window(self) -> None:
+        self.assertEqual([(1, 2), (2, 3), (3, 4)], SequenceBox([1, 2, 3, 4]).sliding_window(2).all())
+        self.assertEqual([(1, 2), (4, 5)], SequenceBox([1, 2, 3, 4, 5]).sliding_window(2, step=3).all())
+        self.assertEqual([], SequenceBox([1]).sliding_window(2).all())
+
+        with self.assertRaises(ValueError):
+            SequenceBox([1]).sliding_window(0)
+
+    def test_distinct(self) -> None:
+        self.assertEqual([3, 1, 2], SequenceBox([3, 1, 3, 2, 1]).distinct().all())
+
+        # With a bounded memory, duplicates are only removed if they were seen recently enough.
+        self.assertEqual([1, 2, 3, 1], SequenceBox([1, 2, 2, 3, 1]).distinct(max_size=2).all())
+
+    def test_batched_map(self) -> None:
+        batches = []
+
+        def callback(batch: list[int]) -> list[int]:
+            batches.append(batch)
+            return [item * 2 for item in batch]
+
+        self.assertEqual((2, 4, 6, 8, 10), SequenceBox((1, 2, 3, 4, 5)).batched_map(callback, 2).all())
+        self.assertEqual([[1, 2], [3, 4], [5]], batches)
+
+    def test_aggregate(self) -> None:
+        rows = [{"user": "a", "amount": 10}, {"user": "b", "amount": 5}, {"user": "a", "amount": 3}]
+
+        self.assertEqual(
+            {"count": 3, "total": 18, "largest": 10, "users": 2},
+            Box(iter(rows)).aggregate("count", total=("amount", "sum"), largest=("amount", "max"), users=("user", "distinct")).all()
+        )
+        self.assertEqual({"min": 1, "max": 100, "mean": 50.5, "median": 50.5, "p90": 90.1}, Box(range(1, 101)).aggregate("min", "max", "mean", "median", "p90").all())
+        self.assertEqual({"sum": None, "count": 0}, Box([]).aggregate("sum", "count").all())
+        self.assertEqual({"sum": 6}, Box(["a", "bb", "ccc"]).aggregate("sum", key=len).all())
+
+        with self.assertRaises(ValueError):
+            Box([1]).aggregate("unknown")
+
+    def test_aggregate_approximations(self) -> None:
+        self.assertAlmostEqual(100_000, Box(range(100_000)).aggregate("distinct").all()["distinct"], delta=5_000)
+        self.assertAlmostEqual(99_000, Box(range(100_000)).aggregate("p99").all()["p99"], delta=1_000)
+
+    def test_join(self) -> None:
+        orders = [{"id": 1, "customer": "a"}, {"id": 2, "customer": "b"}, {"id": 3, "customer": "a"}, {"id": 4, "customer": "z"}]
+        customers = [{"key": "a", "name": "Alice"}, {"key": "b", "name": "Bob"}, {"key": "c", "name": "Carol"}]
+
+        self.assertEqual(
+            [(1, "Alice"), (2, "Bob"), (3, "Alice")],
+            list(Box(iter(orders)).join(customers, "customer", "key", result=lambda order, customer: (order["id"], customer["name"])))
+        )
+
+        # The hash table is built on the smaller side; the pairs then follow the order of the larger side.
+        pairs = SequenceBox(customers[:2]).join(orders, "key", "customer").all()
+        self.assertEqual([(customers[0], orders[0]), (customers[1], orders[1]), (customers[0], orders[2])], pairs)
+
+        self.assertEqual([2, 1], SequenceBox([1, 2]).join([2, 1, 3], lambda item: item, result=lambda a, b: a).all())
+
+    def test_outer_joins(self) -> None:
+        orders = SequenceBox([{"id": 1, "customer": "a"}, {"id": 2, "customer": "b"}, {"id": 3, "customer": "z"}])
+        customers = [{"key": "a"}, {"key": "a"}, {"key": "b"}]
+
+        self.assertEqual([1, 1, 2, 3], orders.left_join(customers, "customer", "key", result=lambda order, _: order["id"]).all())
+        self.assertEqual([(orders[2], None)], orders.left_join(customers, "customer", "key").filter(lambda pair: pair[1] is None).all())
+        self.assertEqual([2, 1, 0], orders.group_join(customers, "customer", "key", result=lambda _, matches: len(matches)).all())
+        self.assertEqual([1, 2], orders.semi_join(customers, "customer", "key").pluck("id").all())
+        self.assertEqual([3], orders.anti_join(customers, "customer", "key").pluck("id").all())
+
+    def test_presorted_join(self) -> None:
+        left = SequenceBox([1, 2, 2, 4, 5])
+        right = [(1, "a"), (2, "b"), (2, "c"), (3, "d"), (5, "e")]
+
+        def right_key(item: tuple[int, str]) -> int:
+            return item[0]
+
+        for presorted in (False, True):
+            self.assertEqual(
+                [(1, "a"), (2, "b"), (2, "c"), (2, "b"), (2, "c"), (5, "e")],
+                left.join(right, lambda item: item, right_key, result=lambda _, item: item, presorted=presorted).all()
+            )
+            self.assertEqual([(4, [])], left.group_join(right, lambda item: item, right_key, presorted=presorted).filter(lambda pair: not pair[1]).all())
+            self.assertEqual([4], left.anti_join(iter(right), lambda item: item, right_key, presorted=presorted).all())
+
+    def test_sort_by(self) -> None:
+        rows = [{"name": "b", "age": 30}, {"name": "a", "age": 30}, {"name": "c", "age": 20}]
+
+        self.assertEqual([3, 2, 1], SequenceBox([3, 1, 2]).sort_by(descending=True).all())
+        self.assertEqual(("c", "b", "a"), SequenceBox(tuple(rows)).sort_by("age").pluck("name").all())
+        self.assertEqual(["a", "b", "c"], list(Box(iter(rows)).sort_by(lambda row: row["name"]).pluck("name")))
+        self.assertEqual(["c", "a", "b"], SequenceBox(rows).sort_by(["age", "name"]).pluck("name").all())
+        self.assertEqual(["a", "b", "c"], SequenceBox(rows).sort_by(["age", "name"], descending=[True, False]).pluck("name").all())
+
+        with self.assertRaises(ValueError):
+            SequenceBox(rows).sort_by(["age", "name"], descending=[True])
+
+    def test_top_k_min_by_max_by(self) -> None:
+        rows = [{"id": i, "score": i % 7} for i in range(20)]
+
+        self.assertEqual([9, 8, 7], SequenceBox(list(range(10))).top_k(3).all())
+        self.assertEqual([0, 1], list(Box(iter(range(10))).top_k(2, descending=False)))
+        self.assertEqual([6, 13], SequenceBox(rows).top_k(2, "score").pluck("id").all())
+        self.assertEqual({"id": 6, "score": 6}, Box(iter(rows)).max_by("score"))
+        self.assertEqual({"id": 0, "score": 0}, SequenceBox(rows).min_by(["score", "id"]))
+        self.assertIsNone(SequenceBox([]).max_by())
+
+    def test_unique_by(self) -> None:
+        rows = [{"id": 1, "tags": ["a"]}, {"id": 2, "tags": ["b"]}, {"id": 3, "tags": ["a"]}]
+
+        self.assertEqual([1, 2], SequenceBox(rows).unique_by("tags").pluck("id").all())
+        self.assertEqual(["a", "bb"], list(Box(iter(["a", "bb", "c"])).unique_by(len)))
+
+    def test_slots(self) -> None:
+        boxes = [
+            Box(iter([])), SequenceBox([1]), MutableSequenceBox([1]), SequenceViewBox(b"a"), MappingBox({}), MutableMappingBox({}),
+            MutableSetBox({1}), Box([1]).lazy(), Box([1]).parallel(), Box([1]).group_by(bool),
+        ]
+
+        for bx in boxes:
+            self.assertFalse(hasattr(bx, "__dict__"), type(bx))
+
+        # `MutableSetBox` implements the set interface on top of its items rather than extending `set`.
+        self.assertNotIsInstance(MutableSetBox({1}), set)
+        self.assertEqual({1, 2}, MutableSetBox({1}) | {2})
+
+    def test_group_by_aggregate(self) -> None:
+        rows = [{"user": "a", "amount": 10}, {"user": "b", "amount": 5}, {"user": "a", "amount": 3}]
+        grouped = Box(iter(rows)).group_by("user")
+
+        # The groups are built right away, so they can be aggregated repeatedly, even for a generator.
+        self.assertEqual({"a": {"count": 2, "sum": 13}, "b": {"count": 1, "sum": 5}}, grouped.aggregate("count", "sum", key="amount").all())
+        self.assertEqual({"a": {"count": 2}, "b": {"count": 1}}, grouped.aggregate("count").all())
+        self.assertEqual([rows[0], rows[2]], grouped["a"])
+
+        grouped = SequenceBox(rows).group_by("user")
+        self.assertEqual([rows[0], rows[2]], grouped["a"])
+        self.assertEqual({"a": {"mean": 6.5}, "b": {"mean": 5}}, grouped.aggregate(mean=("amount", "mean")).all())
+
+    def test_group_by_is_eager(self) -> None:
+        items = [1, 2, 3]
+        grouped = SequenceBox(items).group_by(lambda item: item % 2)
+        items.append(4)
+
+        self.assertEqual({1: [1, 3], 0: [2]}, grouped.all())
+
+        with self.assertRaises(KeyError):
+            SequenceBox([{"id": 1}]).group_by("name")
+
+    def test_aggregate_by(self) -> None:
+        rows = [{"user": "a", "amount": 10}, {"user": "b", "amount": 5}, {"user": "a", "amount": 3}]
+        expected = {"a": {"count": 2, "sum": 13}, "b": {"count": 1, "sum": 5}}
+
+        self.assertEqual(expected, Box(iter(rows)).aggregate_by("user", "count", "sum", key="amount").all())
+        self.assertEqual(expected, Box(rows).aggregate_by(lambda row: row["user"], "count", sum=("amount", "sum")).all())
+
+        with self.assertRaises(KeyError):
+            Box(rows).aggregate_by("name", "count")
+
+    def test_multi_level_group_by(self) -> None:
+        rows = [{"country": "NL", "city": "Utrecht", "amount": 1}, {"country": "NL", "city": "Delft", "amount": 2},
+                {"country": "BE", "city": "Gent", "amount": 3}, {"country": "NL", "city": "Utrecht", "amount": 4}]
+
+        grouped = SequenceBox(rows).group_by(["country", "city"])
+        self.assertEqual([("NL", "Utrecht"), ("NL", "Delft"), ("BE", "Gent")], list(grouped.keys()))
+        self.assertEqual([rows[0], rows[3]], grouped["NL", "Utrecht"])
+
+        nested = SequenceBox(rows).group_by(["country", lambda row: row["amount"] > 1], nested=True)
+        self.assertEqual({"NL": {False: [rows[0]], True: [rows[1], rows[3]]}, "BE": {True: [rows[2]]}}, nested.all())
+
+        # Aggregates are nested as well, whether or not the groups are built.
+        expected = {"NL": {"Utrecht": {"sum": 5}, "Delft": {"sum": 2}}, "BE": {"Gent": {"sum": 3}}}
+        self.assertEqual(expected, Box(iter(rows)).aggregate_by(["country", "city"], "sum", key="amount", nested=True).all())
+        grouped = SequenceBox(rows).group_by(["country", "city"], nested=True)
+        self.assertEqual(2, len(grouped["NL"]))
+        self.assertEqual(expected, grouped.aggregate("sum", key="amount").all())
+
+    def test_aggregate_by_spills_to_disk(self) -> None:
+        rows = [{"user": i % 50, "amount": i} for i in range(1000)]
+        expected = Box(rows).group_by("user").aggregate("count", "sum", "median", key="amount").all()
+
+        with tempfile.TemporaryDirectory() as directory:
+            aggregated = Box(iter(rows)).aggregate_by("user", "count", "sum", "median", key="amount", spill_threshold=4, spill_dir=directory)
+            self.assertEqual(expected, aggregated.all())
+            self.assertEqual([], os.listdir(directory))
+
+        # The groups that fit in memory come first, in order of first occurrence.
+        self.assertEqual([0, 1, 2, 3], list(Box(rows).aggregate_by("user", "count", spill_threshold=4).keys())[:4])
+
+        with self.assertRaises(ValueError):
+            Box(rows).aggregate_by("user", "count", spill_threshold=0)
+
+
+class LazyBoxTest(unittest.TestCase):
+    def test_chaining_is_deferred(self) -> None:
+        calls = []
+
+        def callback(item: int) -> int:
+            calls.append(item)
+            return item * 10
+
+        box = SequenceBox([1, 2, 3]).lazy().map(callback).filter(lambda item: item > 10)
+
+        # Nothing is executed until a terminal method is called.
+        self.assertIsInstance(box, LazyBox)
+        self.assertEqual([], calls)
+
+        self.assertEqual([20, 30], box.all())
+        self.assertEqual([1, 2, 3], calls)
+
+    def test_single_pass(self) -> None:
+        order = []
+
+        def first(item: int) -> int:
+            order.append(("first", item))
+            return item
+
+        def second(item: int) -> int:
+            order.append(("second", item))
+            return item
+
+        SequenceBox([1, 2]).lazy().map(first).map(second).all()
+
+        # Each item flows through the whole plan before the next item is processed.
+        self.assertEqual([("first", 1), ("second", 1), ("first", 2), ("second", 2)], order)
+
+    def test_collect_preserves_type(self) -> None:
+        self.assertEqual((2, 4), SequenceBox((1, 2)).lazy().map(lambda item: item * 2).all())
+
+        collected = SequenceBox([1, 2, 3]).lazy().filter(lambda item: item != 2).collect()
+        self.assertIsInstance(collected, SequenceBox)
+        self.assertEqual([1, 3], collected.all())
+
+        chunks = SequenceBox([1, 2, 3]).lazy().chunk(2).collect()
+        self.assertIsInstance(chunks, SequenceBox)
+        self.assertEqual([[1, 2], [3]], chunks.all())
+
+        # Iterators cannot be rebuilt, so their results are collected into a list.
+        self.assertEqual([[1, 2], [3]], LazyBox(iter([1, 2, 3])).chunk(2).collect().all())
+
+    def test_bool_does_not_lose_items(self) -> None:
+        box = LazyBox(item for item in [1, 2, 3]).map(lambda item: item * 2)
+
+        self.assertTrue(box)
+        self.assertEqual([2, 4, 6], list(box))
+        self.assertFalse(box)
+
+        box = Box(item for item in [1, 2, 3]).lazy().filter(lambda item: item > 1)
+
+        self.assertTrue(box)
+        self.assertEqual([2, 3], list(box))
+
+        box = Box(item for item in [1, 2]).lazy()
+
+        self.assertTrue(box)
+        self.assertEqual([1, 2], list(box))
+
+    def test_where_and_pluck(self) -> None:
+        box = SequenceBox([{"name": "X", "id": 1}, {"name": "Y", "id": 2}, {"name": "X", "id": 3}]).lazy()
+
+        self.assertEqual([1, 3], box.where("name", "==", "X").pluck("id").all())
+
+        # The original lazy Box is not affected by chaining on it.
+        self.assertEqual(3, len(box.all()))
+
+    def test_terminals(self) -> None:
+        box = SequenceBox([1, 2, 3, 4]).lazy().map(lambda item: item + 1)
+
+        self.assertEqual(2, box.first())
+        self.assertEqual(14, box.sum())
+        self.assertEqual(120, box.reduce(lambda x, y: x * y))
+        self.assertEqual({0: [2, 4], 1: [3, 5]}, box.group_by(lambda item: item % 2).all())
+        self.assertEqual([2, 3, 4, 5], list(box))
+        self.assertTrue(3 in box)
+        self.assertFalse(box.filter(lambda item: item > 5))
+
+
+class ParallelBoxTest(unittest.TestCase):
+    def test_map_preserves_order(self) -> None:
+        box = SequenceBox(list(range(100))).parallel(chunk_size=7)
+
+        self.assertIsInstance(box, ParallelBox)
+        self.assertEqual([item * 2 for item in range(100)], box.map(lambda item: item * 2).all())
+
+        # The container type of the original Box is preserved.
+        self.assertEqual((1, 4, 9), SequenceBox((1, 2, 3)).parallel(chunk_size=1).map(lambda item: item ** 2).all())
+
+    def test_filter_and_where(self) -> None:
+        box = SequenceBox(list(range(20))).parallel(chunk_size=3)
+
+        self.assertEqual([item for item in range(20) if item % 3 == 0], box.filter(lambda item: item % 3 == 0).all())
+        self.assertEqual(list(range(1, 20)), box.filter().all())
+
+        rows = SequenceBox([{"id": i} for i in range(10)]).parallel(chunk_size=4)
+        self.assertEqual([{"id": 8}, {"id": 9}], rows.where("id", ">", 7).all())
+
+    def test_flat_map(self) -> None:
+        box = SequenceBox(list(range(10))).parallel(chunk_size=3)
+
+        self.assertEqual([value for item in range(10) for value in (item, -item)], box.flat_map(lambda item: (item, -item)).all())
+        self.assertEqual([], SequenceBox([1, 2]).parallel().flat_map(lambda item: []).all())
+
+    def test_each(self) -> None:
+        seen = []
+        box = SequenceBox([1, 2, 3, 4, 5])
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+            box.parallel(executor=executor, chunk_size=2).each(seen.append)
+
+        self.assertEqual([1, 2, 3, 4, 5], sorted(seen))
+
+    def test_group_by_and_reduce(self) -> None:
+        box = SequenceBox(list(range(10))).parallel(chunk_size=3)
+
+        # Partial groups are merged in chunk order.
+        self.assertEqual({0: [0, 2, 4, 6, 8], 1: [1, 3, 5, 7, 9]}, box.group_by(lambda item: item % 2).all())
+        self.assertEqual({0: {"sum": 20}, 1: {"sum": 25}}, box.group_by(lambda item: item % 2).aggregate("sum").all())
+        self.assertEqual(45, box.sum())
+        self.assertEqual(55, box.reduce(lambda x, y: x + y, 10))
+        self.assertEqual(None, SequenceBox([]).parallel().sum())
+
+    def test_process_pool(self) -> None:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=2) as executor:
+            box = SequenceBox([1, -2, 3, -4]).parallel(executor=executor, chunk_size=2)
+
+            self.assertEqual([-1, 2, -3, 4], box.map(operator.neg).all())
+            self.assertEqual({1: [{"a": 1}, {"a": 1}]}, SequenceBox([{"a": 1}, {"a": 1}]).parallel(executor=executor).group_by("a").all())
+
+    def test_other_methods_chain(self) -> None:
+        box = SequenceBox([1, 2, 3, 4]).parallel(chunk_size=2)
+
+        # Methods that are not parallelized apply to the original `Box`, and return a `ParallelBox` again.
+        diff = box.diff([2])
+        self.assertIsInstance(diff, ParallelBox)
+        self.assertEqual([1, 3, 4], list(diff))
+        self.assertEqual([2, 3], list(box.skip(1).take(2)))
+        self.assertEqual([[1, 2], [3, 4]], list(box.chunk(2)))
+        self.assertEqual([2, 6, 8], box.diff([2]).map(lambda item: item * 2).all())
+
+    def test_invalid_chunk_size(self) -> None:
+        with self.assertRaises(ValueError):
+            SequenceBox([1]).parallel(chunk_size=0)
+
 
 class SequenceBoxTest(unittest.TestCase):
     def test_all(self) -> None:
@@ -107,6 +492,28 @@ class SequenceBoxTest(unittest.TestCase):
             self.assertEqual(expected, SequenceBox(first).diff(second).all())
             self.assertEqual(expected, SequenceBox(first).diff(SequenceBox(second)).all())
 
+        # .diff supports unhashable items and generators as the other iterable.
+        self.assertEqual([[1], 2], SequenceBox([[1], [2], 2, 3]).diff([[2], 3]).all())
+        self.assertEqual([1], SequenceBox([1, 2, 3]).diff(value for value in (2, 3)).all())
+
+    def test_diff_by(self) -> None:
+        box = SequenceBox([{"id": 1}, {"id": 2}, {"id": 3}])
+
+        self.assertEqual([{"id": 2}], box.diff_by([{"id": 1}, {"id": 3, "name": "foo"}], "id").all())
+        self.assertEqual([{"id": 1}], box.diff_by([{"id": 2}, {"id": 3}], lambda item: item["id"]).all())
+
+    def test_intersect(self) -> None:
+        self.assertEqual([2, 3], SequenceBox([1, 2, 3]).intersect([3, 2, 5]).all())
+        self.assertEqual((2,), SequenceBox((1, 2, [3])).intersect(SequenceBox([2, [4]])).all())
+        self.assertEqual([[3]], SequenceBox([1, [3]]).intersect([[3]]).all())
+
+    def test_union(self) -> None:
+        self.assertEqual([1, 2, 2, 3, 4], SequenceBox([1, 2, 2]).union([2, 3, 4]).all())
+        self.assertEqual(([1], 2, [3]), SequenceBox(([1], 2)).union(SequenceBox([[1], [3]])).all())
+
+        # Duplicates within the other iterable are only added once, hashable or not.
+        self.assertEqual([1, 2, [3]], SequenceBox([1]).union([2, 2, [3], [3]]).all())
+
     def test_each(self) -> None:
         for structure in ([2, 3, 1], (2, 3, 1)):
             result = []
@@ -238,6 +645,48 @@ class SequenceBoxTest(unittest.TestCase):
         # .sum works on strings.
         self.assertEqual("abc", SequenceBox(["a", "b", "c"]).sum())
 
+        # .sum works on generators and mixed numbers.
+        self.assertEqual(6.5, Box(iter([1, 2.5, 3])).sum())
+
+        # Compensated summation does not lose the small terms.
+        self.assertEqual(1.0, SequenceBox([1e100, 1.0, -1e100]).sum(compensated=True))
+        self.assertEqual(None, SequenceBox([]).sum(compensated=True))
+
+    def test_min_max_product(self) -> None:
+        for structure in ([3, 1, 2], (3, 1, 2), iter([3, 1, 2])):
+            self.assertEqual(1, Box(structure).min())
+
+        for structure in ([3, 1, 2], (3, 1, 2), iter([3, 1, 2])):
+            self.assertEqual(3, Box(structure).max())
+
+        self.assertEqual(None, SequenceBox([]).min())
+        self.assertEqual(None, SequenceBox([]).max())
+        self.assertEqual(24, SequenceBox([1, 2, 3, 4]).product())
+        self.assertEqual("aaa", SequenceBox(["a", 3]).product())
+        self.assertEqual(None, Box(iter([])).product())
+
+    def test_count_by(self) -> None:
+        records = [{"name": "X", "id": 1}, {"name": "Y", "id": 2}, {"name": "X", "id": 3}]
+
+        counts = SequenceBox(records).count_by("name")
+        self.assertIsInstance(counts, MutableMappingBox)
+        self.assertEqual({"X": 2, "Y": 1}, counts.all())
+        self.assertEqual({True: 1, False: 2}, SequenceBox(records).count_by(lambda item: item["id"] == 2).all())
+        self.assertEqual(["b", "a"], list(SequenceBox(["b", "a", "b"]).count_by().all()))
+
+    def test_mean_and_variance(self) -> None:
+        for structure in ([2, 4, 4, 4, 5, 5, 7, 9], iter([2, 4, 4, 4, 5, 5, 7, 9])):
+            self.assertEqual(5, Box(structure).mean())
+
+        self.assertEqual(None, SequenceBox([]).mean())
+        self.assertEqual(4, SequenceBox([2, 4, 4, 4, 5, 5, 7, 9]).variance(population=True))
+        self.assertAlmostEqual(32 / 7, SequenceBox([2, 4, 4, 4, 5, 5, 7, 9]).variance())
+        self.assertEqual(None, SequenceBox([1]).variance())
+        self.assertEqual(0, SequenceBox([1]).variance(population=True))
+
+        # The deviations are computed from a precise mean, so large offsets do not cause cancellation.
+        self.assertAlmostEqual(1.0, SequenceBox([1e9 + 1, 1e9 + 2, 1e9 + 3]).variance())
+
     def test_first_where(self) -> None:
         box = SequenceBox([{"name": "X", "id": 1}, {"name": "Y", "id": 2}, {"name": "X", "id": 3}])
 
@@ -297,6 +746,42 @@ class SequenceBoxTest(unittest.TestCase):
         # No operation defined should default to a truthy-check on objects' attributes as well.
         self.assertEqual(box.where("value").all(), [obj_3])
 
+    def test_where_membership_and_range(self) -> None:
+        box = SequenceBox([{"name": "X", "id": 1}, {"name": "Y", "id": 2}, {"name": "Z", "id": 3}])
+
+        self.assertEqual([1, 3], box.where("name", "in", ("X", "Z")).pluck("id").all())
+        self.assertEqual([2], box.where("name", "not in", {"X", "Z"}).pluck("id").all())
+
+        # .where with `between` is inclusive on both ends.
+        self.assertEqual([2, 3], box.where("id", "between", (2, 3)).pluck("id").all())
+
+        with self.assertRaises(ValueError):
+            box.where("id", "~", 2)
+
+    def test_where_multiple_conditions(self) -> None:
+        box = SequenceBox([{"name": "X", "id": 1}, {"name": "Y", "id": 2}, {"name": "X", "id": 3}])
+
+        # A list of conditions must all be satisfied.
+        self.assertEqual([{"name": "X", "id": 3}], box.where([("name", "==", "X"), ("id", ">", 1)]).all())
+        self.assertEqual({"name": "Y", "id": 2}, box.first_where([("id", ">=", 2), ("name", "!=", "X")]))
+
+        # A condition without an operation is a truthy check.
+        self.assertEqual([{"name": "Y", "id": 2}], box.where([("id", "<", 3), ("name", "==", "Y")]).all())
+
+    def test_where_mixed_item_types(self) -> None:
+        class Dummy:
+            def __init__(self, dummy_id: int):
+                self.id = dummy_id
+
+        obj = Dummy(2)
+        box = SequenceBox([{"id": 1}, obj, {"id": 3}])
+
+        # The key lookup is specialized per item type, so mixed items are still supported.
+        self.assertEqual([obj, {"id": 3}], box.where("id", ">", 1).all())
+
+        with self.assertRaises(ValueError):
+            SequenceBox([object()]).where("id").all()
+
     def test_zip(self) -> None:
         # .zip works on lists and tuples as expected.
         self.assertEqual([(1, 3), (2, 4)], SequenceBox([1, 2]).zip([3, 4]).all())
@@ -307,6 +792,82 @@ class SequenceBoxTest(unittest.TestCase):
         self.assertEqual(((1, 3), (2, 4)), SequenceBox((1, 2)).zip(SequenceBox((3, 4))).all())
 
 
+class SequenceBoxIndexTest(unittest.TestCase):
+    ROWS = [{"id": 3, "group": "a"}, {"id": 1, "group": "b"}, {"id": 2, "group": "a"}, {"id": 1, "group": "c"}]
+
+    def test_index_by(self) -> None:
+        box = SequenceBox(self.ROWS).index_by("id")
+
+        # Results keep the original order of the items.
+        self.assertEqual([self.ROWS[1], self.ROWS[3]], box.where("id", "==", 1).all())
+        self.assertEqual([], box.where("id", "=", 5).all())
+        self.assertEqual([self.ROWS[0], self.ROWS[2]], box.where("id", "in", [2, 3]).all())
+        self.assertEqual(self.ROWS[1], box.first_where("id", "=", 1))
+        self.assertEqual(None, box.first_where("id", "=", 5))
+
+        with self.assertRaises(IndexError):
+            box.first_where_or_fail("id", "=", 5)
+
+        # Conditions that the index cannot answer fall back to a scan.
+        self.assertEqual([self.ROWS[0]], box.where("id", ">", 2).all())
+
+        # Other conditions are applied to the candidates found through the index.
+        self.assertEqual([self.ROWS[3]], box.where([("group", "!=", "b"), ("id", "=", 1)]).all())
+
+    def test_index_matches_scan(self) -> None:
+        rows = self.ROWS + [{"id": 4, "group": "ab"}]
+        indexed, scanned = SequenceBox(rows).index_by("id").index_by("group"), SequenceBox(rows)
+
+        for key, operation, value in [
+            ("id", "in", [1, 1, 2]),
+            ("id", "in", [1, 1.0, True]),
+            ("id", "in", [[1], 3]),
+            ("id", "==", [1]),
+            ("id", "=", 1),
+            ("group", "in", "abc"),
+        ]:
+            with self.subTest(key=key, operation=operation, value=value):
+                self.assertEqual(scanned.where(key, operation, value).all(), indexed.where(key, operation, value).all())
+                self.assertEqual(scanned.first_where(key, operation, value), indexed.first_where(key, operation, value))
+
+    def test_sorted_index(self) -> None:
+        box = SequenceBox(self.ROWS).sorted_index("id")
+
+        self.assertEqual([self.ROWS[0], self.ROWS[2]], box.where("id", ">", 1).all())
+        self.assertEqual([self.ROWS[0], self.ROWS[2]], box.where("id", ">=", 2).all())
+        self.assertEqual([self.ROWS[1], self.ROWS[3]], box.where("id", "<", 2).all())
+        self.assertEqual([self.ROWS[1], self.ROWS[2], self.ROWS[3]], box.where("id", "<=", 2).all())
+        self.assertEqual([self.ROWS[0], self.ROWS[2]], box.where("id", "between", (2, 3)).all())
+        self.assertEqual([self.ROWS[1], self.ROWS[3]], box.where("id", "==", 1).all())
+        self.assertEqual(self.ROWS[0], box.first_where("id", ">", 1))
+        self.assertEqual(self.ROWS[1], box.first_where("id", "<", 3))
+
+    def test_indexes_are_dropped_on_mutation(self) -> None:
+        box = MutableSequenceBox(list(self.ROWS)).index_by("id").sorted_index("id")
+
+        box.append({"id": 1, "group": "d"})
+        self.assertEqual(["b", "c", "d"], box.where("id", "==", 1).pluck("group").all())
+
+        box.index_by("group")
+        box[0] = {"id": 4, "group": "b"}
+        self.assertEqual([4, 1], box.where("group", "==", "b").pluck("id").all())
+
+        box.index_by("id")
+        del box[0]
+        self.assertEqual([], box.where("id", "==", 4).all())
+
+        # Explicitly dropping indexes is possible as well, e.g. after modifying the underlying list directly.
+        box.index_by("id")
+        box.all().append({"id": 9, "group": "e"})
+        self.assertEqual([], box.where("id", "==", 9).all())
+        self.assertEqual(["e"], box.drop_indexes().where("id", "==", 9).pluck("group").all())
+
+    def test_box_dispatch(self) -> None:
+        # Lists are wrapped in a `SequenceBox` as well; a `MutableSequenceBox` is only created explicitly.
+        self.assertIs(SequenceBox, type(box([1, 2])))
+        self.assertIs(SequenceBox, type(box((1, 2))))
+
+
 class MappingBoxTest(unittest.TestCase):
 
     def test_getitem(self) -> None:
@@ -315,6 +876,14 @@ class MappingBoxTest(unittest.TestCase):
         with self.assertRaises(KeyError):
             _ = MappingBox({"foo": "bar"})["baz"]
 
+    def test_only(self) -> None:
+        box = MappingBox({"foo": 1, "bar": 2, "baz": 3})
+
+        self.assertEqual({"foo": 1, "baz": 3}, box.only(["foo", "baz", "qux"]).all())
+
+        # .only accepts a generator of keys, which is consumed only once.
+        self.assertEqual({"foo": 1, "bar": 2}, box.only(key for key in ("foo", "bar")).all())
+
 
 class MutableMappingBoxTest(unittest.TestCase):
 
@@ -331,6 +900,59 @@ class MutableMappingBoxTest(unittest.TestCase):
 
         self.assertEqual(0, len(box))
 
+    def test_live_filter(self) -> None:
+        box = MutableMappingBox({"a": 1, "b": 0, "c": 3})
+        odd = box.live_filter(lambda key, value: value % 2)
+        truthy = box.live_filter()
+
+        self.assertEqual({"a": 1, "c": 3}, odd.all())
+        self.assertEqual({"a": 1, "c": 3}, truthy.all())
+
+        box["b"] = 5
+        box["c"] = 4
+        del box["a"]
+        box.update({"d": 7})
+
+        self.assertEqual({"b": 5, "d": 7}, odd.all())
+        self.assertEqual({"b": 5, "c": 4, "d": 7}, truthy.all())
+        self.assertEqual({"b": 5, "c": 4, "d": 7}, box.filter().all())
+
+        # Boxes created from a live view are snapshots.
+        snapshot = odd.filter(lambda key, value: value > 5)
+        box["e"] = 9
+        self.assertEqual({"d": 7}, snapshot.all())
+        self.assertEqual({"b": 5, "d": 7, "e": 9}, odd.all())
+
+    def test_live_group_by_and_sum(self) -> None:
+        box = MutableMappingBox({1: {"team": "x", "score": 3}, 2: {"team": "y", "score": 4}})
+        teams = box.live_group_by("team")
+        total = box.live_sum("score")
+
+        self.assertEqual({"x": {1: box[1]}, "y": {2: box[2]}}, teams.all())
+        self.assertEqual(7, total.value)
+
+        box[3] = {"team": "x", "score": 10}
+        box[2] = {"team": "x", "score": 1}
+
+        self.assertEqual(["x"], list(teams))
+        self.assertEqual([1, 3, 2], list(teams["x"]))
+        self.assertEqual(14, total.value)
+
+        box.clear()
+        self.assertEqual({}, teams.all())
+        self.assertIsNone(total.value)
+
+    def test_live_views_are_released(self) -> None:
+        box = MutableMappingBox({"a": 1})
+        view = box.live_sum()
+
+        self.assertEqual(1, len(box._observers))
+
+        del view
+        box["b"] = 2
+
+        self.assertEqual(0, len(box._observers))
+
 
 class MutableSetBoxTest(unittest.TestCase):
 
@@ -352,3 +974,109 @@ class MutableSetBoxTest(unittest.TestCase):
         self.assertEqual(2, len(box))
         self.assertTrue(1 in box)
         self.assertTrue(3 in box)
+
+
+class BoxFactoryTest(unittest.TestCase):
+    def test_copy(self) -> None:
+        items = [1, 2, 3]
+
+        # By default, box() copies its input.
+        copied = box(items)
+        copied.all().append(4)
+        self.assertEqual([1, 2, 3], items)
+
+        # Without copying, the container is wrapped directly and the two alias each other.
+        wrapped = box(items, copy=False)
+        self.assertIs(items, wrapped.all())
+        wrapped.all().append(4)
+        self.assertEqual([1, 2, 3, 4], items)
+
+        # Methods producing a new Box do not alias the original container.
+        self.assertIsNot(items, wrapped.map(lambda item: item).all())
+
+        mapping, values = {"foo": 1}, {1, 2}
+        self.assertIs(mapping, box(mapping, copy=False).all())
+        self.assertIs(values, box(values, copy=False).all())
+        self.assertIs(mapping, box(MappingBox(mapping).all(), copy=False).all())
+
+        numbers = (1, 2)
+        self.assertIs(numbers, box(numbers, copy=False).all())
+
+        # Sequences that cannot be constructed from an iterable are wrapped in a view Box.
+        wrapped_range = box(range(5), copy=False)
+        self.assertIsInstance(wrapped_range, SequenceViewBox)
+        self.assertEqual([0, 2, 4], wrapped_range.filter(lambda item: item % 2 == 0).all())
+
+    def test_register(self) -> None:
+        class Deque(collections.deque):
+            pass
+
+        # Deques are mutable sequences, but cannot be indexed efficiently; wrap them as plain iterables instead.
+        self.assertIs(SequenceBox, type(box(Deque([1]))))
+        box.register(collections.deque, lambda items, copy: SizedBox(list(items) if copy else items))
+
+        try:
+            self.assertNotIsInstance(box(Deque([1])), SequenceBox)
+            self.assertEqual([1], box(Deque([1])).all())
+            self.assertIs(SizedBox, type(box(collections.deque([1]), copy=False)))
+
+        finally:
+            del fluentbox._BOX_FACTORIES[collections.deque]
+            fluentbox._DISPATCH_CACHE.clear()
+
+        self.assertIs(SequenceBox, type(box(Deque([1]))))
+
+    def test_dispatch(self) -> None:
+        self.assertEqual([1], box(1).all())
+        self.assertIsInstance(box(frozenset([1])), SizedBox)
+        self.assertIsInstance(box(range(3)), SequenceBox)
+
+        with self.assertRaises(TypeError):
+            box(item for item in [1])
+
+    def test_view_on_buffers(self) -> None:
+        numbers = array.array("d", [1.0, 2.0, 3.0])
+        view = box.view(numbers)
+
+        self.assertIsInstance(view, SequenceViewBox)
+        self.assertEqual(6.0, view.sum())
+        self.assertEqual([2.0, 3.0], view.filter(lambda item: item > 1).all())
+
+        # The view aliases the underlying buffer, and cannot be written to.
+        numbers[0] = 5.0
+        self.assertEqual(5.0, view[0])
+
+        with self.assertRaises(TypeError):
+            view.all()[0] = 1.0  # type: ignore
+
+        # Chunks of a view are views themselves.
+        chunks = view.chunk(2).all()
+        self.assertIsInstance(chunks[0], memoryview)
+        self.assertEqual([[5.0, 2.0], [3.0]], [chunk.tolist() for chunk in chunks])
+
+    def test_view_on_mmap(self) -> None:
+        with mmap.mmap(-1, 4) as memory:
+            memory.write(b"\x01\x02\x03\x04")
+            view = box.view(memory)
+
+            self.assertEqual(4, len(view))
+            self.assertEqual(10, view.sum())
+            self.assertEqual([3, 4], view.filter(lambda item: item > 2).all())
+
+            view.all().release()
+
+    def test_view_on_mappings_and_sequences(self) -> None:
+        mapping = {"foo": 1}
+        view = box.view(mapping)
+
+        self.assertIsInstance(view, MappingBox)
+        mapping["bar"] = 2
+        self.assertEqual(2, view["bar"])
+
+        with self.assertRaises(TypeError):
+            view.all()["baz"] = 3  # type: ignore
+
+        self.assertEqual([2, 4], box.view(range(1, 3)).map(lambda item: item * 2).all())
+
+        with self.assertRaises(TypeError):
+            box.view({1, 2})
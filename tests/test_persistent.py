@@ -0,0 +1,141 @@
+import pickle
+import random
+import unittest
+
+from frozendict import frozendict
+
+from src.fluentbox import BoxCache, MappingBox, PersistentMap, PersistentMappingBox, box
+
+
+class _Colliding:
+    """A key of which the hash only has few distinct values, so that keys collide in the trie."""
+
+    def __init__(self, value: int):
+        self.value = value
+
+    def __hash__(self) -> int:
+        return self.value % 3
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _Colliding) and other.value == self.value
+
+    def __repr__(self) -> str:
+        return f"_Colliding({self.value})"
+
+
+class PersistentMapTest(unittest.TestCase):
+    def test_mapping(self):
+        mapping = PersistentMap({"a": 1, "b": 2})
+        self.assertEqual(2, len(mapping))
+        self.assertEqual(1, mapping["a"])
+        self.assertIn("b", mapping)
+        self.assertNotIn("c", mapping)
+        self.assertIsNone(mapping.get("c"))
+        self.assertEqual({"a": 1, "b": 2}, dict(mapping))
+        self.assertEqual({("a", 1), ("b", 2)}, set(mapping.items()))
+        self.assertEqual([1, 2], sorted(mapping.values()))
+        self.assertEqual(PersistentMap([("b", 2), ("a", 1)]), mapping)
+        self.assertEqual({"a": 1, "b": 2}, mapping)
+        self.assertEqual(hash(PersistentMap({"b": 2, "a": 1})), hash(mapping))
+
+        with self.assertRaises(KeyError):
+            _ = mapping["c"]
+
+    def test_derived_maps_share_structure(self):
+        base = PersistentMap({i: i for i in range(10000)})
+        derived = base.set(5, -5)
+
+        self.assertEqual(5, base[5])
+        self.assertEqual(-5, derived[5])
+        self.assertEqual(len(base), len(derived))
+        self.assertIs(base, base.set(5, 5))
+        self.assertIs(base, base.without(-1))
+
+        # Only the path to the changed key is copied; all other children of the root are shared.
+        children = zip(base._root.nodes, derived._root.nodes)
+        self.assertEqual(len(base._root.nodes) - 1, sum(child is derived_child for child, derived_child in children))
+
+        smaller = base.without(1, 2, 3)
+        self.assertEqual(9997, len(smaller))
+        self.assertNotIn(2, smaller)
+
+        updated = base.update({1: "a", -1: "b"}, c=3)
+        self.assertEqual(10002, len(updated))
+        self.assertEqual(("a", "b", 3), (updated[1], updated[-1], updated["c"]))
+
+    def test_matches_dict(self):
+        rng = random.Random(0)
+        expected: dict = {}
+        mapping = PersistentMap()
+
+        for _ in range(3000):
+            key = rng.choice([rng.randrange(200), _Colliding(rng.randrange(30)), str(rng.randrange(50))])
+
+            if rng.random() < 0.6:
+                expected[key] = value = rng.random()
+                mapping = mapping.set(key, value)
+
+            else:
+                expected.pop(key, None)
+                mapping = mapping.without(key)
+
+            self.assertEqual(len(expected), len(mapping))
+
+        self.assertEqual(expected, dict(mapping))
+        self.assertEqual(expected, dict(PersistentMap(expected)))
+
+        for key in list(expected):
+            mapping = mapping.without(key)
+
+        self.assertEqual(0, len(mapping))
+        self.assertEqual([], list(mapping))
+
+    def test_pickle(self):
+        mapping = PersistentMap({"a": 1, _Colliding(1): 2, _Colliding(4): 3})
+        self.assertEqual(mapping, pickle.loads(pickle.dumps(mapping)))
+
+
+class PersistentMappingBoxTest(unittest.TestCase):
+    def test_box(self):
+        persistent = box({"a": 1, "b": 0}).persistent()
+        self.assertIsInstance(persistent, PersistentMappingBox)
+        self.assertIs(persistent, persistent.persistent())
+        self.assertIsInstance(box(PersistentMap({"a": 1})), PersistentMappingBox)
+        self.assertIsInstance(box({"a": 1}, copy=False).persistent(), PersistentMappingBox)
+
+        derived = persistent.set("c", 2)
+        self.assertEqual({"a": 1, "b": 0}, dict(persistent))
+        self.assertEqual({"a": 1, "b": 0, "c": 2}, dict(derived))
+        self.assertEqual({"b": 0}, dict(derived.without("a", "c")))
+        self.assertEqual({"a": 3, "b": 0, "d": 4}, dict(persistent.update({"a": 3}, d=4)))
+
+    def test_filter_and_only(self):
+        persistent = PersistentMappingBox({i: i for i in range(100)})
+
+        for callback, expected in [
+            (lambda key, value: value != 5, 99),
+            (lambda key, value: value < 5, 5),
+            (None, 99),
+        ]:
+            with self.subTest(expected=expected):
+                filtered = persistent.filter(callback)
+                self.assertIsInstance(filtered, PersistentMappingBox)
+                self.assertEqual(expected, len(filtered))
+
+        only = persistent.only([1, 2, 200])
+        self.assertIsInstance(only, PersistentMappingBox)
+        self.assertEqual({1: 1, 2: 2}, dict(only))
+
+        self.assertEqual({0: 0, 1: 2}, dict(persistent.map_and_key_by(lambda key: (key % 2, key % 2 * 2))))
+
+    def test_pickle_and_cache(self):
+        persistent = PersistentMappingBox({"a": 1, "b": 2})
+        copy = pickle.loads(pickle.dumps(persistent))
+        self.assertIsInstance(copy, PersistentMappingBox)
+        self.assertEqual(dict(persistent), dict(copy))
+
+        cache = BoxCache()
+        first = persistent.cached(cache).only(("a",))
+        self.assertIsInstance(first.unwrap(), PersistentMappingBox)
+        self.assertIs(first.unwrap(), PersistentMappingBox({"b": 2, "a": 1}).cached(cache).only(("a",)).unwrap())
+        self.assertNotIsInstance(MappingBox(frozendict(a=1, b=2)).cached(cache).only(("a",)).unwrap(), PersistentMappingBox)
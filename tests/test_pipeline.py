@@ -0,0 +1,81 @@
+import unittest
+
+from src.fluentbox import ArrayBox, Box, GroupedBox, LazyBox, MutableMappingBox, Pipeline, SequenceBox, box, pipeline
+
+try:
+    import numpy as np
+
+except ImportError:  # pragma: no cover
+    np = None
+
+
+class PipelineTest(unittest.TestCase):
+    records = [{"id": i, "group": i % 3, "value": i * 10} for i in range(10)]
+
+    def test_same_result_as_chain(self):
+        chain = pipeline().where("group", "==", 1).map(lambda item: {**item, "value": item["value"] + 1}).pluck("value")
+
+        self.assertIsInstance(chain, Pipeline)
+
+        for items in (self.records, tuple(self.records), iter(self.records), box(self.records)):
+            with self.subTest(items=type(items)):
+                result = chain(items)
+                self.assertEqual([11, 41, 71], list(result))
+
+        self.assertEqual(type(SequenceBox(tuple(self.records)).where("group", "==", 1)), type(chain(tuple(self.records))))
+        self.assertEqual((11, 41, 71), chain(tuple(self.records)).all())
+
+    def test_terminal_operations(self):
+        totals = pipeline().where("value", ">=", 50).group_by("group").aggregate(total=("value", "sum"))
+
+        self.assertEqual({2: {"total": 130}, 0: {"total": 150}, 1: {"total": 70}}, dict(totals(self.records)))
+        self.assertEqual(450, pipeline().pluck("value").sum()(self.records))
+        self.assertIsInstance(pipeline().group_by("group")(self.records), GroupedBox)
+
+    def test_keyword_arguments_and_streaming_operations(self):
+        chain = pipeline().skip(1).take(5).filter(callback=lambda item: item["id"] % 2).pluck(key="missing", default=0)
+        self.assertEqual([0, 0, 0], chain(self.records).all())
+
+        flattened = pipeline().flat_map(lambda item: (item, -item)).take_while(lambda item: item != -2)
+        self.assertEqual([1, -1, 2], flattened([1, 2, 3]).all())
+
+        self.assertEqual([1, 2], pipeline().where([("id", ">", 0), ("id", "<", 3)]).pluck("id")(self.records).all())
+
+    def test_reuse(self):
+        chain = pipeline().where("group", "==", 0).pluck("id")
+        longer = chain.map(lambda value: value * 2)
+
+        for _ in range(3):
+            self.assertEqual([0, 3, 6, 9], chain(self.records).all())
+            self.assertEqual([0, 6, 12, 18], longer(self.records).all())
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_array_box(self):
+        self.assertEqual([3.0, 4.0], pipeline().where(None, ">", 1).map(lambda values: values + 1, vectorize=True)(ArrayBox([1.0, 2.0, 3.0])).all().tolist())
+
+    def test_boxes_with_own_implementations(self):
+        indexed = box(self.records).index_by("group")
+        self.assertEqual([1, 4, 7], pipeline().where("group", "==", 1).pluck("id")(indexed).all())
+
+        lazy = pipeline().filter().map(abs)(LazyBox([0, -1, 2]))
+        self.assertIsInstance(lazy, LazyBox)
+        self.assertEqual([1, 2], list(lazy.all()))
+
+        self.assertIsInstance(pipeline().map_and_key_by(lambda item: (item, item))([1]), MutableMappingBox)
+
+        # `MappingBox.where` tests the values of the entries, so it is not fused.
+        mapping = box({record["id"]: record for record in self.records})
+        where = pipeline().where("group", "==", 1)(mapping)
+        self.assertIsInstance(where, MutableMappingBox)
+        self.assertEqual([1, 4, 7], list(where))
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            pipeline().where("id", "~", 1)(self.records)
+
+        with self.assertRaises(AttributeError):
+            pipeline().not_a_method()(self.records)
+
+    def test_repr(self):
+        self.assertEqual("pipeline().where('id', '>', 1).take(2)", repr(pipeline().where("id", ">", 1).take(2)))
+        self.assertIs(Box, type(pipeline()(Box(iter([])))))
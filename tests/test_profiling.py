@@ -0,0 +1,90 @@
+import threading
+import unittest
+
+from src.fluentbox import Box, Profile, ProfileEvent, SequenceBox, box, profile
+
+
+class ProfileTest(unittest.TestCase):
+    def test_records_calls(self):
+        records = box([{"group": i % 3, "value": i} for i in range(30)])
+
+        with profile() as p:
+            records.where("group", "==", 1).pluck("value")
+            records.where("group", "==", 2)
+
+        where = p.stats["SequenceBox.where"]
+        self.assertEqual(2, where.calls)
+        self.assertEqual(60, where.items_in)
+        self.assertEqual(20, where.items_out)
+        self.assertGreater(where.seconds, 0)
+        self.assertEqual(1, p.stats["SequenceBox.pluck"].calls)
+        self.assertIn("SequenceBox.where", p.report())
+
+    def test_instrumentation_is_removed(self):
+        original = SequenceBox.where
+
+        with profile():
+            self.assertIsNot(original, SequenceBox.where)
+
+        self.assertIs(original, SequenceBox.where)
+
+        with profile() as p:
+            pass
+
+        box([1]).map(abs)
+        self.assertEqual({}, p.stats)
+
+    def test_nested_profiles(self):
+        original = Box.map
+
+        with profile() as outer:
+            box([1]).map(abs)
+
+            with profile() as inner:
+                box([1]).map(abs)
+
+            self.assertIsNot(original, Box.map)
+
+        self.assertIs(original, Box.map)
+        self.assertEqual(2, outer.stats["SequenceBox.map"].calls)
+        self.assertEqual(1, inner.stats["SequenceBox.map"].calls)
+
+    def test_super_calls_are_recorded_once(self):
+        with profile() as p:
+            box([1, 2, 3]).filter()
+
+        self.assertEqual(["SequenceBox.filter"], list(p.stats))
+
+    def test_sinks(self):
+        events = []
+
+        with profile(events.append):
+            box({"a": 1, "b": 2}).only(["a"])
+
+        # `only` is implemented with `filter`, which is recorded as well; events are passed on when a call returns.
+        self.assertEqual(["filter", "only"], [event.method for event in events])
+        self.assertEqual(ProfileEvent("MutableMappingBox", "only", 2, 1, events[1].seconds, None), events[1])
+
+    def test_uncountable_items(self):
+        events = []
+
+        with Profile(events.append):
+            Box(iter([1, 2])).map(abs)
+            box([1, 2]).lazy()
+
+        self.assertEqual((None, None), events[0][2:4])
+        self.assertEqual((2, None), events[1][2:4])
+
+    def test_memory(self):
+        with profile(memory=True) as p:
+            box(range(10)).map(lambda item: [item] * 100)
+
+        self.assertGreater(p.stats["SequenceBox.map"].allocated, 0)
+
+    def test_threads(self):
+        with profile() as p:
+            thread = threading.Thread(target=lambda: box([1]).map(abs))
+            thread.start()
+            thread.join()
+
+        self.assertEqual(1, p.stats["SequenceBox.map"].calls)
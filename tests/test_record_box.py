@@ -0,0 +1,117 @@
+import array
+import unittest
+
+from src.fluentbox import MutableMappingBox, RecordBox, SequenceBox, box
+
+ROWS = [
+    {"id": 1, "name": "foo", "group": "a"},
+    {"id": 2, "name": "bar", "group": "b"},
+    {"id": 3, "name": "baz", "group": "a"},
+]
+
+
+class RecordBoxTest(unittest.TestCase):
+    def test_box_dispatch(self) -> None:
+        self.assertIsInstance(box(ROWS, columnar=True), RecordBox)
+        self.assertNotIsInstance(box(ROWS), RecordBox)
+
+        # Heterogeneous rows cannot be stored in columns.
+        self.assertNotIsInstance(box([{"id": 1}, {"name": "foo"}], columnar=True), RecordBox)
+
+    def test_from_rows(self) -> None:
+        records = RecordBox.from_rows(ROWS)
+
+        self.assertEqual(("id", "name", "group"), records.fields)
+        self.assertEqual([1, 2, 3], records.columns["id"])
+        self.assertEqual(3, len(records))
+        self.assertEqual(ROWS, records.to_rows())
+        self.assertEqual(ROWS[1], records[1])
+        self.assertEqual(ROWS, list(records))
+
+        with self.assertRaises(ValueError):
+            RecordBox.from_rows([{"id": 1}, {"name": "foo"}])
+
+        with self.assertRaises(ValueError):
+            RecordBox({"id": [1, 2], "name": ["foo"]})
+
+    def test_from_objects(self) -> None:
+        class Row:
+            def __init__(self, row_id: int):
+                self.id = row_id
+
+        self.assertEqual([1, 2], RecordBox.from_rows([Row(1), Row(2)]).pluck("id").all())
+
+    def test_typecodes(self) -> None:
+        records = RecordBox.from_rows(ROWS, typecodes={"id": "q"})
+
+        self.assertIsInstance(records.columns["id"], array.array)
+        self.assertIsInstance(records.where("id", ">", 1).columns["id"], array.array)
+
+    def test_pluck(self) -> None:
+        records = RecordBox.from_rows(ROWS)
+
+        # The column is returned without being copied.
+        self.assertIs(records.columns["name"], records.pluck("name").all())
+        self.assertEqual([None, None, None], records.pluck("missing").all())
+        self.assertEqual([0, 0, 0], records.pluck("missing", default=0).all())
+
+        with self.assertRaises(KeyError):
+            records.pluck("missing", raise_on_error=True)
+
+    def test_where(self) -> None:
+        records = RecordBox.from_rows(ROWS)
+
+        result = records.where("group", "==", "a")
+        self.assertIsInstance(result, RecordBox)
+        self.assertEqual([ROWS[0], ROWS[2]], result.to_rows())
+
+        self.assertEqual([ROWS[2]], records.where([("group", "==", "a"), ("id", ">", 1)]).to_rows())
+        self.assertEqual([ROWS[1]], records.where("id", "between", (2, 2)).to_rows())
+        self.assertEqual(ROWS[2], records.first_where("name", "==", "baz"))
+
+        # Unknown fields behave like in a regular SequenceBox.
+        with self.assertRaises(KeyError):
+            records.where("missing", "==", 1)
+
+        with self.assertRaises(ValueError):
+            records.where("id", "~", 1)
+
+    def test_group_by_and_key_by(self) -> None:
+        records = RecordBox.from_rows(ROWS)
+        groups = records.group_by("group")
+
+        self.assertIsInstance(groups, MutableMappingBox)
+        self.assertIsInstance(groups["a"], RecordBox)
+        self.assertEqual({"a": [ROWS[0], ROWS[2]], "b": [ROWS[1]]}, {key: group.to_rows() for key, group in groups.items()})
+        self.assertEqual({"a": {"count": 2}, "b": {"count": 1}}, groups.aggregate("count").all())
+
+        # Callbacks are applied to the rows.
+        self.assertEqual({True: [ROWS[0], ROWS[2]], False: [ROWS[1]]}, records.group_by(lambda row: row["id"] % 2 == 1).all())
+
+        self.assertEqual({1: ROWS[0], 2: ROWS[1], 3: ROWS[2]}, records.key_by("id").all())
+
+    def test_sort_by(self) -> None:
+        records = RecordBox.from_rows(ROWS, typecodes={"id": "q"})
+
+        by_name = records.sort_by("name")
+        self.assertIsInstance(by_name, RecordBox)
+        self.assertEqual([2, 3, 1], list(by_name.pluck("id")))
+        self.assertEqual([3, 1, 2], list(records.sort_by(["group", "id"], descending=[False, True]).pluck("id")))
+
+        # Callbacks are applied to the rows.
+        self.assertEqual([3, 2, 1], list(records.sort_by(lambda row: -row["id"]).pluck("id")))
+
+    def test_row_operations(self) -> None:
+        records = RecordBox.from_rows(ROWS)
+
+        # Row-wise operations that produce homogeneous rows keep the columnar layout.
+        mapped = records.map(lambda row: {"id": row["id"] * 10})
+        self.assertIsInstance(mapped, RecordBox)
+        self.assertEqual([10, 20, 30], mapped.pluck("id").all())
+
+        self.assertIsInstance(records.map(lambda row: row["id"]), SequenceBox)
+        self.assertEqual([1, 2, 3], records.map(lambda row: row["id"]).all())
+
+        chunks = records.chunk(2)
+        self.assertEqual([2, 1], [len(chunk) for chunk in chunks])
+        self.assertIsInstance(chunks[0], RecordBox)
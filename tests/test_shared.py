@@ -0,0 +1,146 @@
+import array
+import concurrent.futures
+import pickle
+import unittest
+
+from frozendict import frozendict
+
+from src.fluentbox import (
+    ArrayBox, GroupedBox, LazyBox, MutableMappingBox, ParallelBox, RecordBox, SequenceBox, SharedMemoryBox,
+    SharedMemoryHandle, box
+)
+
+try:
+    import numpy as np
+
+except ImportError:  # pragma: no cover
+    np = None
+
+
+def _shared_sum(handle: SharedMemoryHandle) -> float:
+    with box.from_shared_memory(handle) as numbers:
+        return numbers.sum()
+
+
+class PickleTest(unittest.TestCase):
+    def _round_trip(self, obj):
+        return pickle.loads(pickle.dumps(obj))
+
+    def test_boxes(self):
+        for original in [
+            SequenceBox([1, 2, 3]),
+            box([1, 2, 3]),
+            box({"a": 1}),
+            box(frozendict(a=1), copy=False),
+            box({1, 2}),
+        ]:
+            with self.subTest(original=original):
+                copy = self._round_trip(original)
+                self.assertIs(type(copy), type(original))
+                self.assertEqual(list(copy), list(original))
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_array_box(self):
+        copy = self._round_trip(ArrayBox([1.0, 2.0]))
+        self.assertIs(ArrayBox, type(copy))
+        self.assertEqual([1.0, 2.0], list(copy))
+
+    def test_payload_only(self):
+        sequence = box([{"a": 1}, {"a": 2}]).index_by("a")
+        self.assertFalse(getattr(self._round_trip(sequence), "_indexes", None))
+
+        mapping = box({"a": 1})
+        mapping.live_sum()
+        self.assertIsNone(self._round_trip(mapping)._observers)
+
+    def test_lazy_and_parallel(self):
+        lazy = self._round_trip(LazyBox([1, 2, 3]).map(abs))
+        self.assertEqual([1, 2, 3], list(lazy.all()))
+
+        parallel = self._round_trip(box([1, -2, 3]).parallel(chunk_size=2))
+        self.assertIsInstance(parallel, ParallelBox)
+        self.assertEqual([1, 2, 3], list(parallel.map(abs).all()))
+
+    def test_grouped_and_live_views(self):
+        grouped = self._round_trip(box([1, 2, 3, 4]).group_by(lambda item: item % 2))
+        self.assertIsInstance(grouped, GroupedBox)
+        self.assertEqual({1: [1, 3], 0: [2, 4]}, dict(grouped))
+        self.assertEqual({1: {"count": 2}, 0: {"count": 2}}, dict(grouped.aggregate("count")))
+
+        source = box({"a": 1, "b": 0})
+        view = self._round_trip(source.live_filter())
+        self.assertIs(type(view), MutableMappingBox)
+        self.assertEqual({"a": 1}, dict(view))
+
+        groups = self._round_trip(source.live_group_by(lambda value: value > 0))
+        self.assertEqual({True: {"a": 1}, False: {"b": 0}}, dict(groups))
+
+    def test_record_box(self):
+        records = RecordBox.from_rows([{"a": 1}, {"a": 2}], typecodes={"a": "q"})
+        copy = self._round_trip(records)
+        self.assertIsInstance(copy, RecordBox)
+        self.assertEqual(records.to_rows(), copy.to_rows())
+
+
+class SharedMemoryTest(unittest.TestCase):
+    def test_round_trip(self):
+        for items, expected_format in [
+            ([1, 2, 3], "q"),
+            ([1, 2.5], "d"),
+            ([True, False], "?"),
+            (b"ab", "B"),
+            (array.array("i", [4, 5]), "i"),
+            ([], "?"),
+        ]:
+            with self.subTest(items=items), box(items, copy=False).to_shared_memory() as handle:
+                self.assertEqual(expected_format, handle.format)
+
+                with box.from_shared_memory(pickle.loads(pickle.dumps(handle))) as shared:
+                    self.assertIsInstance(shared, SharedMemoryBox)
+                    self.assertEqual(list(items), list(shared))
+                    self.assertEqual(len(items), len(shared))
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_arrays(self):
+        for items, expected_format in [
+            (np.array([1.5, 2.5], dtype=np.float32), "f"),
+            (np.arange(5)[::-1], np.arange(5).dtype.char),
+            (np.arange(10, dtype=np.int32)[::3], "i"),
+        ]:
+            with self.subTest(items=items), box(items, copy=False).to_shared_memory() as handle:
+                self.assertEqual(expected_format, handle.format)
+
+                with box.from_shared_memory(handle) as shared:
+                    self.assertEqual(items.tolist(), list(shared))
+
+        with box(np.array([1, 2, 3])).reverse().to_shared_memory() as handle, box.from_shared_memory(handle) as shared:
+            self.assertEqual([3, 2, 1], list(shared))
+
+    def test_read_only_and_new_boxes(self):
+        with box([3, 1, 2]).to_shared_memory() as handle, box.from_shared_memory(handle) as shared:
+            with self.assertRaises(TypeError):
+                shared.all()[0] = 5
+
+            self.assertEqual([1, 2, 3], shared.sort_by().all())
+            self.assertEqual(6, shared.sum())
+
+    def test_unsupported(self):
+        with self.assertRaises(TypeError):
+            box(["a"]).to_shared_memory()
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_unsupported_array(self):
+        with self.assertRaises(TypeError):
+            ArrayBox(np.array([1 + 2j])).to_shared_memory()
+
+    def test_unlink(self):
+        handle = box([1, 2]).to_shared_memory()
+        handle.close()
+        handle.unlink()
+
+        with self.assertRaises(FileNotFoundError):
+            box.from_shared_memory(handle)
+
+    def test_process_pool(self):
+        with box([1, 2, 3.5]).to_shared_memory() as handle, concurrent.futures.ProcessPoolExecutor(1) as executor:
+            self.assertEqual(6.5, executor.submit(_shared_sum, handle).result())